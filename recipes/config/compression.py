@@ -0,0 +1,231 @@
+import hashlib
+import threading
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class GzipCodec:
+    encoding = "gzip"
+    level = 6
+
+    def compressor(self):
+        # wbits=31 writes the gzip header and trailer, with a zero mtime so the
+        # same body always compresses to the same bytes.
+        return zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.flush()
+
+
+class BrotliCodec:
+    encoding = "br"
+    # Qualities above 5 cost far more CPU than they save on JSON.
+    quality = 5
+
+    class Compressor:
+        def __init__(self, quality):
+            self._compressor = brotli.Compressor(quality=quality)
+
+        def compress(self, data):
+            return self._compressor.process(data)
+
+        def flush(self):
+            return self._compressor.finish()
+
+    def compressor(self):
+        return self.Compressor(self.quality)
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.quality)
+
+
+class ZstdCodec:
+    encoding = "zstd"
+    level = 3
+
+    def compressor(self):
+        return zstandard.ZstdCompressor(level=self.level).compressobj()
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+
+CODECS = {"gzip": GzipCodec()}
+if brotli is not None:
+    CODECS["br"] = BrotliCodec()
+if zstandard is not None:
+    CODECS["zstd"] = ZstdCodec()
+
+
+def parse_accept_encoding(header):
+    """
+    Map each coding of an ``Accept-Encoding`` header to its quality value.
+    """
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def choose_codec(header, encodings):
+    """
+    Return the codec of ``encodings`` (in order of preference) that the
+    client accepts with the highest quality, or None.
+    """
+    qualities = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        codec = CODECS.get(encoding)
+        quality = qualities.get(encoding, qualities.get("*", 0.0))
+        if codec is not None and quality > best_quality:
+            best, best_quality = codec, quality
+    return best
+
+
+class CompressedBodyCache:
+    """
+    Compressed bodies stored in the Django cache named by
+    ``COMPRESSION_CACHE_ALIAS`` (an empty alias disables it), keyed by the
+    digest of the uncompressed body: an ETag does not hash the body (nor the
+    Host of absolute links, nor the user), so only identical bytes may share
+    their compressed form.
+    """
+    key_prefix = "compressed"
+
+    def __init__(self, alias=None):
+        self._alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def alias(self):
+        return settings.COMPRESSION_CACHE_ALIAS if self._alias is None else self._alias
+
+    @property
+    def enabled(self):
+        return bool(self.alias)
+
+    def key(self, content, encoding):
+        return ":".join([self.key_prefix, encoding, hashlib.sha256(content).hexdigest()])
+
+    def get_or_compress(self, codec, content):
+        if not self.enabled:
+            return codec.compress(content)
+        cache = caches[self.alias]
+        key = self.key(content, codec.encoding)
+        compressed = cache.get(key)
+        self.record(hit=compressed is not None)
+        if compressed is None:
+            compressed = codec.compress(content)
+            cache.set(key, compressed)
+        return compressed
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else None,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+compressed_cache = CompressedBodyCache()
+
+
+def compress_sequence(codec, sequence):
+    compressor = codec.compressor()
+    for item in sequence:
+        data = compressor.compress(item)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with the best of ``COMPRESSION_ENCODINGS`` (brotli
+    and zstd when their packages are installed, gzip always) accepted by the
+    client. Bodies smaller than ``COMPRESSION_MIN_SIZE`` are sent as they are,
+    streaming responses are compressed as they are produced, and the
+    compressed bodies of responses with a strong ETag, which are likely to be
+    served again, are cached. HTML is never compressed: the browsable API
+    reflects request data next to the CSRF token and the username, which
+    compression would expose to BREACH.
+
+    Like Django's GZipMiddleware, the ETag is made weak since the bytes sent
+    no longer match it.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if response.get("Content-Type", "").startswith("text/html"):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = choose_codec(request.META.get("HTTP_ACCEPT_ENCODING", ""), settings.COMPRESSION_ENCODINGS)
+        if codec is None:
+            return response
+
+        etag = response.get("ETag", "")
+        if response.streaming:
+            response.streaming_content = compress_sequence(codec, response.streaming_content)
+            del response["Content-Length"]
+        else:
+            compressed = (
+                compressed_cache.get_or_compress(codec, response.content)
+                if response.status_code == 200 and etag.startswith('"') else codec.compress(response.content)
+            )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        if etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = codec.encoding
+        return response
@@ -0,0 +1,36 @@
+"""
+PostgreSQL backend whose connections come from a process wide pool (see
+``config.db.pool``), configured by the ``POOL`` entry of the database
+settings. Closing a connection, as Django does at the end of every request,
+hands it back to the pool instead of closing the socket.
+"""
+from django.db.backends.postgresql import base, creation
+
+from config.db.pool import close_pools, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Pooled connections would keep the test database in use.
+        close_pools(test_database_name)
+        super(DatabaseCreation, self)._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+
+    pool = None
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(
+            conn_params,
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            self.settings_dict.get("POOL", {}),
+        )
+        return self.pool.acquire()
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
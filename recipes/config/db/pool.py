@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Bounded pool of psycopg2 connections shared by every thread of the
+    process.
+
+    At most ``size`` connections are open at once; ``acquire()`` waits up to
+    ``timeout`` seconds for one to be released when they are all in use.
+    Idle connections are closed after ``max_idle`` seconds and, with
+    ``pre_ping``, checked with ``SELECT 1`` before being handed out so a
+    connection dropped by the server is replaced instead of failing a request.
+    Released connections are reset with ``DISCARD ALL`` so no session state
+    leaks to the next borrower, and connections are only ever closed outside
+    the pool's lock.
+    """
+
+    def __init__(self, connect, size=10, timeout=30, max_idle=300, pre_ping=True):
+        self.connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.pre_ping = pre_ping
+        self.condition = threading.Condition()
+        self.idle = []
+        self.in_use = 0
+        self.waiting = 0
+        self.created = 0
+        self.discarded = 0
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        expired = []
+        try:
+            with self.condition:
+                self.waiting += 1
+                try:
+                    while True:
+                        expired.extend(self.evict_idle())
+                        if self.idle or self.in_use < self.size:
+                            break
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise PoolTimeout(
+                                f"No database connection available after {self.timeout} seconds "
+                                f"({self.size} in use)."
+                            )
+                        self.condition.wait(remaining)
+                finally:
+                    self.waiting -= 1
+                connection = self.idle.pop()[0] if self.idle else None
+                self.in_use += 1
+        finally:
+            for stale in expired:
+                self.discard(stale)
+
+        try:
+            if connection is not None and self.pre_ping and not self.ping(connection):
+                self.discard(connection)
+                connection = None
+            if connection is None:
+                connection = self.connect()
+                with self.condition:
+                    self.created += 1
+        except BaseException:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+        return connection
+
+    def release(self, connection):
+        reusable = self.reset(connection)
+        with self.condition:
+            self.in_use -= 1
+            if reusable:
+                self.idle.append((connection, time.monotonic()))
+            self.condition.notify()
+        if not reusable:
+            self.discard(connection)
+
+    def evict_idle(self):
+        # Called with the lock held, returning the connections to discard once
+        # it is released. ``idle`` is used as a stack, so the least recently
+        # released connections are at its bottom.
+        deadline = time.monotonic() - self.max_idle
+        expired = []
+        while self.idle and self.idle[0][1] < deadline:
+            expired.append(self.idle.pop(0)[0])
+        return expired
+
+    def close_idle(self):
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for connection, _ in idle:
+            self.discard(connection)
+
+    def discard(self, connection):
+        with self.condition:
+            self.discarded += 1
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    @staticmethod
+    def ping(connection):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def reset(connection):
+        """
+        Roll back whatever the connection was left doing, put it back in
+        autocommit mode and discard its session state (settings, temporary
+        tables, prepared statements, advisory locks, ``LISTEN``), returning
+        False when it cannot be reused. Django sets the time zone again when
+        it takes the connection.
+        """
+        if connection.closed:
+            return False
+        try:
+            status = connection.get_transaction_status()
+            if status in (extensions.TRANSACTION_STATUS_UNKNOWN, extensions.TRANSACTION_STATUS_ACTIVE):
+                return False
+            if status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute("DISCARD ALL")
+        except psycopg2.Error:
+            return False
+        return True
+
+    def stats(self):
+        with self.condition:
+            return {
+                "size": self.size,
+                "in_use": self.in_use,
+                "idle": len(self.idle),
+                "waiting": self.waiting,
+                "created": self.created,
+                "discarded": self.discarded,
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(conn_params, connect, options):
+    """
+    Return the process wide pool for the connection parameters
+    ``conn_params``, creating it with ``connect`` and the ``POOL`` options of
+    the database settings on first use.
+    """
+    key = tuple(sorted((name, str(value)) for name, value in conn_params.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(
+                connect,
+                size=options.get("SIZE", 10),
+                timeout=options.get("TIMEOUT", 30),
+                max_idle=options.get("MAX_IDLE", 300),
+                pre_ping=options.get("PRE_PING", True),
+            )
+        return pool
+
+
+def pool_stats():
+    with _pools_lock:
+        pools = list(_pools.items())
+    return {
+        "{host}:{port}/{database}".format(
+            host=params.get("host", ""), port=params.get("port", ""), database=params.get("database", "")
+        ): pool.stats()
+        for params, pool in ((dict(key), pool) for key, pool in pools)
+    }
+
+
+def close_pools(database=None):
+    """
+    Close the idle connections of every pool, or of the pools connected to
+    ``database``.
+    """
+    with _pools_lock:
+        pools = [pool for key, pool in _pools.items() if database is None or dict(key).get("database") == database]
+    for pool in pools:
+        pool.close_idle()
+
+
+# A forked worker must not share the parent's sockets.
+os.register_at_fork(after_in_child=_pools.clear)
@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Set while the current request (or block) must read from the primary.
+use_primary = ContextVar("use_primary", default=False)
+
+PRIMARY_STICKY_KEY_PREFIX = "primary"
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def parse_replicas(primary, entries):
+    """
+    Build the ``DATABASES`` entries and the weights of the read replicas
+    described by ``entries``, each ``host[:port][/name][*weight]``. Port,
+    database name and credentials default to the primary's, weight to 1.
+    """
+    databases, weights = {}, {}
+    for index, entry in enumerate(entries, start=1):
+        entry, _, weight = entry.partition("*")
+        address, _, name = entry.partition("/")
+        host, _, port = address.partition(":")
+        alias = f"replica_{index}"
+        databases[alias] = {
+            **primary,
+            "HOST": host or primary["HOST"],
+            "PORT": port or primary["PORT"],
+            "NAME": name or primary["NAME"],
+            "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+        }
+        weights[alias] = int(weight or 1)
+    return databases, weights
+
+
+@contextmanager
+def pin_primary():
+    """
+    Send every read of the block to the primary.
+    """
+    token = use_primary.set(True)
+    try:
+        yield
+    finally:
+        use_primary.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Sends reads to the replicas in ``DATABASE_REPLICA_WEIGHTS`` by smooth
+    weighted round-robin, and writes to the primary. Reads stay on the primary
+    while ``use_primary`` is set (see ``PrimaryStickinessMiddleware``) or
+    inside a transaction on it, so they always see what it just wrote.
+    """
+
+    def __init__(self, weights=None):
+        weights = settings.DATABASE_REPLICA_WEIGHTS if weights is None else weights
+        self.weights = {alias: weight for alias, weight in weights.items() if weight > 0}
+        self.current = dict.fromkeys(self.weights, 0)
+        self.lock = threading.Lock()
+
+    def next_replica(self):
+        with self.lock:
+            chosen = None
+            for alias, weight in self.weights.items():
+                self.current[alias] += weight
+                if chosen is None or self.current[alias] > self.current[chosen]:
+                    chosen = alias
+            self.current[chosen] -= sum(self.weights.values())
+            return chosen
+
+    def db_for_read(self, model, **hints):
+        if not self.weights or use_primary.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return self.next_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        pool = {DEFAULT_DB_ALIAS, *self.weights}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+
+class PrimaryStickinessMiddleware:
+    """
+    Pins unsafe requests to the primary, and the following requests of the
+    same client for ``DATABASE_PRIMARY_STICKY_SECONDS`` after a successful
+    one, so clients read their own writes despite replication lag. Responses
+    whose ``primary_sticky`` attribute is False (reads sent as POST) do not
+    pin the client.
+
+    Clients are told apart by their credentials (the ``Authorization`` header
+    or the session cookie), and the pins kept server side in the cache named
+    by ``DATABASE_PRIMARY_STICKY_CACHE_ALIAS``, so token clients without a
+    cookie jar are pinned too and no client can pin or unpin itself. With
+    replicas, that cache has to be shared by every process: a pin kept in
+    one worker's memory would not reach the next request served by another,
+    so a local memory cache is refused at startup.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if any(weight > 0 for weight in settings.DATABASE_REPLICA_WEIGHTS.values()) and isinstance(
+            self.cache, LocMemCache
+        ):
+            raise ImproperlyConfigured(
+                "DATABASE_PRIMARY_STICKY_CACHE_ALIAS must name a cache shared by every process when "
+                f"replicas are configured; {settings.DATABASE_PRIMARY_STICKY_CACHE_ALIAS!r} is local memory."
+            )
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = use_primary.set(self.must_use_primary(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            use_primary.reset(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        token = use_primary.set(self.must_use_primary(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_primary.reset(token)
+        return self.process_response(request, response)
+
+    @property
+    def cache(self):
+        return caches[settings.DATABASE_PRIMARY_STICKY_CACHE_ALIAS]
+
+    @staticmethod
+    def client_key(request):
+        credentials = request.META.get("HTTP_AUTHORIZATION") or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        if not credentials:
+            return None
+        # Credentials are secrets; only their digest is used as a key.
+        return f"{PRIMARY_STICKY_KEY_PREFIX}:{hashlib.sha256(credentials.encode('utf-8')).hexdigest()}"
+
+    def must_use_primary(self, request):
+        if request.method not in SAFE_METHODS:
+            return True
+        key = self.client_key(request)
+        return key is not None and self.cache.get(key, 0) > time.time()
+
+    def process_response(self, request, response):
+        window = settings.DATABASE_PRIMARY_STICKY_SECONDS
+        key = self.client_key(request)
+        if (
+            window > 0 and key is not None and request.method not in SAFE_METHODS and response.status_code < 400
+            and getattr(response, "primary_sticky", True)
+        ):
+            self.cache.set(key, time.time() + window, timeout=window)
+        return response
@@ -15,6 +15,8 @@ from pathlib import Path
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 from decouple import config, Csv
 
+from config.routers import parse_replicas
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Quick-start development settings - unsuitable for production
@@ -37,13 +39,17 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
+    'django_filters',
     'modules.api'
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'config.compression.CompressionMiddleware',
+    'config.routers.PrimaryStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,22 +81,161 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Connection pooling: when on, connections come from a bounded pool per
+# process shared by all its threads (WSGI workers and the ASGI thread pool)
+# and are handed back to it at the end of each request. POOL_SIZE_PSQL caps
+# the open connections, POOL_TIMEOUT_PSQL is how long a request waits for
+# one, POOL_MAX_IDLE_PSQL how long an unused one stays open, and
+# POOL_PRE_PING_PSQL checks connections before reuse.
+POOL_PSQL = config("POOL_PSQL", default=False, cast=bool)
+
+# Without the pool, seconds a thread keeps its connection open for the next
+# requests (0 opens one per request).
+CONN_MAX_AGE_PSQL = config("CONN_MAX_AGE_PSQL", default=0, cast=int)
+
 DATABASES = {
     'default': {
-        "ENGINE": "django.db.backends.postgresql_psycopg2",
+        "ENGINE": "config.db" if POOL_PSQL else "django.db.backends.postgresql_psycopg2",
         "NAME": config("NAME_PSQL"),
         "USER": config("USER_PSQL"),
         "PASSWORD": config("PASSWORD_PSQL"),
         "HOST": config("HOST_PSQL", default="localhost"),
         "PORT": config("PORT_PSQL", default="5432"),
+        "CONN_MAX_AGE": 0 if POOL_PSQL else CONN_MAX_AGE_PSQL,
+        "POOL": {
+            "SIZE": config("POOL_SIZE_PSQL", default=10, cast=int),
+            "TIMEOUT": config("POOL_TIMEOUT_PSQL", default=30, cast=float),
+            "MAX_IDLE": config("POOL_MAX_IDLE_PSQL", default=300, cast=float),
+            "PRE_PING": config("POOL_PRE_PING_PSQL", default=True, cast=bool),
+        },
     },
 }
 
+# Read replicas, a comma separated list of host[:port][/name][*weight]
+# entries defaulting to the primary's port and database name and to weight 1
+# (e.g. "replica-a*2,replica-b"). Safe-method reads are spread over them by
+# weighted round-robin; empty reads from the primary only.
+REPLICA_DATABASES, DATABASE_REPLICA_WEIGHTS = parse_replicas(
+    DATABASES["default"], config("REPLICAS_PSQL", default="", cast=Csv())
+)
+DATABASES.update(REPLICA_DATABASES)
+
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+
+# Seconds a client keeps reading from the primary after a write, so it sees
+# its own changes despite replication lag, and the cache alias remembering
+# those clients. With replicas it must be shared by every process (Redis,
+# memcached, database): a local memory cache is refused at startup.
+DATABASE_PRIMARY_STICKY_SECONDS = config("DATABASE_PRIMARY_STICKY_SECONDS", default=5, cast=int)
+DATABASE_PRIMARY_STICKY_CACHE_ALIAS = config("DATABASE_PRIMARY_STICKY_CACHE_ALIAS", default="recipes")
+
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+        'modules.api.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'modules.api.renderers.ORJSONRenderer',
+        'modules.api.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'modules.api.parsers.ORJSONParser',
+        'modules.api.parsers.MessagePackParser',
+        'modules.api.parsers.LegacyMessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'modules.api.pagination.SelectablePagination',
     'PAGE_SIZE': 100
 }
 
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+# Backend of the 'recipes' cache. Local memory is private to each process:
+# fine for a single worker, but see RECIPE_CACHE_ALIAS below.
+RECIPE_CACHE_BACKEND = config("RECIPE_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'recipes': {
+        'BACKEND': RECIPE_CACHE_BACKEND,
+        'LOCATION': config("RECIPE_CACHE_LOCATION", default="recipes"),
+        'TIMEOUT': config("RECIPE_CACHE_TIMEOUT", default=300, cast=int),
+        'OPTIONS': {
+            'MAX_ENTRIES': config("RECIPE_CACHE_MAX_ENTRIES", default=10000, cast=int),
+        },
+    },
+}
+
+# Cache alias holding serialized recipe documents, empty to disable it. A write
+# invalidates documents by replacing their version key, which other processes
+# only see through a shared backend (Redis, memcached, database): with the
+# local memory default the document cache is off unless set here, which is
+# only safe when a single process serves the API.
+RECIPE_CACHE_ALIAS = config(
+    "RECIPE_CACHE_ALIAS", default="" if RECIPE_CACHE_BACKEND.endswith(".LocMemCache") else "recipes"
+)
+
+# Response compression: encodings in order of preference (br and zstd need the
+# brotli and zstandard packages), the smallest body worth compressing and the
+# cache alias holding compressed bodies of ETagged responses, empty to disable it.
+COMPRESSION_ENCODINGS = config("COMPRESSION_ENCODINGS", default="br,zstd,gzip", cast=Csv())
+COMPRESSION_MIN_SIZE = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+COMPRESSION_CACHE_ALIAS = config("COMPRESSION_CACHE_ALIAS", default="recipes")
+
+# Token authentication lookups cached in process for TOKEN_CACHE_TTL seconds
+# (0 disables it), at most TOKEN_CACHE_MAX_ENTRIES of them, and shared through
+# the cache alias TOKEN_CACHE_ALIAS when set.
+TOKEN_CACHE_TTL = config("TOKEN_CACHE_TTL", default=60, cast=int)
+TOKEN_CACHE_MAX_ENTRIES = config("TOKEN_CACHE_MAX_ENTRIES", default=10000, cast=int)
+TOKEN_CACHE_ALIAS = config("TOKEN_CACHE_ALIAS", default="")
+
+# Default pagination mode for list endpoints: "offset" or "cursor" (keyset).
+API_PAGINATION_MODE = config("API_PAGINATION_MODE", default="offset")
+
+# Full text search configurations, by ?lang= code. Every configuration is
+# indexed; a request without ?lang= matches against all of them.
+SEARCH_LANGUAGES = {
+    "pt": "portuguese",
+    "en": "english",
+}
+
+# Upper bound of recipes considered by the trigram (typo) fallback.
+SEARCH_MAX_CANDIDATES = config("SEARCH_MAX_CANDIDATES", default=1000, cast=int)
+
+# Recipes validated and inserted per transaction by the bulk importer, and
+# how many per-line errors its report keeps.
+RECIPE_IMPORT_CHUNK_SIZE = config("RECIPE_IMPORT_CHUNK_SIZE", default=500, cast=int)
+RECIPE_IMPORT_MAX_ERRORS = config("RECIPE_IMPORT_MAX_ERRORS", default=1000, cast=int)
+
+# Largest list accepted by the ingredient/step batch write endpoints.
+RECIPE_BATCH_MAX_ITEMS = config("RECIPE_BATCH_MAX_ITEMS", default=1000, cast=int)
+
+# Most recipe ids a single batch read or delete can ask for.
+RECIPE_BATCH_MAX_IDS = config("RECIPE_BATCH_MAX_IDS", default=200, cast=int)
+
+# Most recipes a single shopping list can be computed for.
+SHOPPING_LIST_MAX_RECIPES = config("SHOPPING_LIST_MAX_RECIPES", default=100, cast=int)
+
+# UUID version of new primary keys: 4 (random) or 7 (time-ordered, which
+# keeps inserts local in the primary key indexes).
+PRIMARY_KEY_UUID_VERSION = config("PRIMARY_KEY_UUID_VERSION", default=4, cast=int)
+
+# Ingredients/steps left without a recipe deleted per transaction by the
+# orphan cleanup, and the pause in seconds between two chunks.
+ORPHAN_CLEANUP_CHUNK_SIZE = config("ORPHAN_CLEANUP_CHUNK_SIZE", default=1000, cast=int)
+ORPHAN_CLEANUP_PAUSE = config("ORPHAN_CLEANUP_PAUSE", default=0.1, cast=float)
+
+# Recipes fetched per server-side cursor round trip by the catalogue export,
+# and whether exports run in a REPEATABLE READ snapshot by default.
+RECIPE_EXPORT_CHUNK_SIZE = config("RECIPE_EXPORT_CHUNK_SIZE", default=500, cast=int)
+RECIPE_EXPORT_SNAPSHOT = config("RECIPE_EXPORT_SNAPSHOT", default=True, cast=bool)
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
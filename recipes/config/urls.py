@@ -20,5 +20,6 @@ api_version = "v1"
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path(f"api/{api_version}/async/", include("modules.api.async_urls"), name="recipes_async_v1"),
     path(f"api/{api_version}/", include("modules.api.urls"), name="recipes_v1"),
 ]
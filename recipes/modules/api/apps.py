@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RecipesApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modules.api'
+
+    def ready(self):
+        from modules.api import signals  # noqa: F401
@@ -0,0 +1,22 @@
+from django.urls import path
+
+from modules.api import async_views
+
+urlpatterns = [
+    path(
+        f"recipes/",
+        async_views.AsyncRecipeListView.as_view(), name="recipes_async_v1"
+    ),
+    path(
+        f"recipes/<uuid:pk>/",
+        async_views.AsyncRecipeDetailView.as_view(), name="recipe_detail_async_v1"
+    ),
+    path(
+        f"recipes/<uuid:pk>/steps/",
+        async_views.AsyncRecipeStepListView.as_view(), name="recipe_steps_async_v1"
+    ),
+    path(
+        f"recipes/<uuid:pk>/ingredients/",
+        async_views.AsyncRecipeIngredientsListView.as_view(), name="recipe_ingredient_async_v1"
+    ),
+]
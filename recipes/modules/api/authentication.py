@@ -0,0 +1,149 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Token rows by key, as the field values of their user and their creation
+    time rather than model instances, which every request (and thread) served
+    from the cache would share. They are kept in an in-process LRU of at most
+    ``TOKEN_CACHE_MAX_ENTRIES`` entries that expire after ``TOKEN_CACHE_TTL``
+    seconds (0 disables the cache), optionally backed by the Django cache
+    named by ``TOKEN_CACHE_ALIAS`` so processes share their lookups.
+
+    Entries are dropped when their token is deleted or their user saved (see
+    ``modules.api.signals``), right away and again once the transaction
+    commits. Other processes only drop their local copy when it expires, so
+    the TTL bounds how long a revoked token may still be accepted.
+    """
+    key_prefix = "token"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        return settings.TOKEN_CACHE_TTL
+
+    @property
+    def shared(self):
+        return caches[settings.TOKEN_CACHE_ALIAS] if settings.TOKEN_CACHE_ALIAS else None
+
+    def cache_key(self, token_key):
+        # Tokens are credentials; only their digest is used as a key.
+        return f"{self.key_prefix}:{hashlib.sha256(token_key.encode('utf-8')).hexdigest()}"
+
+    def get(self, token_key):
+        if self.ttl <= 0:
+            return None
+        key = self.cache_key(token_key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        row = self.shared.get(key) if self.shared is not None else None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        self.store(key, row)
+        return row
+
+    def set(self, token_key, row):
+        if self.ttl <= 0:
+            return
+        key = self.cache_key(token_key)
+        self.store(key, row)
+        if self.shared is not None:
+            self.shared.set(key, row, timeout=self.ttl)
+
+    def store(self, key, row):
+        with self._lock:
+            self._entries[key] = (row, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.TOKEN_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *token_keys):
+        keys = [self.cache_key(token_key) for token_key in set(token_keys)]
+        if keys:
+            self.drop(keys)
+            transaction.on_commit(lambda: self.drop(keys))
+
+    def drop(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+        if self.shared is not None:
+            self.shared.delete_many(keys)
+
+    def stats(self):
+        with self._lock:
+            hits, misses, size = self.hits, self.misses, len(self._entries)
+        total = hits + misses
+        return {
+            "enabled": self.ttl > 0,
+            "entries": size,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else None,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``TokenAuthentication`` answering from ``token_cache``, so a known token
+    costs no query instead of the token and user join. Every request gets
+    its own user and token instances, built from the cached rows.
+
+    Only the fields authentication and permissions read are cached, never the
+    password hash or personal details; the rest of the user is deferred and
+    loaded from the database if a view asks for it.
+    """
+    cached_user_fields = ("is_active", "is_staff", "is_superuser")
+
+    def authenticate_credentials(self, key):
+        row = token_cache.get(key)
+        if row is not None:
+            return self.from_row(key, row)
+        user, token = super(CachedTokenAuthentication, self).authenticate_credentials(key)
+        token_cache.set(key, self.to_row(user, token))
+        return user, token
+
+    def to_row(self, user, token):
+        # In model order, as from_db expects a partial row to be.
+        fields = {user._meta.pk.attname, user.USERNAME_FIELD, *self.cached_user_fields}
+        return {
+            field.attname: getattr(user, field.attname)
+            for field in user._meta.concrete_fields if field.attname in fields
+        }, token.created
+
+    def from_row(self, key, row):
+        user_values, created = row
+        token_model = self.get_model()
+        user_model = token_model._meta.get_field("user").related_model
+        user = user_model.from_db(router.db_for_read(user_model), list(user_values), list(user_values.values()))
+        token = token_model.from_db(user._state.db, ["key", "user_id", "created"], [key, user.pk, created])
+        token.user = user
+        return user, token
@@ -0,0 +1,115 @@
+import uuid
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import ValidationError
+
+
+class RecipeChildBatch:
+    """
+    Validates and applies a list of ingredient or step writes on one recipe.
+
+    Items carrying an ``id`` update that child (partially unless
+    ``replace``), the others create a new one; with ``replace`` the children
+    left out of the list are deleted. Every item is validated before anything
+    is written, then the batch runs as one ``bulk_create``, one
+    ``bulk_update`` and one filtered delete. ``validate()`` and ``save()``
+    must run in the same transaction: the children being updated are locked
+    when they are read, so no concurrent write lands between the checks and
+    the writes.
+    """
+
+    def __init__(self, recipe_id, serializer_class, items, replace=False):
+        self.recipe_id = recipe_id
+        self.serializer_class = serializer_class
+        self.model = serializer_class.Meta.model
+        self.items = items
+        self.replace = replace
+
+    def validate(self):
+        if not isinstance(self.items, list):
+            raise ValidationError({"non_field_errors": [_("Expected a list of items.")]})
+        if len(self.items) > settings.RECIPE_BATCH_MAX_ITEMS:
+            raise ValidationError({"non_field_errors": [
+                _("Ensure this list has no more than %(max)d items.") % {"max": settings.RECIPE_BATCH_MAX_ITEMS}
+            ]})
+
+        ids = [pk for pk in (self.item_id(item) for item in self.items) if pk is not None]
+        # Locked in primary key order, like any other batch would.
+        existing = {
+            instance.pk: instance
+            for instance in self.model.objects.filter(pk__in=ids).order_by("pk").select_for_update()
+        }
+        self.created, self.updated, self.update_fields = [], [], set()
+        errors, seen = [], set()
+        for item in self.items:
+            pk = self.item_id(item)
+            instance = existing.get(pk) if pk is not None else None
+            if pk is not None and (instance is None or instance.recipe_id != self.recipe_id):
+                errors.append({"id": [_("Not found.")]})
+                continue
+            if pk is not None and pk in seen:
+                errors.append({"id": [_("Duplicated item.")]})
+                continue
+            seen.add(pk)
+
+            serializer = self.serializer_class(instance, data=item, partial=instance is not None and not self.replace)
+            if not serializer.is_valid():
+                errors.append(serializer.errors)
+                continue
+            errors.append({})
+            data = {field: value for field, value in serializer.validated_data.items() if field != "recipe"}
+            if instance is None:
+                self.created.append(self.model(recipe_id=self.recipe_id, **data))
+            else:
+                for field, value in data.items():
+                    setattr(instance, field, value)
+                self.updated.append(instance)
+                self.update_fields.update(data)
+        if any(errors):
+            raise ValidationError(errors)
+
+    def save(self):
+        try:
+            with transaction.atomic():
+                if self.replace:
+                    self.model.objects.filter(recipe=self.recipe_id).exclude(
+                        pk__in=[instance.pk for instance in self.updated]
+                    ).delete()
+                if self.updated and self.update_fields:
+                    self.model.objects.bulk_update(self.updated, sorted(self.update_fields))
+                self.model.objects.bulk_create(self.created)
+                # Check deferred constraints (unique step numbers) here rather
+                # than at commit, where they could no longer become a 400.
+                with connection.cursor() as cursor:
+                    cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                    cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+        except IntegrityError:
+            raise ValidationError({"non_field_errors": [_("The items conflict with each other or with existing ones.")]})
+
+    @classmethod
+    def delete(cls, recipe_id, model, items):
+        """
+        Delete the children of ``recipe_id`` listed in ``items`` (ids or objects
+        with an ``id``) with a single filtered delete; unknown ids are ignored.
+        """
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": [_("Expected a list of items.")]})
+        ids = []
+        for item in items:
+            pk = cls.item_id(item)
+            if pk is None:
+                raise ValidationError({"non_field_errors": [_("Expected a list of ids.")]})
+            ids.append(pk)
+        return model.objects.filter(recipe=recipe_id, pk__in=ids).delete()
+
+    @staticmethod
+    def item_id(item):
+        value = item.get("id") if isinstance(item, dict) else item
+        if value is None:
+            return None
+        try:
+            return uuid.UUID(str(value))
+        except ValueError:
+            raise ValidationError({"id": [_("'%(value)s' is not a valid UUID.") % {"value": value}]})
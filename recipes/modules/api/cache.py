@@ -0,0 +1,136 @@
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from config.routers import pin_primary
+
+
+class RecipeDocumentCache:
+    """
+    Cache of serialized recipe documents, stored in the Django cache named by
+    ``RECIPE_CACHE_ALIAS`` (an empty alias disables it).
+
+    Each recipe has a random version token and its document lives under
+    ``recipe:<id>:<token>``. Invalidating a recipe replaces the token right
+    away and again once the surrounding transaction commits, so a document
+    built from a snapshot older than the write is never read after it.
+    Documents are built from the primary: one built from a lagging replica
+    would be stored under the new version and served until it expires.
+    """
+    key_prefix = "recipe"
+
+    def __init__(self, alias=None):
+        self._alias = alias
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def alias(self):
+        return settings.RECIPE_CACHE_ALIAS if self._alias is None else self._alias
+
+    @property
+    def enabled(self):
+        return bool(self.alias)
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version_key(self, pk):
+        return f"{self.key_prefix}:{pk}:version"
+
+    def document_key(self, pk, version):
+        return f"{self.key_prefix}:{pk}:{version}"
+
+    def get_version(self, pk, version=None):
+        key = self.version_key(pk)
+        if version is None:
+            version = self.cache.get(key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not self.cache.add(key, version, timeout=None):
+                version = self.cache.get(key, version)
+        return version
+
+    def get_versions(self, pks):
+        keys = {pk: self.version_key(pk) for pk in pks}
+        found = self.cache.get_many(list(keys.values()))
+        return {pk: self.get_version(pk, found.get(key)) for pk, key in keys.items()}
+
+    def get_or_build(self, pk, build):
+        """
+        Return the cached document for ``pk``, calling ``build()`` and caching
+        its result on a miss.
+        """
+        if not self.enabled:
+            return build()
+        key = self.document_key(pk, self.get_version(pk))
+        document = self.cache.get(key)
+        if document is not None:
+            self.record(hits=1)
+            return document
+        self.record(misses=1)
+        with pin_primary():
+            document = build()
+        self.cache.set(key, document)
+        return document
+
+    def get_or_build_many(self, pks, build_many):
+        """
+        Return the documents of ``pks`` by pk, reading the cached ones with one
+        round trip for their versions and one for the documents, and building
+        the others with ``build_many(missing_pks)``, which leaves out the pks
+        matching no recipe.
+        """
+        pks = list(dict.fromkeys(pks))
+        if not self.enabled:
+            return build_many(pks)
+        keys = {pk: self.document_key(pk, version) for pk, version in self.get_versions(pks).items()}
+        cached = self.cache.get_many(list(keys.values()))
+        documents = {pk: cached[key] for pk, key in keys.items() if key in cached}
+        missing = [pk for pk in pks if pk not in documents]
+        self.record(hits=len(documents), misses=len(missing))
+        if missing:
+            with pin_primary():
+                built = build_many(missing)
+            self.cache.set_many({keys[pk]: document for pk, document in built.items()})
+            documents.update(built)
+        return documents
+
+    def invalidate(self, *pks):
+        if not self.enabled:
+            return
+        keys = [self.version_key(pk) for pk in set(pks) if pk is not None]
+        if keys:
+            self.bump(keys)
+            transaction.on_commit(lambda: self.bump(keys))
+
+    def bump(self, keys):
+        self.cache.set_many({key: uuid.uuid4().hex for key in keys}, timeout=None)
+
+    def record(self, hits=0, misses=0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else None,
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+recipe_cache = RecipeDocumentCache()
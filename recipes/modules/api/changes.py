@@ -0,0 +1,37 @@
+from modules.api.cache import recipe_cache
+from modules.api.models import Recipe, RecipeChange
+
+
+def recipe_changed(*recipe_ids, touch=True):
+    """
+    Record a write on the given recipes or on their ingredients/steps: bump
+    their ``updated_at`` (which drives ETag/Last-Modified), log the change for
+    the sync feed and invalidate their cached documents. Their search vector
+    is kept current by the database (migration 0011).
+    """
+    recipe_ids = {pk for pk in recipe_ids if pk is not None}
+    if not recipe_ids:
+        return
+    if touch:
+        Recipe.objects.filter(pk__in=recipe_ids).touch()
+    RecipeChange.objects.record(recipe_ids)
+    recipe_cache.invalidate(*recipe_ids)
+
+
+def recipes_created(*recipe_ids):
+    """
+    Log freshly inserted recipes for the sync feed.
+    """
+    RecipeChange.objects.record(recipe_ids)
+
+
+def recipe_deleted(*recipe_ids):
+    """
+    Record the deletion of the given recipes: leave a tombstone in the sync
+    feed and drop their cached documents.
+    """
+    recipe_ids = {pk for pk in recipe_ids if pk is not None}
+    if not recipe_ids:
+        return
+    RecipeChange.objects.record(recipe_ids, deleted=True)
+    recipe_cache.invalidate(*recipe_ids)
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+
+from modules.api.models import Ingredient, Step
+
+
+class OrphanCleanup:
+    """
+    Deletes the ingredients and steps left without a recipe (their foreign key
+    is ``SET_NULL``) ``chunk_size`` rows at a time, one transaction per chunk
+    and ``pause`` seconds apart, so locks stay short and the cleanup never
+    saturates the database it shares with the API. A model is done once a
+    chunk deletes nothing: a short chunk only means that some orphans were
+    locked (``SKIP LOCKED``) or are being deleted elsewhere.
+    """
+    models = (Ingredient, Step)
+
+    def __init__(self, chunk_size=None, pause=None, progress=None):
+        self.chunk_size = chunk_size or settings.ORPHAN_CLEANUP_CHUNK_SIZE
+        self.pause = settings.ORPHAN_CLEANUP_PAUSE if pause is None else pause
+        self.progress = progress
+        self.deleted = {}
+
+    def run(self):
+        self.deleted = {model._meta.model_name: 0 for model in self.models}
+        for model in self.models:
+            while self.delete_chunk(model):
+                time.sleep(self.pause)
+        return self.report()
+
+    def delete_chunk(self, model):
+        # A single statement, committed on its own.
+        deleted = model.objects.delete_orphans(self.chunk_size)
+        self.deleted[model._meta.model_name] += deleted
+        if self.progress:
+            self.progress(self, model)
+        return deleted
+
+    def report(self):
+        return {"deleted": dict(self.deleted), "total": sum(self.deleted.values())}
@@ -0,0 +1,113 @@
+import csv
+import json
+from contextlib import contextmanager
+from itertools import islice
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.utils.encoders import JSONEncoder
+
+from modules.api.models import Recipe, recipe_children_querysets
+from modules.api.renderers import ORJSONRenderer
+from modules.api.serializers import RecipeSerializer, ValuesSerializer
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = (
+    "id", "created_at", "updated_at", "name", "description", "image_url", "video_url",
+    "difficulty_level", "servings", "ingredients", "steps",
+)
+
+
+def parse_since(value):
+    """
+    Parse an ISO 8601 datetime (naive ones are taken as UTC), raising
+    ValueError when ``value`` is not one.
+    """
+    since = parse_datetime(value)
+    if since is None:
+        raise ValueError(value)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since, timezone.utc)
+    return since
+
+
+@contextmanager
+def consistent_snapshot(enabled=True):
+    """
+    Run the block in a read only REPEATABLE READ transaction, so every query
+    sees the database as of its first one. Inside an existing transaction the
+    isolation level can no longer change and the block just joins it.
+    """
+    if not enabled or connection.in_atomic_block:
+        yield
+        return
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+        yield
+
+
+def iter_recipe_documents(queryset, chunk_size):
+    """
+    Yield the serialized document of every recipe in ``queryset``. Recipes are
+    read through a server-side cursor and their ingredients and steps are
+    fetched one chunk at a time, so memory is bounded by ``chunk_size``.
+    """
+    serializer = ValuesSerializer(RecipeSerializer(), querysets=recipe_children_querysets())
+    recipes = queryset.values(*serializer.columns).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(recipes, chunk_size))
+        if not chunk:
+            return
+        yield from serializer.to_representation(chunk)
+
+
+def render_ndjson(documents):
+    renderer = ORJSONRenderer()
+    for document in documents:
+        yield renderer.render(document) + b"\n"
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def render_csv(documents):
+    """
+    One row per recipe, ingredients and steps embedded as JSON arrays.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS).encode("utf-8")
+    for document in documents:
+        row = [document[column] for column in CSV_COLUMNS]
+        row[-2:] = [
+            json.dumps(document["ingredients"], cls=JSONEncoder),
+            json.dumps(document["steps"], cls=JSONEncoder),
+        ]
+        yield writer.writerow(row).encode("utf-8")
+
+
+RENDERERS = {
+    "ndjson": render_ndjson,
+    "csv": render_csv,
+}
+
+
+def export_recipes(output="ndjson", since=None, chunk_size=None, snapshot=True):
+    """
+    Stream the whole catalogue (or the recipes updated since ``since``) as
+    bytes in the given ``EXPORT_FORMATS`` format.
+    """
+    queryset = Recipe.objects.defer("search_vector").order_by("created_at", "id")
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    with consistent_snapshot(snapshot):
+        documents = iter_recipe_documents(queryset, chunk_size or settings.RECIPE_EXPORT_CHUNK_SIZE)
+        yield from RENDERERS[output](documents)
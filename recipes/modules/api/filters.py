@@ -0,0 +1,69 @@
+from django_filters import rest_framework as filters
+
+from modules.api.models import Ingredient, Recipe, Step, normalize_ingredient_name
+
+
+class RecipeFilter(filters.FilterSet):
+    """
+    Recipe list filters; choices are repeated to match any of them. Every
+    one of them is served by an index: difficulty by
+    ``api_recipe_difficulty_idx`` (which keeps the list order), the
+    ``created_at``/``updated_at`` ranges by their indexes, and the ingredient
+    filters by semi-joins on the ingredient indexes.
+    """
+    difficulty_level = filters.MultipleChoiceFilter(choices=Recipe.difficulty_levels)
+    created_at = filters.IsoDateTimeFromToRangeFilter()
+    updated_at = filters.IsoDateTimeFromToRangeFilter()
+    ingredient = filters.CharFilter(method="filter_ingredient", label="Contains all these ingredients")
+    ingredient_category = filters.MultipleChoiceFilter(
+        choices=Ingredient.CATEGORIES, method="filter_ingredient_category",
+        label="Has an ingredient of these categories",
+    )
+
+    class Meta:
+        model = Recipe
+        fields = ("difficulty_level", "created_at", "updated_at", "ingredient", "ingredient_category")
+
+    def filter_ingredient(self, queryset, name, value):
+        # Like the cookable pantry: comma separated or repeated names, matched
+        # on their normalized form.
+        names = {
+            normalize_ingredient_name(ingredient)
+            for values in self.data.getlist(name)
+            for ingredient in values.split(",")
+        }
+        for ingredient in names - {""}:
+            queryset = queryset.filter(
+                pk__in=Ingredient.objects.filter(normalized_name=ingredient, recipe__isnull=False).values("recipe")
+            )
+        return queryset
+
+    def filter_ingredient_category(self, queryset, name, value):
+        return queryset.filter(
+            pk__in=Ingredient.objects.filter(category__in=value, recipe__isnull=False).values("recipe")
+        )
+
+
+class IngredientFilter(filters.FilterSet):
+    """
+    Filters of the ingredient list of a recipe, applied to the rows of that
+    recipe found through ``api_ingr_recipe_name_idx``.
+    """
+    category = filters.MultipleChoiceFilter(choices=Ingredient.CATEGORIES)
+    unit_type = filters.MultipleChoiceFilter(choices=Ingredient.UNIT_TYPES)
+
+    class Meta:
+        model = Ingredient
+        fields = ("category", "unit_type")
+
+
+class StepFilter(filters.FilterSet):
+    """
+    Step number range (``step_min``/``step_max``) within a recipe, served by
+    the unique (recipe, step) index.
+    """
+    step = filters.RangeFilter()
+
+    class Meta:
+        model = Step
+        fields = ("step",)
@@ -0,0 +1,116 @@
+import json
+from itertools import islice
+
+import msgpack
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext as _
+
+from modules.api.changes import recipes_created
+from modules.api.models import Recipe, Ingredient, Step
+from modules.api.serializers import RecipeSerializer
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+def parse_ndjson(lines):
+    """
+    Yield ``(line_number, data, error)`` for every non blank line of an NDJSON
+    stream, ``error`` being set when the line is not valid JSON.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as exc:
+            yield line_number, None, _("Invalid JSON: %(error)s") % {"error": exc}
+
+
+def parse_msgpack(chunks):
+    """
+    Yield ``(item_number, data, error)`` for every value of a stream of
+    concatenated MessagePack values, given as byte ``chunks``. Decoding stops
+    at the first malformed value, and trailing bytes that do not form a whole
+    value are reported as one.
+    """
+    unpacker = msgpack.Unpacker(raw=False)
+    item_number, received, decoded = 0, 0, 0
+    for chunk in chunks:
+        unpacker.feed(chunk)
+        received += len(chunk)
+        try:
+            for data in unpacker:
+                item_number += 1
+                decoded = unpacker.tell()
+                yield item_number, data, None
+        except (ValueError, TypeError) as exc:
+            yield item_number + 1, None, _("Invalid MessagePack: %(error)s") % {"error": exc}
+            return
+    if decoded != received:
+        yield item_number + 1, None, _("Invalid MessagePack: truncated value")
+
+
+class RecipeImporter:
+    """
+    Imports recipes from an iterable of ``(line_number, data, error)`` items
+    (see ``parse_ndjson`` and ``parse_msgpack``), validating and inserting them
+    ``chunk_size`` at a time with one transaction per chunk, so memory stays
+    bounded by the chunk whatever the size of the input.
+
+    Invalid lines are skipped and reported; at most ``max_errors`` of them are
+    kept in the report.
+    """
+
+    def __init__(self, chunk_size=None, max_errors=None, progress=None):
+        self.chunk_size = chunk_size or settings.RECIPE_IMPORT_CHUNK_SIZE
+        self.max_errors = settings.RECIPE_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self.progress = progress
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def run(self, items):
+        items = iter(items)
+        while True:
+            chunk = list(islice(items, self.chunk_size))
+            if not chunk:
+                break
+            self.import_chunk(chunk)
+            if self.progress:
+                self.progress(self)
+        return self.report()
+
+    def import_chunk(self, chunk):
+        recipes, ingredients, steps = [], [], []
+        for line_number, data, error in chunk:
+            if error is not None:
+                self.add_error(line_number, {"non_field_errors": [error]})
+                continue
+            serializer = RecipeSerializer(data=data)
+            if not serializer.is_valid():
+                self.add_error(line_number, serializer.errors)
+                continue
+            recipe, recipe_ingredients, recipe_steps = RecipeSerializer.build(serializer.validated_data)
+            recipes.append(recipe)
+            ingredients.extend(recipe_ingredients)
+            steps.extend(recipe_steps)
+
+        with transaction.atomic():
+            Recipe.objects.bulk_create(recipes, batch_size=self.chunk_size)
+            Ingredient.objects.bulk_create(ingredients, batch_size=self.chunk_size)
+            Step.objects.bulk_create(steps, batch_size=self.chunk_size)
+            recipes_created(*(recipe.pk for recipe in recipes))
+        self.created += len(recipes)
+
+    def add_error(self, line_number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_number, "errors": errors})
+
+    def report(self):
+        return {
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
@@ -0,0 +1,49 @@
+from modules.api.models import Recipe, Ingredient, Step, recipe_children_querysets
+from modules.api.serializers import RecipeSerializer, ValuesSerializer
+
+
+class Rollback(Exception):
+    """
+    Raised at the end of a benchmark's ``transaction.atomic()`` block to
+    discard the synthetic rows it created.
+    """
+
+
+def create_recipes(count, ingredients, steps):
+    """
+    Create ``count`` synthetic recipes named ``benchmark <n>``, each with
+    ``ingredients`` ingredients and ``steps`` steps.
+    """
+    recipes = Recipe.objects.bulk_create([
+        Recipe(name=f"benchmark {index}", description="benchmark recipe", difficulty_level="beginner")
+        for index in range(count)
+    ])
+    Ingredient.objects.bulk_create([
+        Ingredient(recipe=recipe, quantity=index + 0.5, unit_type="gram", name=f"ingredient {index}")
+        for recipe in recipes for index in range(ingredients)
+    ])
+    Step.objects.bulk_create([
+        Step(recipe=recipe, step=index + 1, description=f"step {index + 1}")
+        for recipe in recipes for index in range(steps)
+    ])
+    return recipes
+
+
+def serialize_recipes():
+    """
+    The synthetic recipes as documents, through ``RecipeSerializer`` over
+    prefetched instances.
+    """
+    recipes = Recipe.objects.with_children().filter(name__startswith="benchmark ").order_by("created_at", "id")
+    return RecipeSerializer(recipes, many=True).data
+
+
+def serialize_recipe_values():
+    """
+    The synthetic recipes as documents, through ``ValuesSerializer`` over
+    ``.values()`` rows.
+    """
+    serializer = ValuesSerializer(RecipeSerializer(), querysets=recipe_children_querysets())
+    return serializer.to_representation(
+        Recipe.objects.filter(name__startswith="benchmark ").order_by("created_at", "id").values(*serializer.columns)
+    )
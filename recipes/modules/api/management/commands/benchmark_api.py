@@ -0,0 +1,158 @@
+import asyncio
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+
+
+def wsgi_get(application, path, host, cookie):
+    url = urlsplit(path)
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": url.path,
+        "QUERY_STRING": url.query,
+        "SERVER_NAME": host,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": host,
+        "HTTP_COOKIE": cookie,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+    }
+    status = []
+    body = application(environ, lambda value, headers, exc_info=None: status.append(value))
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_get(application, path, host, cookie):
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url.path,
+        "raw_path": url.path.encode("utf-8"),
+        "query_string": url.query.encode("utf-8"),
+        "root_path": "",
+        "headers": [(b"host", host.encode("ascii")), (b"cookie", cookie.encode("ascii"))],
+        "client": ("127.0.0.1", 0),
+        "server": (host, 80),
+    }
+    status = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    await application(scope, receive, send)
+    return status[0]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec and latency of the WSGI and ASGI applications on GET endpoints, "
+        "driving both in process with the same concurrency against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("username", help="User the requests are authenticated as (session cookie).")
+        parser.add_argument("--path", action="append", dest="paths",
+                            help="Endpoint to request, repeatable (default: the sync and async recipe lists).")
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint and server.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once.")
+        parser.add_argument("--warmup", type=int, default=20, help="Untimed requests sent first.")
+        parser.add_argument("--host", default="localhost", help="Host header, must be in ALLOWED_HOSTS.")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get_by_natural_key(options["username"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['username']}' does not exist.")
+        client = Client()
+        client.force_login(user)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        paths = options["paths"] or ["/api/v1/recipes/", "/api/v1/async/recipes/"]
+        servers = {
+            "wsgi": self.run_wsgi,
+            "asgi": self.run_asgi,
+        }
+        for path in paths:
+            for server, run in servers.items():
+                latencies, errors, elapsed = run(path, options["host"], cookie, options)
+                self.report(server, path, latencies, errors, elapsed)
+
+    def run_wsgi(self, path, host, cookie, options):
+        application = get_wsgi_application()
+
+        def timed(_):
+            start = time.perf_counter()
+            status = wsgi_get(application, path, host, cookie)
+            return time.perf_counter() - start, status
+
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as executor:
+            list(executor.map(timed, range(options["warmup"])))
+            start = time.perf_counter()
+            results = list(executor.map(timed, range(options["requests"])))
+            elapsed = time.perf_counter() - start
+        return [latency for latency, _ in results], sum(status != 200 for _, status in results), elapsed
+
+    def run_asgi(self, path, host, cookie, options):
+        application = get_asgi_application()
+
+        async def timed():
+            start = time.perf_counter()
+            status = await asgi_get(application, path, host, cookie)
+            return time.perf_counter() - start, status
+
+        async def run(count):
+            semaphore = asyncio.Semaphore(options["concurrency"])
+
+            async def limited():
+                async with semaphore:
+                    return await timed()
+
+            return await asyncio.gather(*(limited() for _ in range(count)))
+
+        async def main():
+            await run(options["warmup"])
+            start = time.perf_counter()
+            results = await run(options["requests"])
+            return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(main())
+        return [latency for latency, _ in results], sum(status != 200 for _, status in results), elapsed
+
+    def report(self, server, path, latencies, errors, elapsed):
+        latencies = sorted(latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        self.stdout.write(
+            f"{server} {path}: {len(latencies) / elapsed:.1f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.2f} ms, p99 {p99 * 1000:.2f} ms, "
+            f"{errors} errors"
+        )
@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from modules.api.ids import UUID_GENERATORS
+from modules.api.management.benchmarks import Rollback
+from modules.api.models import Ingredient
+
+INDEX_SIZE = """
+SELECT sum(pg_relation_size(indexrelid)) FROM pg_index WHERE indrelid = 'api_ingredient'::regclass AND indisprimary
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the bulk_create throughput of ingredients keyed by random (v4) and time-ordered (v7) UUIDs, "
+        "with the primary key index size and WAL written. Each version starts from an emptied ingredient table "
+        "in a transaction that is rolled back, which holds an ACCESS EXCLUSIVE lock on the table meanwhile: "
+        "run it on a scratch database, with --i-know-this-locks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Ingredients inserted per version.")
+        parser.add_argument("--batch-size", type=int, default=10_000, help="Ingredients per bulk_create.")
+        parser.add_argument("--i-know-this-locks", action="store_true",
+                            help="Confirm that blocking every reader and writer of api_ingredient is fine.")
+
+    def handle(self, *args, **options):
+        if not options["i_know_this_locks"]:
+            raise CommandError(
+                "This benchmark truncates api_ingredient, blocking all access to it until it finishes. "
+                "Run it on a scratch database with --i-know-this-locks."
+            )
+        for version, generate in UUID_GENERATORS.items():
+            try:
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        cursor.execute("TRUNCATE api_ingredient")
+                    elapsed, index_growth, wal = self.insert(generate, options["rows"], options["batch_size"])
+                    self.stdout.write(
+                        f"uuid{version}: {options['rows'] / elapsed:.0f} rows/s, "
+                        f"primary key index {index_growth / 2 ** 20:.1f} MiB, WAL {wal / 2 ** 20:.1f} MiB"
+                    )
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def insert(self, generate, rows, batch_size):
+        index_size, wal_position = self.database_state()
+        start = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            Ingredient.objects.bulk_create([
+                Ingredient(id=generate(), quantity=1, unit_type="gram", name=f"benchmark {index}")
+                for index in range(offset, min(offset + batch_size, rows))
+            ])
+        elapsed = time.perf_counter() - start
+        with connection.cursor() as cursor:
+            cursor.execute(INDEX_SIZE)
+            index_growth = cursor.fetchone()[0] - index_size
+            cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), %s)", [wal_position])
+            wal = cursor.fetchone()[0]
+        return elapsed, index_growth, wal
+
+    @staticmethod
+    def database_state():
+        with connection.cursor() as cursor:
+            cursor.execute(INDEX_SIZE)
+            index_size = cursor.fetchone()[0]
+            cursor.execute("SELECT pg_current_wal_insert_lsn()")
+            return index_size, cursor.fetchone()[0]
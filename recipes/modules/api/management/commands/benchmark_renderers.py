@@ -0,0 +1,52 @@
+import json
+import time
+
+import msgpack
+import orjson
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from modules.api.management.benchmarks import Rollback, create_recipes, serialize_recipe_values
+from modules.api.renderers import ORJSONRenderer, MessagePackRenderer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode and decode times of DRF's JSON renderer, orjson and MessagePack over a page of "
+        "synthetic recipes created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipes", type=int, default=100, help="Recipes in the page.")
+        parser.add_argument("--ingredients", type=int, default=8, help="Ingredients per recipe.")
+        parser.add_argument("--steps", type=int, default=6, help="Steps per recipe.")
+        parser.add_argument("--repeat", type=int, default=200, help="Runs per format, the best one is kept.")
+
+    def handle(self, *args, **options):
+        formats = (
+            ("drf-json", JSONRenderer(), json.loads),
+            ("orjson", ORJSONRenderer(), orjson.loads),
+            ("msgpack", MessagePackRenderer(), lambda body: msgpack.unpackb(body, raw=False)),
+        )
+        try:
+            with transaction.atomic():
+                create_recipes(options["recipes"], options["ingredients"], options["steps"])
+                page = {"count": options["recipes"], "results": serialize_recipe_values()}
+                for label, renderer, decode in formats:
+                    body = renderer.render(page)
+                    encode_time = min(self.timed(renderer.render, page) for _ in range(options["repeat"]))
+                    decode_time = min(self.timed(decode, body) for _ in range(options["repeat"]))
+                    self.stdout.write(
+                        f"{label}: {len(body)} bytes, encode {encode_time * 1000:.3f} ms, "
+                        f"decode {decode_time * 1000:.3f} ms"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    @staticmethod
+    def timed(function, argument):
+        start = time.perf_counter()
+        function(argument)
+        return time.perf_counter() - start
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from modules.api.management.benchmarks import Rollback, create_recipes, serialize_recipe_values, serialize_recipes
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows/sec of RecipeSerializer over prefetched instances and of ValuesSerializer over "
+        ".values() rows, on synthetic recipes created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipes", type=int, default=1000)
+        parser.add_argument("--ingredients", type=int, default=8, help="Ingredients per recipe.")
+        parser.add_argument("--steps", type=int, default=6, help="Steps per recipe.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per serializer, the best one is kept.")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                create_recipes(options["recipes"], options["ingredients"], options["steps"])
+                rows = options["recipes"] * (1 + options["ingredients"] + options["steps"])
+                for label, serialize in (("drf", serialize_recipes), ("values", serialize_recipe_values)):
+                    elapsed = min(self.timed(serialize) for _ in range(options["repeat"]))
+                    self.stdout.write(
+                        f"{label}: {rows / elapsed:.0f} rows/s ({options['recipes'] / elapsed:.0f} recipes/s)"
+                    )
+                raise Rollback
+        except Rollback:
+            pass
+
+    @staticmethod
+    def timed(serialize):
+        start = time.perf_counter()
+        serialize()
+        return time.perf_counter() - start
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from modules.api.cleanup import OrphanCleanup
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the ingredients and steps left without a recipe, in bounded chunks. "
+        "With --interval the cleanup runs periodically until interrupted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=None,
+                            help="Rows deleted per transaction.")
+        parser.add_argument("--pause", type=float, default=None,
+                            help="Seconds slept between two chunks.")
+        parser.add_argument("--interval", type=float, default=None,
+                            help="Run again every INTERVAL seconds instead of once.")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        cleanup = OrphanCleanup(chunk_size=options["chunk_size"], pause=options["pause"], progress=self.report_progress)
+        while True:
+            report = cleanup.run()
+            self.stdout.write(self.style.SUCCESS(
+                f"Deleted {report['total']} orphans ("
+                + ", ".join(f"{count} {name}" for name, count in report["deleted"].items()) + ")."
+            ))
+            if options["interval"] is None:
+                break
+            time.sleep(options["interval"])
+
+    def report_progress(self, cleanup, model):
+        if self.verbosity > 1:
+            self.stdout.write(f"{cleanup.deleted[model._meta.model_name]} {model._meta.model_name} deleted")
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.api.exporters import EXPORT_FORMATS, export_recipes, parse_since
+
+
+class Command(BaseCommand):
+    help = "Export every recipe with its ingredients and steps as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="-", help="Destination file ('-' writes stdout).")
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+        parser.add_argument("--since", help="Only recipes updated since this ISO 8601 datetime.")
+        parser.add_argument("--chunk-size", type=int, default=None,
+                            help="Recipes fetched per server-side cursor round trip.")
+        parser.add_argument("--no-snapshot", action="store_true",
+                            help="Do not wrap the export in a REPEATABLE READ transaction.")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = parse_since(options["since"])
+            except ValueError:
+                raise CommandError("--since must be an ISO 8601 datetime.")
+
+        chunks = export_recipes(
+            output=options["format"], since=since,
+            chunk_size=options["chunk_size"], snapshot=not options["no_snapshot"],
+        )
+        if options["output"] == "-":
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+        else:
+            with open(options["output"], "wb") as output:
+                for chunk in chunks:
+                    output.write(chunk)
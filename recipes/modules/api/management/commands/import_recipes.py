@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from modules.api.importers import RecipeImporter, parse_msgpack, parse_ndjson
+
+PARSERS = {
+    "ndjson": parse_ndjson,
+    "msgpack": lambda stream: parse_msgpack(iter(lambda: stream.read(64 * 1024), b"")),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Import recipes from an NDJSON file, one recipe per line, or from concatenated MessagePack maps "
+        "('-' reads stdin)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(PARSERS), default="ndjson")
+        parser.add_argument("--chunk-size", type=int, default=None,
+                            help="Recipes inserted per transaction.")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        importer = RecipeImporter(chunk_size=options["chunk_size"], progress=self.report_progress)
+        parse = PARSERS[options["format"]]
+        if options["path"] == "-":
+            report = importer.run(parse(sys.stdin.buffer))
+        else:
+            with open(options["path"], "rb") as stream:
+                report = importer.run(parse(stream))
+
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report['created']} recipes, {report['failed']} lines failed."
+        ))
+
+    def report_progress(self, importer):
+        if self.verbosity > 1:
+            self.stdout.write(f"{importer.created} imported, {importer.failed} failed")
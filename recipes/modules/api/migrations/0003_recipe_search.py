@@ -0,0 +1,49 @@
+# Generated by Django 3.2.8 on 2026-10-18 06:30
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# The search vector as it was defined when the column was added: name,
+# description and ingredient names weighted A/B/C, in Portuguese and English.
+POPULATE_SEARCH_VECTOR = """
+UPDATE api_recipe SET search_vector = (
+    SELECT setweight(to_tsvector('portuguese'::regconfig, COALESCE(api_recipe.name, '')), 'A')
+        || setweight(to_tsvector('portuguese'::regconfig, COALESCE(api_recipe.description, '')), 'B')
+        || setweight(to_tsvector('portuguese'::regconfig, COALESCE(string_agg(api_ingredient.name, ' '), '')), 'C')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(api_recipe.name, '')), 'A')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(api_recipe.description, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(string_agg(api_ingredient.name, ' '), '')), 'C')
+    FROM api_ingredient WHERE api_ingredient.recipe_id = api_recipe.id
+)
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='recipe',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='api_ingr_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_recipe_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['name'], name='api_recipe_name_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunSQL(POPULATE_SEARCH_VECTOR, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.8 on 2026-10-18 06:31
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def normalize_ingredient_name(name):
+    # Frozen copy of modules.api.models.normalize_ingredient_name, so later
+    # changes to it do not change what this migration writes.
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return re.sub(r"[\W_]+", " ", name.casefold()).strip()
+
+
+def populate_normalized_name(apps, schema_editor):
+    Ingredient = apps.get_model("api", "Ingredient")
+    batch = []
+    for ingredient in Ingredient.objects.only("id", "name").iterator(chunk_size=2000):
+        ingredient.normalized_name = normalize_ingredient_name(ingredient.name)
+        batch.append(ingredient)
+        if len(batch) == 2000:
+            Ingredient.objects.bulk_update(batch, ["normalized_name"])
+            batch = []
+    Ingredient.objects.bulk_update(batch, ["normalized_name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_recipe_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='normalized_name',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(populate_normalized_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(fields=['normalized_name', 'recipe'], name='api_ingr_normalized_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.8 on 2026-10-18 06:36
+
+from django.db import migrations, models
+import django.db.models.constraints
+
+# Renumber 1..n the steps of every recipe holding duplicated step numbers,
+# keeping their current order, so the unique constraint can be created.
+RENUMBER_DUPLICATED_STEPS = """
+UPDATE api_step
+SET step = numbered.position
+FROM (
+    SELECT id, row_number() OVER (PARTITION BY recipe_id ORDER BY step, id) AS position
+    FROM api_step
+    WHERE recipe_id IN (
+        SELECT recipe_id FROM api_step
+        WHERE recipe_id IS NOT NULL
+        GROUP BY recipe_id, step
+        HAVING count(*) > 1
+    )
+) AS numbered
+WHERE api_step.id = numbered.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_recipe_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='step',
+            name='api_step_recipe_step_idx',
+        ),
+        migrations.RunSQL(RENUMBER_DUPLICATED_STEPS, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='step',
+            constraint=models.UniqueConstraint(deferrable=django.db.models.constraints.Deferrable['DEFERRED'], fields=('recipe', 'step'), name='api_step_recipe_step_uniq'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:09
+
+from django.db import migrations, models
+import django.utils.timezone
+
+# Every existing recipe enters the log, so a sync from scratch sees the whole
+# catalogue.
+LOG_EXISTING_RECIPES = """
+INSERT INTO api_recipechange (recipe_id, transaction_id, deleted, changed_at)
+SELECT id, pg_current_xact_id()::text::bigint, false, updated_at FROM api_recipe
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_recipe_servings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecipeChange',
+            fields=[
+                ('recipe_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('transaction_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='recipechange',
+            index=models.Index(fields=['transaction_id', 'recipe_id'], name='api_change_position_idx'),
+        ),
+        migrations.RunSQL(LOG_EXISTING_RECIPES, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_recipe_change_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ingredient',
+            index=models.Index(condition=models.Q(('category__isnull', False), ('recipe__isnull', False)), fields=['category', 'recipe'], name='api_ingr_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['difficulty_level', 'created_at', 'id'], name='api_recipe_difficulty_idx'),
+        ),
+    ]
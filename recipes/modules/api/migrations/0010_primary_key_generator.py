@@ -0,0 +1,29 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:17
+
+from django.db import migrations, models
+import modules.api.ids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ingredient',
+            name='id',
+            field=models.UUIDField(default=modules.api.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='id',
+            field=models.UUIDField(default=modules.api.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='step',
+            name='id',
+            field=models.UUIDField(default=modules.api.ids.new_id, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 3.2.8 on 2026-10-18 09:12
+
+from django.db import migrations
+
+# Recipe.search_vector is maintained by the database: name, description and
+# ingredient names weighted A/B/C under every configuration of
+# SEARCH_LANGUAGES (which has to be migrated along with this function). Recipe
+# rows compute it when written, and ingredient statements recompute it for the
+# recipes whose ingredient names they changed, once per statement.
+CREATE_SEARCH_TRIGGERS = """
+CREATE FUNCTION api_recipe_search_vector(recipe uuid, recipe_name text, recipe_description text)
+RETURNS tsvector LANGUAGE sql STABLE AS $$
+    SELECT setweight(to_tsvector('portuguese'::regconfig, COALESCE(recipe_name, '')), 'A')
+        || setweight(to_tsvector('portuguese'::regconfig, COALESCE(recipe_description, '')), 'B')
+        || setweight(to_tsvector('portuguese'::regconfig, COALESCE(string_agg(name, ' '), '')), 'C')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(recipe_name, '')), 'A')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(recipe_description, '')), 'B')
+        || setweight(to_tsvector('english'::regconfig, COALESCE(string_agg(name, ' '), '')), 'C')
+    FROM api_ingredient WHERE recipe_id = recipe
+$$;
+
+CREATE FUNCTION api_recipe_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.search_vector := api_recipe_search_vector(NEW.id, NEW.name, NEW.description);
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER api_recipe_search_vector
+BEFORE INSERT OR UPDATE OF name, description ON api_recipe
+FOR EACH ROW EXECUTE FUNCTION api_recipe_search_vector_trigger();
+
+CREATE FUNCTION api_ingredient_search_vector_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE api_recipe SET search_vector = api_recipe_search_vector(id, name, description)
+        WHERE id IN (SELECT recipe_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE api_recipe SET search_vector = api_recipe_search_vector(id, name, description)
+        WHERE id IN (SELECT recipe_id FROM old_rows);
+    ELSE
+        UPDATE api_recipe SET search_vector = api_recipe_search_vector(id, name, description)
+        WHERE id IN (
+            SELECT unnest(ARRAY[old_rows.recipe_id, new_rows.recipe_id])
+            FROM old_rows JOIN new_rows USING (id)
+            WHERE old_rows.name IS DISTINCT FROM new_rows.name
+                OR old_rows.recipe_id IS DISTINCT FROM new_rows.recipe_id
+        );
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER api_ingredient_search_vector_insert
+AFTER INSERT ON api_ingredient REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_ingredient_search_vector_trigger();
+
+CREATE TRIGGER api_ingredient_search_vector_update
+AFTER UPDATE ON api_ingredient REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_ingredient_search_vector_trigger();
+
+CREATE TRIGGER api_ingredient_search_vector_delete
+AFTER DELETE ON api_ingredient REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_ingredient_search_vector_trigger();
+
+-- Existing recipes, under the same definition.
+UPDATE api_recipe SET search_vector = api_recipe_search_vector(id, name, description);
+"""
+
+DROP_SEARCH_TRIGGERS = """
+DROP TRIGGER api_ingredient_search_vector_delete ON api_ingredient;
+DROP TRIGGER api_ingredient_search_vector_update ON api_ingredient;
+DROP TRIGGER api_ingredient_search_vector_insert ON api_ingredient;
+DROP FUNCTION api_ingredient_search_vector_trigger();
+DROP TRIGGER api_recipe_search_vector ON api_recipe;
+DROP FUNCTION api_recipe_search_vector_trigger();
+DROP FUNCTION api_recipe_search_vector(uuid, text, text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_primary_key_generator'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEARCH_TRIGGERS, DROP_SEARCH_TRIGGERS),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 3.2.8 on 2026-10-18 11:40
+
+from django.db import migrations, models
+
+# Recipe.ingredient_count is maintained by the database. Ingredient statements
+# recount the recipes whose ingredients they added, removed or moved, once per
+# statement; a recipe row written by the application (which always sends the
+# column on save) is recounted too, so a stale instance cannot overwrite it.
+# Writes made by the ingredient triggers themselves skip that recount.
+CREATE_COUNT_TRIGGERS = """
+CREATE FUNCTION api_recipe_ingredient_count(recipe uuid) RETURNS integer LANGUAGE sql STABLE AS $$
+    SELECT count(*)::integer FROM api_ingredient WHERE recipe_id = recipe
+$$;
+
+CREATE FUNCTION api_recipe_ingredient_count_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.ingredient_count := api_recipe_ingredient_count(NEW.id);
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER api_recipe_ingredient_count
+BEFORE INSERT OR UPDATE OF ingredient_count ON api_recipe
+FOR EACH ROW WHEN (pg_trigger_depth() = 0) EXECUTE FUNCTION api_recipe_ingredient_count_trigger();
+
+CREATE FUNCTION api_ingredient_count_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE api_recipe SET ingredient_count = api_recipe_ingredient_count(id)
+        WHERE id IN (SELECT recipe_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE api_recipe SET ingredient_count = api_recipe_ingredient_count(id)
+        WHERE id IN (SELECT recipe_id FROM old_rows);
+    ELSE
+        UPDATE api_recipe SET ingredient_count = api_recipe_ingredient_count(id)
+        WHERE id IN (
+            SELECT unnest(ARRAY[old_rows.recipe_id, new_rows.recipe_id])
+            FROM old_rows JOIN new_rows USING (id)
+            WHERE old_rows.recipe_id IS DISTINCT FROM new_rows.recipe_id
+        );
+    END IF;
+    RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER api_ingredient_count_insert
+AFTER INSERT ON api_ingredient REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_ingredient_count_trigger();
+
+CREATE TRIGGER api_ingredient_count_update
+AFTER UPDATE ON api_ingredient REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_ingredient_count_trigger();
+
+CREATE TRIGGER api_ingredient_count_delete
+AFTER DELETE ON api_ingredient REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION api_ingredient_count_trigger();
+
+-- Existing recipes.
+UPDATE api_recipe SET ingredient_count = api_recipe_ingredient_count(id);
+"""
+
+DROP_COUNT_TRIGGERS = """
+DROP TRIGGER api_ingredient_count_delete ON api_ingredient;
+DROP TRIGGER api_ingredient_count_update ON api_ingredient;
+DROP TRIGGER api_ingredient_count_insert ON api_ingredient;
+DROP FUNCTION api_ingredient_count_trigger();
+DROP TRIGGER api_recipe_ingredient_count ON api_recipe;
+DROP FUNCTION api_recipe_ingredient_count_trigger();
+DROP FUNCTION api_recipe_ingredient_count(uuid);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_recipe_search_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='ingredient_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(CREATE_COUNT_TRIGGERS, DROP_COUNT_TRIGGERS),
+    ]
@@ -1,11 +1,31 @@
-import uuid
+import re
+import unicodedata
 
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import connection, connections, models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from modules.api.ids import new_id
+from modules.api.units import QUANTITY_DIGITS, UNIT_SIZES, UNIT_SYSTEMS, UNSCALED_UNITS
+
+
+def normalize_ingredient_name(name):
+    """
+    Fold an ingredient name for matching: case and accents are dropped and
+    anything that is not a letter or digit collapses into single spaces, so
+    "  Limão-Taiti " and "limao taiti" compare equal.
+    """
+    name = unicodedata.normalize("NFKD", name or "")
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return re.sub(r"[\W_]+", " ", name.casefold()).strip()
+
 
 class BaseModel(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -13,6 +33,92 @@ class BaseModel(models.Model):
         abstract = True
 
 
+RECIPE_CHILDREN = ("ingredients", "steps")
+
+
+def recipe_children_querysets():
+    return {
+        "ingredients": Ingredient.objects.order_by("name", "id"),
+        "steps": Step.objects.order_by("step", "id"),
+    }
+
+
+# Deletes recipes along with their ingredients and steps in one statement,
+# instead of the per-row collection of the ORM, which would also leave the
+# children behind with a null recipe (``on_delete=SET_NULL``).
+DELETE_RECIPES = """
+WITH ingredients AS (
+    DELETE FROM api_ingredient WHERE recipe_id = ANY(%(ids)s::uuid[])
+), steps AS (
+    DELETE FROM api_step WHERE recipe_id = ANY(%(ids)s::uuid[])
+)
+DELETE FROM api_recipe WHERE id = ANY(%(ids)s::uuid[])
+RETURNING id
+"""
+
+# Deletes at most ``limit`` children left without a recipe, found through the
+# index leading with ``recipe_id``. Rows locked by another transaction are
+# skipped rather than waited for.
+DELETE_ORPHANS = """
+DELETE FROM {table} WHERE id IN (
+    SELECT id FROM {table} WHERE recipe_id IS NULL LIMIT %s FOR UPDATE SKIP LOCKED
+)
+"""
+
+
+def recipe_children_prefetches(children=RECIPE_CHILDREN):
+    querysets = recipe_children_querysets()
+    return tuple(models.Prefetch(name, queryset=querysets[name]) for name in children)
+
+
+class RecipeQuerySet(models.QuerySet):
+    def with_children(self, children=RECIPE_CHILDREN):
+        return self.defer("search_vector").prefetch_related(*recipe_children_prefetches(children))
+
+    def touch(self, **fields):
+        return self.update(updated_at=timezone.now(), **fields)
+
+    def delete_with_children(self, recipe_ids):
+        """
+        Delete ``recipe_ids`` and their ingredients and steps, returning the
+        ids of the recipes that existed.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(DELETE_RECIPES, {"ids": sorted(str(pk) for pk in recipe_ids)})
+            return [pk for pk, in cursor.fetchall()]
+
+    def with_scaled_servings(self, servings):
+        """
+        Annotate ``scaled_servings``: ``servings`` on the recipes that have
+        servings, which are the ones scaled to it, their own elsewhere.
+        """
+        return self.annotate(scaled_servings=models.Case(
+            models.When(servings__gt=0, then=models.Value(servings)),
+            default=models.F("servings"),
+            output_field=models.PositiveSmallIntegerField(),
+        ))
+
+    def cookable_with(self, pantry):
+        """
+        Recipes sharing at least one ingredient with ``pantry`` (ingredient
+        names), annotated with how many of their ingredients it covers and
+        ordered by that coverage. Only the matching ingredients are read and
+        counted, through the normalized name index; totals come from the
+        stored ``ingredient_count``.
+        """
+        names = {normalize_ingredient_name(name) for name in pantry} - {""}
+        # Filtering before annotating counts the filtered join alone.
+        return self.filter(ingredients__normalized_name__in=names).annotate(
+            matched_ingredients=models.Count("ingredients"),
+            total_ingredients=models.F("ingredient_count"),
+        ).annotate(
+            coverage=models.ExpressionWrapper(
+                models.F("matched_ingredients") * 1.0 / models.F("total_ingredients"),
+                output_field=models.FloatField(),
+            ),
+        ).order_by("-coverage", "-matched_ingredients", "id")
+
+
 class Recipe(BaseModel):
     difficulty_levels = [
         ("beginner", _("Iniciante")),
@@ -24,6 +130,198 @@ class Recipe(BaseModel):
     image_url = models.URLField(null=True, blank=True)
     video_url = models.URLField(null=True, blank=True)
     difficulty_level = models.CharField(choices=difficulty_levels, max_length=255)
+    servings = models.PositiveSmallIntegerField(null=True, blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Maintained by the database, whatever value is written (see migration 0012).
+    ingredient_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="api_recipe_created_id_idx"),
+            models.Index(fields=["updated_at"], name="api_recipe_updated_idx"),
+            models.Index(fields=["difficulty_level", "created_at", "id"], name="api_recipe_difficulty_idx"),
+            GinIndex(fields=["search_vector"], name="api_recipe_search_idx"),
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="api_recipe_name_trgm_idx"),
+        ]
+
+
+class RecipeChildQuerySet(models.QuerySet):
+
+    def delete_orphans(self, limit):
+        """
+        Delete up to ``limit`` rows left without a recipe, returning how many
+        were deleted.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(DELETE_ORPHANS.format(table=connection.ops.quote_name(self.model._meta.db_table)), [limit])
+            return cursor.rowcount
+
+
+def rounded_quantity(expression):
+    return models.Func(
+        expression, template=f"ROUND((%(expressions)s)::numeric, {QUANTITY_DIGITS})::double precision",
+        output_field=models.FloatField(),
+    )
+
+
+def unit_size():
+    """
+    Size of the unit of each ingredient in the base unit of its dimension,
+    null for the units without a size.
+    """
+    return models.Case(
+        *[models.When(unit_type=unit, then=models.Value(size)) for unit, (dimension, size) in UNIT_SIZES.items()],
+        output_field=models.FloatField(),
+    )
+
+
+def system_unit(amount, dimensions, system):
+    """
+    Unit of ``system`` best suited to a quantity of ``amount`` (the name of an
+    annotation in base units), the largest one holding at least one of it,
+    and the size of that unit, as two expressions. ``dimensions`` gives the
+    condition selecting the rows of each dimension; other rows get nulls.
+    """
+    whens = []
+    for dimension, condition in dimensions.items():
+        targets = UNIT_SYSTEMS[system][dimension]
+        whens.extend(
+            (condition & models.Q(**{f"{amount}__gte": UNIT_SIZES[target][1]}), target) for target in targets[:-1]
+        )
+        whens.append((condition, targets[-1]))
+    unit = models.Case(
+        *[models.When(condition, then=models.Value(target)) for condition, target in whens],
+        output_field=models.CharField(),
+    )
+    size = models.Case(
+        *[models.When(condition, then=models.Value(UNIT_SIZES[target][1])) for condition, target in whens],
+        output_field=models.FloatField(),
+    )
+    return unit, size
+
+
+def unit_dimensions(system):
+    """
+    Condition selecting the ingredients of each dimension of ``system``.
+    """
+    return {
+        dimension: models.Q(unit_type__in=[unit for unit, (unit_dimension, size) in UNIT_SIZES.items()
+                                            if unit_dimension == dimension])
+        for dimension in UNIT_SYSTEMS[system]
+    }
+
+
+class IngredientQuerySet(RecipeChildQuerySet):
+    """
+    Keeps ``normalized_name`` in sync on bulk writes, which bypass ``save()``.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for obj in objs:
+            obj.normalized_name = normalize_ingredient_name(obj.name)
+        return super(IngredientQuerySet, self).bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs, fields = list(objs), list(fields)
+        if "name" in fields:
+            for obj in objs:
+                obj.normalized_name = normalize_ingredient_name(obj.name)
+            if "normalized_name" not in fields:
+                fields.append("normalized_name")
+        return super(IngredientQuerySet, self).bulk_update(objs, fields, *args, **kwargs)
+
+    def scaled(self, scale=None, servings=None, units=None):
+        """
+        Annotate ``scaled_quantity`` and ``scaled_unit_type``: the quantity
+        multiplied by ``scale``, or by ``servings`` over the servings of its
+        recipe, and when ``units`` names one of ``UNIT_SYSTEMS``, expressed in
+        the largest unit of that system holding at least one of it, rounded to
+        ``QUANTITY_DIGITS``. Quantities left unchanged (null ones,
+        ``UNSCALED_UNITS`` and, without ``units``, those of recipes without
+        servings) are returned as stored.
+        """
+        unchanged = models.Q(quantity__isnull=True) | models.Q(unit_type__in=UNSCALED_UNITS)
+        if scale is not None:
+            factor = models.Value(float(scale))
+        elif servings is not None:
+            factor = models.Case(
+                models.When(recipe__servings__gt=0, then=models.Value(float(servings)) / models.F("recipe__servings")),
+                default=models.Value(1.0),
+                output_field=models.FloatField(),
+            )
+            if units is None:
+                unchanged |= ~models.Q(recipe__servings__gt=0)
+        else:
+            factor = models.Value(1.0)
+        amount = models.F("quantity") * factor
+        if units is not None:
+            amount = amount * Coalesce(unit_size(), models.Value(1.0))
+        qs = self.annotate(scaled_amount=models.ExpressionWrapper(amount, output_field=models.FloatField()))
+        quantity, unit = models.F("scaled_amount"), models.F("unit_type")
+        if units is not None:
+            system_unit_type, system_unit_size = system_unit("scaled_amount", unit_dimensions(units), units)
+            quantity = quantity / Coalesce(system_unit_size, models.Value(1.0))
+            unit = models.Case(
+                models.When(unchanged, then=models.F("unit_type")),
+                default=Coalesce(system_unit_type, models.F("unit_type")),
+            )
+        return qs.annotate(
+            scaled_quantity=models.Case(
+                models.When(unchanged, then=models.F("quantity")),
+                default=rounded_quantity(quantity),
+                output_field=models.FloatField(),
+            ),
+            scaled_unit_type=unit,
+        )
+
+    def shopping_list(self, factors, units="metric"):
+        """
+        Ingredients of the recipes in ``factors`` (recipe id to quantity
+        multiplier) grouped by normalized name, category and dimension, in one
+        query. Quantities are multiplied by their recipe's factor, converted
+        to the base unit of their dimension (see ``modules.api.units``),
+        summed, and the totals expressed in the unit of the ``units`` system
+        best suited to them as ``total_quantity`` and ``total_unit_type``;
+        units without a size are grouped on their own and ``UNSCALED_UNITS``
+        have no quantity.
+        """
+        factor = models.Case(
+            *[models.When(recipe=pk, then=models.Value(value)) for pk, value in factors.items()],
+            output_field=models.FloatField(),
+        )
+        size = models.Case(
+            *[models.When(unit_type=unit, then=models.Value(None)) for unit in UNSCALED_UNITS],
+            default=Coalesce(unit_size(), models.Value(1.0)),
+            output_field=models.FloatField(),
+        )
+        dimension = models.Case(
+            *[
+                models.When(unit_type=unit, then=models.Value(dimension))
+                for unit, (dimension, size) in UNIT_SIZES.items()
+            ],
+            default=models.F("unit_type"),
+            output_field=models.CharField(),
+        )
+        qs = self.filter(recipe__in=list(factors)).annotate(dimension=dimension).values(
+            "normalized_name", "category", "dimension"
+        ).annotate(
+            name=models.Min("name"),
+            quantity=models.Sum(models.F("quantity") * factor * size, output_field=models.FloatField()),
+            recipes=models.Count("recipe", distinct=True),
+        )
+        dimensions = {dimension: models.Q(dimension=dimension) for dimension in UNIT_SYSTEMS[units]}
+        total_unit_type, total_unit_size = system_unit("quantity", dimensions, units)
+        return qs.annotate(
+            total_quantity=models.Case(
+                models.When(quantity__isnull=True, then=models.Value(None)),
+                default=rounded_quantity(models.F("quantity") / Coalesce(total_unit_size, models.Value(1.0))),
+                output_field=models.FloatField(),
+            ),
+            total_unit_type=Coalesce(total_unit_type, models.F("dimension")),
+        ).order_by("category", "normalized_name", "dimension")
 
 
 class Ingredient(models.Model):
@@ -52,16 +350,151 @@ class Ingredient(models.Model):
         ("Vegetables", _("Legumes")),
         ("Others", _("Outros")),
     ]
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
     recipe = models.ForeignKey(Recipe, on_delete=models.SET_NULL, related_name="ingredients", null=True)
     quantity = models.FloatField(null=True)
     unit_type = models.CharField(choices=UNIT_TYPES, max_length=255)
     name = models.CharField(max_length=255)
     category = models.CharField(choices=CATEGORIES, null=True, max_length=255)
+    normalized_name = models.CharField(max_length=255, editable=False, default="")
+
+    objects = IngredientQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["recipe", "name", "id"], name="api_ingr_recipe_name_idx"),
+            GinIndex(fields=["name"], opclasses=["gin_trgm_ops"], name="api_ingr_name_trgm_idx"),
+            models.Index(fields=["normalized_name", "recipe"], name="api_ingr_normalized_idx"),
+            models.Index(
+                fields=["category", "recipe"], name="api_ingr_category_idx",
+                condition=models.Q(category__isnull=False, recipe__isnull=False),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.normalized_name = normalize_ingredient_name(self.name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "normalized_name"}
+        super(Ingredient, self).save(*args, **kwargs)
+
+
+class StepQuerySet(RecipeChildQuerySet):
+    """
+    Step numbers are unique per recipe through a deferred constraint, so the
+    renumbering below can run as single UPDATE statements that are only
+    checked once the transaction commits.
+    """
+
+    def open_gap(self, recipe_id, position):
+        """
+        Free ``position``, when taken, by shifting it and every later step
+        down by one.
+        """
+        if not self.filter(recipe=recipe_id, step=position).exists():
+            return 0
+        return self.filter(recipe=recipe_id, step__gte=position).update(step=models.F("step") + 1)
+
+    def check_unique(self):
+        """
+        Check the deferred constraint now, raising ``IntegrityError`` while
+        the caller can still turn it into a validation error instead of at
+        commit.
+        """
+        with connections[self.db].cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+
+    def move(self, recipe_id, source, target):
+        """
+        Move step ``source`` to ``target``, shifting the steps in between by
+        one towards the free slot.
+        """
+        if source == target:
+            return 0
+        if source < target:
+            between, shift = models.Q(step__gt=source, step__lte=target), models.F("step") - 1
+        else:
+            between, shift = models.Q(step__gte=target, step__lt=source), models.F("step") + 1
+        return self.filter(recipe=recipe_id).filter(models.Q(step=source) | between).update(
+            step=models.Case(models.When(step=source, then=models.Value(target)), default=shift)
+        )
 
 
 class Step(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=new_id, editable=False)
     recipe = models.ForeignKey(Recipe, on_delete=models.SET_NULL, related_name="steps", null=True)
     step = models.IntegerField()
     description = models.TextField(blank=True, max_length=1024)
+
+    objects = StepQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["recipe", "step"], name="api_step_recipe_step_uniq",
+                deferrable=models.Deferrable.DEFERRED,
+            ),
+        ]
+
+
+# Id of the current transaction (assigning one if needed) and the oldest
+# transaction still running, below which every transaction has ended.
+CURRENT_TRANSACTION_ID = "pg_current_xact_id()::text::bigint"
+TRANSACTION_HORIZON = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+RECORD_CHANGES = f"""
+INSERT INTO api_recipechange (recipe_id, transaction_id, deleted, changed_at)
+SELECT recipe_id, {CURRENT_TRANSACTION_ID}, %s, now()
+FROM unnest(%s::uuid[]) AS recipe_id
+ON CONFLICT (recipe_id) DO UPDATE SET
+    transaction_id = EXCLUDED.transaction_id,
+    deleted = EXCLUDED.deleted,
+    changed_at = EXCLUDED.changed_at
+"""
+
+
+class RecipeChangeQuerySet(models.QuerySet):
+
+    def record(self, recipe_ids, deleted=False):
+        """
+        Log a change (or the deletion) of ``recipe_ids`` in the current
+        transaction, replacing any earlier entry of those recipes.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(RECORD_CHANGES, [deleted, sorted(str(pk) for pk in recipe_ids)])
+
+    def since(self, position=None):
+        """
+        Entries after ``position`` (a ``(transaction_id, recipe_id)`` pair, None
+        for all of them) in log order, only from transactions older than every
+        running one: entries of a transaction still running could otherwise
+        commit behind a position already handed out, and be missed.
+        """
+        qs = self.filter(transaction_id__lt=RawSQL(TRANSACTION_HORIZON, []))
+        if position is not None:
+            transaction_id, recipe_id = position
+            qs = qs.filter(
+                models.Q(transaction_id__gt=transaction_id)
+                | models.Q(transaction_id=transaction_id, recipe_id__gt=recipe_id)
+            )
+        return qs.order_by("transaction_id", "recipe_id")
+
+
+class RecipeChange(models.Model):
+    """
+    Change log behind the sync feed, holding one row per recipe: the last
+    transaction that created, changed or deleted it or one of its
+    ingredients or steps, so a sync reads one row per recipe changed since.
+    """
+    recipe_id = models.UUIDField(primary_key=True)
+    transaction_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    objects = RecipeChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["transaction_id", "recipe_id"], name="api_change_position_idx"),
+        ]
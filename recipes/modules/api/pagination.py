@@ -0,0 +1,193 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils.translation import gettext as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+Cursor = namedtuple("Cursor", ["reverse", "position"])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on the (unique) ordering key instead of
+    skipping rows, so every page costs the same no matter how deep it is.
+
+    The ordering is taken from the view's ``ordering`` attribute and its last
+    field must be unique (``id``) so that positions never tie.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 1000
+    ordering = ("created_at", "id")
+    invalid_cursor_message = _("Invalid cursor")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        self.model = queryset.model
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor.reverse if self.cursor else False
+        if reverse:
+            queryset = queryset.order_by(*(f"-{field}" for field in self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if self.cursor:
+            queryset = queryset.filter(self.seek_filter(self.ordering, self.cursor.position, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_following
+        else:
+            self.has_next, self.has_previous = has_following, self.cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("previous", self.get_previous_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "previous": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, view):
+        return tuple(getattr(view, "ordering", None) or self.ordering)
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):
+            return [instance[field] for field in self.ordering]
+        return [getattr(instance, field) for field in self.ordering]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(Cursor(reverse=False, position=self.get_position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(reverse=True, position=self.get_position(self.page[0])))
+
+    @classmethod
+    def seek_filter(cls, fields, values, reverse):
+        """
+        Build ``(f1, f2, ...) > (v1, v2, ...)`` as
+        ``f1 >= v1 AND (f1 > v1 OR (f2, ...) > (v2, ...))`` so the leading
+        column stays an index range condition.
+        """
+        lookup = "lt" if reverse else "gt"
+        field, value = fields[0], values[0]
+        strict = Q(**{f"{field}__{lookup}": value})
+        if len(fields) == 1:
+            return strict
+        return Q(**{f"{field}__{lookup}e": value}) & (strict | cls.seek_filter(fields[1:], values[1:], reverse))
+
+    def decode_cursor(self, request):
+        """
+        Cursors come back from clients, so every position value is converted
+        with its ordering field before it reaches a query: a tampered value is
+        an invalid cursor, not a database error.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            reverse, values = bool(data["r"]), list(data["p"])
+            if len(values) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+            position = [
+                self.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in position:
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        data = json.dumps({"r": int(cursor.reverse), "p": cursor.position}, default=str)
+        encoded = base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class SelectablePagination(BasePagination):
+    """
+    Delegates to limit/offset or keyset pagination. The mode is picked per
+    request with ``?pagination=offset|cursor`` (a ``cursor`` parameter implies
+    keyset mode) and defaults to the ``API_PAGINATION_MODE`` setting. Views
+    can force a mode through a ``pagination_mode`` attribute.
+    """
+    mode_query_param = "pagination"
+    modes = {
+        "offset": LimitOffsetPagination,
+        "cursor": KeysetPagination,
+    }
+    invalid_mode_message = _("Invalid pagination mode")
+
+    paginator = None
+
+    def get_mode(self, request, view=None):
+        forced = getattr(view, "pagination_mode", None)
+        if forced is not None:
+            return forced
+        mode = request.query_params.get(self.mode_query_param)
+        if mode is None and KeysetPagination.cursor_query_param in request.query_params:
+            mode = "cursor"
+        mode = mode or settings.API_PAGINATION_MODE
+        if mode not in self.modes:
+            raise NotFound(self.invalid_mode_message)
+        return mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginator = self.modes[self.get_mode(request, view)]()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return LimitOffsetPagination().get_paginated_response_schema(schema)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, "display_page_controls", False)
+
+    def to_html(self):
+        return self.paginator.to_html()
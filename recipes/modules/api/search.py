@@ -0,0 +1,49 @@
+import operator
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from modules.api.models import Ingredient, Recipe
+
+
+def search_query(text, language=None):
+    configs = [settings.SEARCH_LANGUAGES[language]] if language else settings.SEARCH_LANGUAGES.values()
+    return reduce(operator.or_, [
+        SearchQuery(text, config=config, search_type="websearch") for config in configs
+    ])
+
+
+def search_recipes(queryset, text, language=None):
+    """
+    Rank ``queryset`` against ``text`` using the full text index. When nothing
+    matches (typos, partial words), ``similar_recipes`` ranks by trigram
+    similarity instead.
+    """
+    query = search_query(text, language)
+    return queryset.filter(search_vector=query).annotate(
+        rank=SearchRank(F("search_vector"), query)
+    ).order_by("-rank", "id")
+
+
+def similar_recipes(queryset, text):
+    # Candidates come from the trigram indexes, in subqueries so that the
+    # count and the page of a fallback do not read them twice.
+    candidates = Q(
+        pk__in=Recipe.objects.filter(name__trigram_similar=text).values("pk")[:settings.SEARCH_MAX_CANDIDATES]
+    ) | Q(
+        pk__in=Ingredient.objects.filter(name__trigram_similar=text, recipe__isnull=False)
+        .values("recipe_id")[:settings.SEARCH_MAX_CANDIDATES]
+    )
+    ingredient_similarity = Ingredient.objects.filter(recipe=OuterRef("pk")).annotate(
+        similarity=TrigramSimilarity("name", text)
+    ).order_by("-similarity").values("similarity")[:1]
+    return queryset.filter(candidates).annotate(
+        rank=Greatest(
+            TrigramSimilarity("name", text),
+            Coalesce(Subquery(ingredient_similarity), Value(0.0)),
+            output_field=FloatField(),
+        )
+    ).order_by("-rank", "id")
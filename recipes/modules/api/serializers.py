@@ -1,7 +1,13 @@
+from collections import defaultdict
+
+from django.conf import settings
 from django.utils.translation import gettext as _
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from modules.api.changes import recipe_changed, recipes_created
 from modules.api.models import Recipe, Step, Ingredient
+from modules.api.units import parse_factor
 
 
 class StepSerializer(serializers.ModelSerializer):
@@ -13,25 +19,45 @@ class StepSerializer(serializers.ModelSerializer):
 class IngredientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Ingredient
-        fields = "__all__"
+        exclude = ("normalized_name",)
 
 
 class RecipeSerializer(serializers.ModelSerializer):
     ingredients = serializers.ListSerializer(child=IngredientSerializer())
     steps = serializers.ListSerializer(child=StepSerializer())
 
-    def create(self, validated_data):
+    def __init__(self, *args, fields=None, **kwargs):
+        # ``fields`` restricts the output to the given field names.
+        super(RecipeSerializer, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def validate_steps(self, steps):
+        numbers = [step["step"] for step in steps]
+        if len(numbers) != len(set(numbers)):
+            raise serializers.ValidationError(_("Step numbers must be unique."))
+        return steps
+
+    @staticmethod
+    def build(validated_data):
+        """
+        Unsaved recipe, ingredient and step instances for ``validated_data``.
+        """
+        validated_data = dict(validated_data)
         ingredients_data = validated_data.pop("ingredients")
         steps_data = validated_data.pop("steps")
-        recipe = Recipe.objects.create(**validated_data)
-        Ingredient.objects.bulk_create([
-            Ingredient(recipe=recipe, **ingredient)
-            for ingredient in ingredients_data
-        ])
-        Step.objects.bulk_create([
-            Step(recipe=recipe, **step)
-            for step in steps_data
-        ])
+        recipe = Recipe(**validated_data)
+        ingredients = [Ingredient(**{**ingredient, "recipe": recipe}) for ingredient in ingredients_data]
+        steps = [Step(**{**step, "recipe": recipe}) for step in steps_data]
+        return recipe, ingredients, steps
+
+    def create(self, validated_data):
+        recipe, ingredients, steps = self.build(validated_data)
+        recipe.save(force_insert=True)
+        Ingredient.objects.bulk_create(ingredients)
+        Step.objects.bulk_create(steps)
+        recipes_created(recipe.pk)
         return recipe
 
     def update(self, instance, validated_data):
@@ -41,8 +67,146 @@ class RecipeSerializer(serializers.ModelSerializer):
                          "specific endpoints (recipes/<recipe_id/ingredients/<ingredient_id>/ "
                          "or recipes/<recipe_id/steps/<step>/)")
             )
-        return super(RecipeSerializer, self).update(instance, validated_data)
+        recipe = super(RecipeSerializer, self).update(instance, validated_data)
+        recipe_changed(recipe.pk, touch=False)
+        return recipe
 
     class Meta:
         model = Recipe
-        fields = "__all__"
+        exclude = ("search_vector", "ingredient_count")
+
+
+class CookableRecipeSerializer(RecipeSerializer):
+    coverage = serializers.FloatField(read_only=True)
+    matched_ingredients = serializers.IntegerField(read_only=True)
+    total_ingredients = serializers.IntegerField(read_only=True)
+
+
+class ShoppingListItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    servings = serializers.IntegerField(min_value=1, max_value=32767, required=False)
+    scale = serializers.FloatField(required=False)
+
+    def validate_scale(self, scale):
+        try:
+            return parse_factor(scale)
+        except ValueError:
+            raise serializers.ValidationError(_("A valid positive number is required."))
+
+    def validate(self, data):
+        if "servings" in data and "scale" in data:
+            raise serializers.ValidationError(_("Give either servings or scale, not both."))
+        return data
+
+
+class ShoppingListSerializer(serializers.Serializer):
+    recipes = serializers.ListField(child=ShoppingListItemSerializer(), allow_empty=False)
+
+    def validate_recipes(self, recipes):
+        if len(recipes) > settings.SHOPPING_LIST_MAX_RECIPES:
+            raise serializers.ValidationError(
+                _("At most %(count)d recipes per shopping list.") % {"count": settings.SHOPPING_LIST_MAX_RECIPES}
+            )
+        return recipes
+
+    def validate(self, data):
+        # The servings of every listed recipe, which also tells the unknown ones.
+        ids = {item["id"] for item in data["recipes"]}
+        servings = dict(Recipe.objects.filter(pk__in=ids).values_list("pk", "servings"))
+        missing = sorted(str(pk) for pk in ids - set(servings))
+        if missing:
+            raise serializers.ValidationError({"recipes": _("Unknown recipes: %(ids)s") % {"ids": ", ".join(missing)}})
+        data["servings"] = servings
+        return data
+
+
+def representation(field):
+    """
+    Return a function giving ``field.to_representation(value)`` for a non null
+    column value, skipping the field object for the types whose output is a
+    plain conversion of the value.
+    """
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == "hex_verbose":
+        return str
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        field_timezone = getattr(field, "timezone", field.default_timezone())
+        if output_format and output_format.lower() == "iso-8601" and field_timezone is not None:
+            def iso_datetime(value):
+                value = value.astimezone(field_timezone).isoformat()
+                return value[:-6] + "Z" if value.endswith("+00:00") else value
+            return iso_datetime
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return lambda value: value
+    if isinstance(field, serializers.RelatedField):
+        raise TypeError(f"{type(field).__name__} cannot be read from column values")
+    if type(field) in (serializers.CharField, serializers.URLField):
+        return str
+    if type(field) is serializers.FloatField:
+        return float
+    if type(field) is serializers.IntegerField:
+        return int
+    return field.to_representation
+
+
+class ValuesSerializer:
+    """
+    Read only counterpart of a ModelSerializer instance working on
+    ``.values()`` rows instead of model instances, with the same output.
+
+    Plain fields become one conversion per column; nested list serializers
+    are filled with one query per list over the given rows, grouped by their
+    parent in a single pass. ``querysets`` gives the (ordered) queryset of
+    each nested list, by field name. ``sources`` gives the column (typically
+    an annotation) read instead of a field's source, by field name, or for a
+    nested list, the ``sources`` of its items.
+    """
+
+    def __init__(self, serializer, querysets=None, sources=None):
+        querysets = querysets or {}
+        sources = sources or {}
+        model = serializer.Meta.model
+        self.pk = model._meta.pk.attname
+        self.fields = []
+        self.nested = {}
+        for name, field in serializer.fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                relation = model._meta.get_field(field.source)
+                queryset = querysets.get(name, relation.related_model._default_manager.all())
+                self.nested[name] = (
+                    ValuesSerializer(field.child, sources=sources.get(name)), queryset, relation.field.attname
+                )
+                self.fields.append((name, None, None))
+            else:
+                self.fields.append((name, sources.get(name, field.source), representation(field)))
+
+    @property
+    def columns(self):
+        return list(dict.fromkeys([self.pk, *(source for _, source, _ in self.fields if source is not None)]))
+
+    def fetch_nested(self, rows):
+        nested = {}
+        pks = [row[self.pk] for row in rows]
+        for name, (child, queryset, parent) in self.nested.items():
+            grouped = defaultdict(list)
+            if pks:
+                children = queryset.filter(**{f"{parent}__in": pks}).values(*dict.fromkeys([*child.columns, parent]))
+                for row in children:
+                    grouped[row[parent]].append(child.document(row))
+            nested[name] = grouped
+        return nested
+
+    def document(self, row, nested=None):
+        document = {}
+        for name, source, convert in self.fields:
+            if source is None:
+                document[name] = nested[name].get(row[self.pk], [])
+            else:
+                value = row[source]
+                document[name] = None if value is None else convert(value)
+        return document
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        nested = self.fetch_nested(rows) if self.nested else None
+        return [self.document(row, nested) for row in rows]
@@ -0,0 +1,43 @@
+from collections import defaultdict
+
+from modules.api.models import Ingredient
+
+
+def recipe_factors(items, servings):
+    """
+    Quantity multiplier of each recipe of a shopping list, given its
+    ``items`` (``id`` with ``servings`` or ``scale``) and the ``servings`` of
+    their recipes. A recipe listed several times is bought for every time.
+    """
+    factors = defaultdict(float)
+    for item in items:
+        recipe_servings = servings[item["id"]]
+        if "scale" in item:
+            factors[item["id"]] += item["scale"]
+        elif "servings" in item and recipe_servings:
+            factors[item["id"]] += item["servings"] / recipe_servings
+        else:
+            factors[item["id"]] += 1.0
+    return factors
+
+
+def shopping_list(items, servings):
+    """
+    Ingredients needed for ``items``, whose recipes have the given
+    ``servings`` (looked up by ``ShoppingListSerializer``), summed per
+    normalized name, category and dimension by
+    ``IngredientQuerySet.shopping_list`` and expressed in the metric unit
+    best suited to each total.
+    """
+    factors = recipe_factors(items, servings)
+    return [
+        {
+            "name": row["name"],
+            "normalized_name": row["normalized_name"],
+            "category": row["category"],
+            "quantity": row["total_quantity"],
+            "unit_type": row["total_unit_type"],
+            "recipes": row["recipes"],
+        }
+        for row in Ingredient.objects.shopping_list(factors)
+    ]
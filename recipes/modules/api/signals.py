@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from modules.api.authentication import token_cache
+
+
+@receiver(post_delete, sender=Token, dispatch_uid="api_token_deleted")
+def token_deleted(sender, instance, **kwargs):
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL, dispatch_uid="api_user_saved")
+def user_saved(sender, instance, created, **kwargs):
+    # Deactivation, but also permission changes, must not be served from a
+    # cached user.
+    if not created:
+        token_cache.invalidate(*Token.objects.filter(user=instance).values_list("key", flat=True))
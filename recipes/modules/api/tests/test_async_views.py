@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.test import AsyncClient
+from rest_framework.test import APITransactionTestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestAsyncViews(APITransactionTestCase):
+    # The async views query from pool threads, whose connections cannot see
+    # the uncommitted data of a TestCase transaction; they may also read from
+    # replicas, which mirror the test database.
+    databases = "__all__"
+
+    def setUp(self) -> None:
+        super(TestAsyncViews, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="recipe 1", difficulty_level="beginner")
+        Ingredient.objects.create(recipe=self.recipe, quantity=1, unit_type="gram", name="sugar")
+        Step.objects.create(recipe=self.recipe, step=1, description="Step 1")
+        Recipe.objects.create(name="recipe 2", difficulty_level="advanced")
+        self.path = f"recipes/{str(self.recipe.id)}/"
+        self.async_client = AsyncClient()
+        self.async_client.force_login(self.user)
+
+    def assertSameResponse(self, path):
+        sync_res = self.client.get(f"/api/v1/{path}")
+        async_res = self.client.get(f"/api/v1/async/{path}")
+        self.assertEqual(async_res.status_code, sync_res.status_code)
+        self.assertEqual(async_res["Content-Type"], sync_res["Content-Type"])
+        self.assertEqual(async_res.content, sync_res.content)
+        return async_res
+
+    def test_list(self):
+        self.assertEqual(len(self.assertSameResponse("recipes/").json()["results"]), 2)
+        sync_res = self.client.get("/api/v1/recipes/?pagination=cursor&limit=1")
+        async_res = self.client.get("/api/v1/async/recipes/?pagination=cursor&limit=1")
+        self.assertEqual(async_res.json()["results"], sync_res.json()["results"])
+        self.assertIn("/api/v1/async/recipes/?", async_res.json()["next"])
+
+    def test_detail(self):
+        self.assertEqual(self.assertSameResponse(self.path).json()["id"], str(self.recipe.id))
+
+    def test_nested_lists(self):
+        self.assertSameResponse(f"{self.path}ingredients/")
+        self.assertSameResponse(f"{self.path}steps/")
+
+    def test_not_found(self):
+        self.assertEqual(self.client.get("/api/v1/async/recipes/6a7d5a5e-8d3e-4a0c-9a0e-3c9e1f1b2d4c/").status_code, 404)
+
+    def test_conditional_get(self):
+        res = self.client.get(f"/api/v1/async/{self.path}")
+        res = self.client.get(f"/api/v1/async/{self.path}", HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+    def test_read_only(self):
+        res = self.client.delete(f"/api/v1/async/{self.path}")
+        self.assertEqual(res.status_code, 405)
+        self.assertTrue(Recipe.objects.filter(pk=self.recipe.pk).exists())
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/api/v1/async/recipes/").status_code, 403)
+
+    async def test_served_through_asgi(self):
+        res = await self.async_client.get(f"/api/v1/async/{self.path}")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["name"], "recipe 1")
@@ -0,0 +1,81 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from config.routers import PrimaryStickinessMiddleware
+from modules.api.cache import recipe_cache
+from modules.api.models import Recipe, Ingredient, Step
+
+
+@override_settings(RECIPE_CACHE_ALIAS="recipes")
+class TestBatchRead(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestBatchRead, self).setUp()
+        caches["recipes"].clear()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipes = []
+        for index in range(4):
+            recipe = Recipe.objects.create(name=f"recipe {index}", difficulty_level="beginner")
+            Ingredient.objects.create(recipe=recipe, quantity=index, unit_type="gram", name="sugar")
+            Step.objects.create(recipe=recipe, step=1, description="mix")
+            self.recipes.append(recipe)
+        self.url = "/api/v1/recipes/batch/"
+
+    def detail(self, recipe):
+        return self.client.get(f"/api/v1/recipes/{str(recipe.id)}/").json()
+
+    def test_request_order_and_not_found(self):
+        missing = str(uuid.uuid4())
+        ids = [str(self.recipes[2].id), missing, str(self.recipes[0].id), str(self.recipes[2].id)]
+        with self.assertNumQueries(3):
+            res = self.client.get(self.url, data={"ids": ",".join(ids)})
+        self.assertEqual(res.status_code, 200)
+        results = res.json()["results"]
+        self.assertListEqual([result and result["id"] for result in results], [ids[0], None, ids[2], ids[0]])
+        self.assertListEqual(res.json()["not_found"], [missing])
+        self.assertDictEqual(results[0], self.detail(self.recipes[2]))
+
+    def test_served_from_cache(self):
+        ids = [str(recipe.id) for recipe in self.recipes]
+        self.detail(self.recipes[1])
+        recipe_cache.reset_stats()
+        with self.assertNumQueries(3):
+            self.client.get(self.url, data={"ids": ids})
+        self.assertEqual(recipe_cache.stats()["hits"], 1)
+        with self.assertNumQueries(0):
+            res = self.client.get(self.url, data={"ids": ids})
+        self.assertEqual(recipe_cache.stats()["hits"], 5)
+        self.assertListEqual([result["name"] for result in res.json()["results"]], [r.name for r in self.recipes])
+        # Writes invalidate the batch entries as they do the detail ones.
+        self.client.patch(f"/api/v1/recipes/{ids[3]}/", {"name": "renamed"}, format="json")
+        res = self.client.get(self.url, data={"ids": ids})
+        self.assertEqual(res.json()["results"][3]["name"], "renamed")
+
+    @override_settings(RECIPE_CACHE_ALIAS="")
+    def test_without_cache(self):
+        with self.assertNumQueries(3):
+            res = self.client.get(self.url, data={"ids": [str(recipe.id) for recipe in self.recipes]})
+        self.assertEqual(len(res.json()["results"]), 4)
+
+    def test_post(self):
+        ids = [str(self.recipes[3].id), str(self.recipes[1].id)]
+        res = self.client.post(self.url, {"ids": ids}, format="json", HTTP_AUTHORIZATION="Token secret")
+        self.assertEqual(res.status_code, 200)
+        self.assertListEqual([result["id"] for result in res.json()["results"]], ids)
+        self.assertIsNone(caches["recipes"].get(PrimaryStickinessMiddleware.client_key(res.wsgi_request)))
+
+    @override_settings(RECIPE_BATCH_MAX_IDS=2)
+    def test_invalid(self):
+        for ids in ("", "not-a-uuid", ",".join(str(recipe.id) for recipe in self.recipes)):
+            res = self.client.get(self.url, data={"ids": ids})
+            self.assertEqual(res.status_code, 400, ids)
+        res = self.client.post(self.url, {"ids": str(self.recipes[0].id)}, format="json")
+        self.assertEqual(res.status_code, 400)
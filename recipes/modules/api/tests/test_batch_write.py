@@ -0,0 +1,102 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestBatchWrite(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestBatchWrite, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="recipe 1", difficulty_level="beginner")
+        self.other = Recipe.objects.create(name="recipe 2", difficulty_level="beginner")
+        self.sugar = Ingredient.objects.create(recipe=self.recipe, quantity=1, unit_type="cup", name="sugar")
+        self.flour = Ingredient.objects.create(recipe=self.recipe, quantity=2, unit_type="cup", name="flour")
+        self.foreign = Ingredient.objects.create(recipe=self.other, quantity=1, unit_type="cup", name="salt")
+        self.url = f"/api/v1/recipes/{str(self.recipe.id)}/ingredients/"
+
+    def test_patch_updates_and_creates_in_one_transaction(self):
+        with self.assertNumQueries(13) as queries:
+            res = self.client.patch(self.url, data=[
+                {"id": str(self.sugar.id), "quantity": 3},
+                {"quantity": 1, "unit_type": "teaspoon", "name": "vanilla"},
+                {"quantity": 2, "unit_type": "gram", "name": "butter"},
+            ], format="json")
+        self.assertEqual(res.status_code, 200)
+        # The updated children are read, and locked, inside the transaction.
+        statements = [query["sql"] for query in queries.captured_queries]
+        lookup = next(index for index, sql in enumerate(statements) if sql.endswith("FOR UPDATE"))
+        self.assertTrue(statements[lookup - 1].startswith("SAVEPOINT"), statements)
+        self.assertListEqual([item["name"] for item in res.json()], ["butter", "flour", "sugar", "vanilla"])
+        self.sugar.refresh_from_db()
+        self.assertEqual(self.sugar.quantity, 3)
+        self.assertEqual(self.sugar.name, "sugar")
+
+    def test_put_replaces_list(self):
+        res = self.client.put(self.url, data=[
+            {"id": str(self.flour.id), "quantity": 5, "unit_type": "gram", "name": "Farinha"},
+            {"quantity": 1, "unit_type": "to_taste", "name": "salt"},
+        ], format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertListEqual([item["name"] for item in res.json()], ["Farinha", "salt"])
+        self.assertFalse(Ingredient.objects.filter(pk=self.sugar.pk).exists())
+        self.assertEqual(Ingredient.objects.get(pk=self.flour.pk).normalized_name, "farinha")
+        self.assertTrue(Ingredient.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_validation_is_all_or_nothing(self):
+        res = self.client.patch(self.url, data=[
+            {"id": str(self.sugar.id), "quantity": 3},
+            {"quantity": 1, "unit_type": "bucket", "name": "water"},
+            {"id": str(self.foreign.id), "quantity": 3},
+        ], format="json")
+        self.assertEqual(res.status_code, 400)
+        errors = res.json()
+        self.assertDictEqual(errors[0], {})
+        self.assertIn("unit_type", errors[1])
+        self.assertIn("id", errors[2])
+        self.sugar.refresh_from_db()
+        self.assertEqual(self.sugar.quantity, 1)
+        self.assertEqual(Ingredient.objects.filter(recipe=self.recipe).count(), 2)
+
+    def test_delete_list(self):
+        res = self.client.delete(self.url, data=[str(self.sugar.id), {"id": str(self.foreign.id)}], format="json")
+        self.assertEqual(res.status_code, 204)
+        self.assertListEqual(list(Ingredient.objects.filter(recipe=self.recipe)), [self.flour])
+        self.assertTrue(Ingredient.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_steps_batch(self):
+        url = f"/api/v1/recipes/{str(self.recipe.id)}/steps/"
+        res = self.client.patch(url, data=[
+            {"step": 1, "description": "mix"},
+            {"step": 2, "description": "bake"},
+        ], format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertListEqual([item["step"] for item in res.json()], [1, 2])
+        self.assertEqual(Step.objects.filter(recipe=self.recipe).count(), 2)
+
+    def test_batch_invalidates_recipe(self):
+        detail = f"/api/v1/recipes/{str(self.recipe.id)}/"
+        self.client.get(detail)
+        self.client.patch(self.url, data=[{"id": str(self.sugar.id), "name": "brown sugar"}], format="json")
+        names = [item["name"] for item in self.client.get(detail).json()["ingredients"]]
+        self.assertIn("brown sugar", names)
+
+    def test_not_a_list(self):
+        res = self.client.patch(self.url, data={"name": "sugar"}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_missing_recipe(self):
+        res = self.client.patch(
+            "/api/v1/recipes/00000000-0000-0000-0000-000000000000/ingredients/", data=[], format="json"
+        )
+        self.assertEqual(res.status_code, 404)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        res = self.client.patch(self.url, data=[], format="json")
+        self.assertEqual(res.status_code, 403)
@@ -0,0 +1,89 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework.test import APITransactionTestCase, APIClient
+
+from modules.api.changes import recipe_changed
+from modules.api.models import Recipe, RecipeChange
+
+
+class TestChangeFeed(APITransactionTestCase):
+    # Entries are only served once their transaction has ended, which a
+    # TestCase transaction never does; reads may also go to replicas.
+    databases = "__all__"
+
+    def setUp(self) -> None:
+        super(TestChangeFeed, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.ids = [self.create(f"recipe {index}") for index in range(3)]
+        self.url = "/api/v1/recipes/changes/"
+
+    def create(self, name):
+        res = self.client.post("/api/v1/recipes/", {
+            "name": name,
+            "difficulty_level": "beginner",
+            "ingredients": [{"quantity": 1, "unit_type": "cup", "name": "flour"}],
+            "steps": [{"step": 1, "description": "mix"}],
+        }, format="json")
+        self.assertEqual(res.status_code, 201)
+        return res.json()["id"]
+
+    def feed(self, cursor=None, **params):
+        if cursor is not None:
+            params["cursor"] = cursor
+        res = self.client.get(self.url, data=params)
+        self.assertEqual(res.status_code, 200)
+        return res.json()
+
+    def test_full_sync_in_pages(self):
+        page = self.feed(limit=2)
+        self.assertTrue(page["has_more"])
+        rest = self.feed(page["next_cursor"], limit=2)
+        self.assertFalse(rest["has_more"])
+        results = page["results"] + rest["results"]
+        self.assertListEqual([result["id"] for result in results], self.ids)
+        self.assertEqual(results[0]["recipe"]["ingredients"][0]["name"], "flour")
+        # Nothing changed since: the cursor stays where it is.
+        empty = self.feed(rest["next_cursor"])
+        self.assertListEqual(empty["results"], [])
+        self.assertEqual(empty["next_cursor"], rest["next_cursor"])
+
+    def test_updates_child_edits_and_tombstones(self):
+        cursor = self.feed()["next_cursor"]
+        self.client.patch(f"/api/v1/recipes/{self.ids[0]}/", {"name": "renamed"}, format="json")
+        self.client.post(
+            f"/api/v1/recipes/{self.ids[2]}/steps/", {"recipe": self.ids[2], "step": 2, "description": "bake"},
+            format="json",
+        )
+        self.client.delete(f"/api/v1/recipes/{self.ids[1]}/")
+        self.client.patch(f"/api/v1/recipes/{self.ids[0]}/", {"description": "again"}, format="json")
+        with self.assertNumQueries(4):
+            results = self.feed(cursor)["results"]
+        # One entry per recipe, in the order of their last change.
+        self.assertListEqual([result["id"] for result in results], [self.ids[2], self.ids[1], self.ids[0]])
+        self.assertEqual(len(results[0]["recipe"]["steps"]), 2)
+        self.assertTrue(results[1]["deleted"])
+        self.assertIsNone(results[1]["recipe"])
+        self.assertDictEqual(
+            {key: results[2]["recipe"][key] for key in ("name", "description")},
+            {"name": "renamed", "description": "again"},
+        )
+        self.assertEqual(RecipeChange.objects.count(), 3)
+
+    def test_running_transactions_hold_the_feed_back(self):
+        cursor = self.feed()["next_cursor"]
+        with transaction.atomic():
+            Recipe.objects.filter(pk=self.ids[0]).update(name="pending")
+            recipe_changed(self.ids[0])
+            # The entry is visible to its own transaction but held back until
+            # that transaction ends.
+            self.assertTrue(RecipeChange.objects.filter(recipe_id=self.ids[0]).exists())
+            self.assertListEqual(self.feed(cursor)["results"], [])
+        self.assertEqual(self.feed(cursor)["results"][0]["recipe"]["name"], "pending")
+
+    def test_invalid_cursor(self):
+        res = self.client.get(self.url, data={"cursor": "bm90IGEgY3Vyc29y"})
+        self.assertEqual(res.status_code, 400)
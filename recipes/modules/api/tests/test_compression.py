@@ -0,0 +1,120 @@
+import gzip
+import json
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from config.compression import GzipCodec, brotli, choose_codec, zstandard
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestCompression(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestCompression, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for index in range(20):
+            recipe = Recipe.objects.create(
+                name=f"recipe {index}", description="a long description " * 5, difficulty_level="beginner"
+            )
+            Ingredient.objects.create(recipe=recipe, quantity=index, unit_type="gram", name="sugar")
+            Step.objects.create(recipe=recipe, step=1, description="mix")
+        self.recipe = recipe
+        self.url = "/api/v1/recipes/"
+
+    def test_choose_codec(self):
+        encodings = ["br", "zstd", "gzip"]
+        self.assertEqual(choose_codec("gzip, deflate", encodings).encoding, "gzip")
+        self.assertIsNone(choose_codec("gzip;q=0, deflate", encodings))
+        self.assertIsNone(choose_codec("", encodings))
+        self.assertEqual(choose_codec("*;q=0.5, br;q=0", ["br", "gzip"]).encoding, "gzip")
+        if brotli is not None:
+            self.assertEqual(choose_codec("gzip, br", encodings).encoding, "br")
+            self.assertEqual(choose_codec("gzip, br;q=0.5", encodings).encoding, "gzip")
+
+    def test_gzip(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn("Content-Encoding", plain)
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", res["Vary"])
+        self.assertEqual(res["ETag"], "W/" + plain["ETag"])
+        self.assertEqual(int(res["Content-Length"]), len(res.content))
+        self.assertEqual(gzip.decompress(res.content), plain.content)
+
+    def test_weak_etag_not_modified(self):
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, 304)
+
+    @override_settings(COMPRESSION_MIN_SIZE=1024 * 1024)
+    def test_min_size(self):
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotIn("Content-Encoding", res)
+        self.assertEqual(res.json()["count"], 20)
+
+    @skipIf(brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        plain = self.client.get(self.url)
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(res["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(res.content), plain.content)
+
+    @skipIf(zstandard is None, "zstandard is not installed")
+    @override_settings(COMPRESSION_ENCODINGS=["zstd", "gzip"])
+    def test_zstd(self):
+        plain = self.client.get(self.url)
+        res = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, zstd")
+        self.assertEqual(res["Content-Encoding"], "zstd")
+        self.assertEqual(zstandard.ZstdDecompressor().decompress(res.content), plain.content)
+
+    def test_streaming_export(self):
+        res = self.client.get("/api/v1/recipes/export/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertFalse(res.has_header("Content-Length"))
+        lines = gzip.decompress(b"".join(res.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 20)
+        self.assertEqual(json.loads(lines[0])["name"], "recipe 0")
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_compressed_body_cached(self):
+        url = f"{self.url}{str(self.recipe.id)}/"
+        plain = self.client.get(url)
+        with mock.patch.object(GzipCodec, "compress", autospec=True, side_effect=GzipCodec.compress) as compress:
+            first = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(gzip.decompress(second.content), plain.content)
+        self.client.patch(url, {"name": "renamed"}, format="json")
+        res = self.client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(json.loads(gzip.decompress(res.content))["name"], "renamed")
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_browsable_api_per_user(self):
+        url = f"{self.url}{str(self.recipe.id)}/"
+        other = User.objects.create_user(username="other_user", email="other@test.com", password="test_password")
+        pages = []
+        for user in (self.user, other):
+            client = APIClient(enforce_csrf_checks=True)
+            client.force_login(user)
+            res = client.get(url, HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip")
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn("Content-Encoding", res)
+            self.assertIn(user.username.encode(), res.content)
+            pages.append(res.content)
+        self.assertNotIn(self.user.username.encode(), pages[1])
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_cached_by_body(self):
+        # Same path and version, different Host in the absolute links.
+        first = self.client.get(f"{self.url}?limit=5", HTTP_ACCEPT_ENCODING="gzip", HTTP_HOST="a.example.com")
+        second = self.client.get(f"{self.url}?limit=5", HTTP_ACCEPT_ENCODING="gzip", HTTP_HOST="b.example.com")
+        self.assertIn(b"a.example.com", gzip.decompress(first.content))
+        self.assertIn(b"b.example.com", gzip.decompress(second.content))
@@ -0,0 +1,97 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestConditionalGet(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestConditionalGet, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="recipe 1", difficulty_level="beginner")
+        self.ingredient = Ingredient.objects.create(
+            recipe=self.recipe, quantity=1, unit_type="gram", name="sugar"
+        )
+        self.step = Step.objects.create(recipe=self.recipe, step=1, description="Step 1")
+        self.url = f"/api/v1/recipes/{str(self.recipe.id)}/"
+
+    def assertNotModified(self, url, queries=1, last_modified=True):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.has_header("Last-Modified"), last_modified)
+        with self.assertNumQueries(queries):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=res["ETag"])
+        self.assertEqual(res.status_code, 304)
+        self.assertEqual(res.content, b"")
+        return res
+
+    def test_detail_not_modified(self):
+        self.assertNotModified(self.url)
+
+    def test_list_not_modified(self):
+        # The count and the page, without any child.
+        self.assertNotModified("/api/v1/recipes/", queries=2, last_modified=False)
+
+    def test_list_changes_with_its_page(self):
+        Recipe.objects.create(name="recipe 2", difficulty_level="beginner")
+        etag = self.client.get("/api/v1/recipes/?limit=1")["ETag"]
+        self.client.patch(f"{self.url}steps/{str(self.step.step)}/", data={"description": "Mix"}, format="json")
+        res = self.client.get("/api/v1/recipes/?limit=1", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        etag = res["ETag"]
+        Recipe.objects.create(name="recipe 3", difficulty_level="beginner")
+        res = self.client.get("/api/v1/recipes/?limit=1", HTTP_IF_NONE_MATCH=etag)
+        # The count changed, so did the links.
+        self.assertEqual(res.status_code, 200)
+
+    def test_nested_lists_not_modified(self):
+        self.assertNotModified(f"{self.url}ingredients/")
+        self.assertNotModified(f"{self.url}steps/")
+
+    def test_etag_varies_with_query(self):
+        first = self.client.get("/api/v1/recipes/?limit=1")
+        second = self.client.get("/api/v1/recipes/?limit=2")
+        self.assertNotEqual(first["ETag"], second["ETag"])
+
+    def test_ingredient_edit_bumps_recipe(self):
+        etag = self.client.get(self.url)["ETag"]
+        updated_at = Recipe.objects.get(pk=self.recipe.pk).updated_at
+        self.client.patch(
+            f"{self.url}ingredients/{str(self.ingredient.id)}/", data={"name": "salt"}, format="json"
+        )
+        self.assertGreater(Recipe.objects.get(pk=self.recipe.pk).updated_at, updated_at)
+        res = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["ingredients"][0]["name"], "salt")
+
+    def test_step_delete_changes_nested_etag(self):
+        url = f"{self.url}steps/"
+        etag = self.client.get(url)["ETag"]
+        self.client.delete(f"{url}{str(self.step.step)}/")
+        res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+    def test_list_changes_on_delete(self):
+        Recipe.objects.create(name="recipe 2", difficulty_level="beginner")
+        etag = self.client.get("/api/v1/recipes/")["ETag"]
+        self.client.delete(self.url)
+        res = self.client.get("/api/v1/recipes/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 200)
+
+    def test_list_ignores_if_modified_since(self):
+        newest = Recipe.objects.create(name="recipe 2", difficulty_level="beginner")
+        last_modified = self.client.get(f"/api/v1/recipes/{str(newest.id)}/")["Last-Modified"]
+        # Nothing left on the list is newer than that copy.
+        self.client.delete(f"/api/v1/recipes/{str(newest.id)}/")
+        res = self.client.get("/api/v1/recipes/", HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["count"], 1)
+
+    def test_missing_recipe(self):
+        res = self.client.get("/api/v1/recipes/00000000-0000-0000-0000-000000000000/")
+        self.assertEqual(res.status_code, 404)
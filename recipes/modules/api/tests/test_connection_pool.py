@@ -0,0 +1,126 @@
+import threading
+import time
+
+import psycopg2
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase
+from psycopg2 import extensions
+from rest_framework.test import APITestCase, APIClient
+
+from config.db.pool import ConnectionPool, PoolTimeout
+
+
+class TestConnectionPool(SimpleTestCase):
+
+    def setUp(self) -> None:
+        super(TestConnectionPool, self).setUp()
+        params = connection.get_connection_params()
+        self.pools = []
+        self.connect = lambda: psycopg2.connect(**params)
+
+    def tearDown(self) -> None:
+        for pool in self.pools:
+            pool.close_idle()
+        super(TestConnectionPool, self).tearDown()
+
+    def make_pool(self, **options):
+        pool = ConnectionPool(self.connect, **options)
+        self.pools.append(pool)
+        return pool
+
+    def test_reuses_released_connections(self):
+        pool = self.make_pool(size=2)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(pool.stats()["created"], 1)
+        self.assertEqual(pool.stats()["in_use"], 1)
+
+    def test_bounded(self):
+        pool = self.make_pool(size=1, timeout=0.05)
+        held = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats()["waiting"], 0)
+        pool.release(held)
+
+    def test_waits_for_a_release(self):
+        pool = self.make_pool(size=1, timeout=5)
+        held = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        while pool.stats()["waiting"] == 0:
+            time.sleep(0.01)
+        pool.release(held)
+        waiter.join()
+        self.assertIs(acquired[0], held)
+        pool.release(held)
+
+    def test_pre_ping_replaces_dead_connections(self):
+        pool = self.make_pool(size=1)
+        dead = pool.acquire()
+        pid = dead.get_backend_pid()
+        pool.release(dead)
+        killer = self.connect()
+        with killer.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [pid])
+        killer.close()
+
+        fresh = pool.acquire()
+        self.assertIsNot(fresh, dead)
+        with fresh.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        self.assertEqual(pool.stats()["discarded"], 1)
+        pool.release(fresh)
+
+    def test_idle_eviction(self):
+        pool = self.make_pool(size=1, max_idle=0)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIsNot(pool.acquire(), first)
+        self.assertTrue(first.closed)
+
+    def test_release_rolls_back(self):
+        pool = self.make_pool(size=1)
+        conn = pool.acquire()
+        conn.autocommit = False
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        pool.release(conn)
+        conn = pool.acquire()
+        self.assertEqual(conn.get_transaction_status(), extensions.TRANSACTION_STATUS_IDLE)
+        self.assertTrue(conn.autocommit)
+        pool.release(conn)
+
+    def test_release_discards_session_state(self):
+        pool = self.make_pool(size=1)
+        conn = pool.acquire()
+        with conn.cursor() as cursor:
+            cursor.execute("SET statement_timeout = 1234")
+            cursor.execute("CREATE TEMPORARY TABLE leftover (id int)")
+        pool.release(conn)
+        conn = pool.acquire()
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW statement_timeout")
+            self.assertEqual(cursor.fetchone()[0], "0")
+            cursor.execute("SELECT to_regclass('pg_temp.leftover')")
+            self.assertIsNone(cursor.fetchone()[0])
+        pool.release(conn)
+
+
+class TestDatabaseStats(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestDatabaseStats, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password", is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_stats(self):
+        res = self.client.get("/api/v1/stats/database/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("pools", res.json())
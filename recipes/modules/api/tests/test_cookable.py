@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient
+
+
+class TestCookableRecipes(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestCookableRecipes, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.omelette = self.create_recipe("Omelette", ["Ovos", "Sal", "Manteiga"])
+        self.pancakes = self.create_recipe("Pancakes", ["ovos", "leite", "farinha", "açúcar"])
+        self.salad = self.create_recipe("Salad", ["alface", "tomate"])
+
+    def create_recipe(self, name, ingredients):
+        recipe = Recipe.objects.create(name=name, difficulty_level="beginner")
+        Ingredient.objects.bulk_create([
+            Ingredient(recipe=recipe, quantity=1, unit_type="to_taste", name=ingredient)
+            for ingredient in ingredients
+        ])
+        return recipe
+
+    def test_ranked_by_coverage(self):
+        res = self.client.get("/api/v1/recipes/cookable/", data={"ingredients": "ovos, sal ,acucar"})
+        self.assertEqual(res.status_code, 200)
+        results = res.json()["results"]
+        self.assertListEqual([recipe["id"] for recipe in results], [str(self.omelette.id), str(self.pancakes.id)])
+        self.assertAlmostEqual(results[0]["coverage"], 2 / 3)
+        self.assertEqual(results[1]["matched_ingredients"], 2)
+        self.assertEqual(results[1]["total_ingredients"], 4)
+        self.assertEqual(len(results[1]["ingredients"]), 4)
+
+    def test_repeated_params_and_limit(self):
+        res = self.client.get("/api/v1/recipes/cookable/?ingredients=OVOS&ingredients=Tomate&limit=1")
+        self.assertListEqual([recipe["id"] for recipe in res.json()["results"]], [str(self.salad.id)])
+
+    def test_normalized_name_follows_updates(self):
+        ingredient = self.salad.ingredients.get(name="alface")
+        self.client.patch(
+            f"/api/v1/recipes/{str(self.salad.id)}/ingredients/{str(ingredient.id)}/",
+            data={"name": "Rúcula"}, format="json"
+        )
+        res = self.client.get("/api/v1/recipes/cookable/", data={"ingredients": "rucula,tomate"})
+        self.assertEqual(res.json()["results"][0]["coverage"], 1.0)
+        self.assertNotIn("normalized_name", res.json()["results"][0]["ingredients"][0])
+
+    def test_ingredient_count_is_maintained(self):
+        stale = Recipe.objects.get(pk=self.salad.pk)
+        self.assertEqual(stale.ingredient_count, 2)
+        Ingredient.objects.create(recipe=self.salad, quantity=1, unit_type="to_taste", name="azeite")
+        self.salad.ingredients.filter(name="tomate").update(recipe=self.omelette)
+        # Saving an instance read before the changes keeps the stored count.
+        stale.name = "Green salad"
+        stale.save()
+        counts = dict(Recipe.objects.values_list("name", "ingredient_count"))
+        self.assertDictEqual(counts, {"Omelette": 4, "Pancakes": 4, "Green salad": 2})
+        Ingredient.objects.filter(recipe=self.omelette).delete()
+        self.assertEqual(Recipe.objects.get(pk=self.omelette.pk).ingredient_count, 0)
+
+    def test_only_matching_ingredients_are_counted(self):
+        sql = str(Recipe.objects.cookable_with(["ovos"]).query)
+        # One inner join restricted to the pantry, no outer join over every ingredient.
+        self.assertEqual(sql.count("JOIN"), 1, sql)
+        self.assertIn('INNER JOIN "api_ingredient"', sql)
+        self.assertIn('WHERE "api_ingredient"."normalized_name" IN', sql)
+
+    def test_pantry_required(self):
+        res = self.client.get("/api/v1/recipes/cookable/")
+        self.assertEqual(res.status_code, 400)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        res = self.client.get("/api/v1/recipes/cookable/", data={"ingredients": "ovos"})
+        self.assertEqual(res.status_code, 403)
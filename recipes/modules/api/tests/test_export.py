@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestRecipeExport(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestRecipeExport, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipes = []
+        for index in range(5):
+            recipe = Recipe.objects.create(name=f"recipe {index}", difficulty_level="beginner")
+            Ingredient.objects.create(recipe=recipe, quantity=index, unit_type="gram", name="sugar")
+            Step.objects.create(recipe=recipe, step=1, description="mix")
+            self.recipes.append(recipe)
+
+    def export(self, **params):
+        res = self.client.get("/api/v1/recipes/export/", data=params)
+        self.assertEqual(res.status_code, 200)
+        return res, b"".join(res.streaming_content).decode("utf-8")
+
+    def test_ndjson_matches_detail_documents(self):
+        res, body = self.export()
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        documents = [json.loads(line) for line in body.splitlines()]
+        self.assertListEqual([document["id"] for document in documents], [str(r.id) for r in self.recipes])
+        detail = self.client.get(f"/api/v1/recipes/{str(self.recipes[2].id)}/").json()
+        self.assertDictEqual(documents[2], detail)
+
+    def test_csv(self):
+        res, body = self.export(output="csv")
+        self.assertEqual(res["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(json.loads(rows[3]["ingredients"])[0]["quantity"], 3)
+
+    def test_since(self):
+        Recipe.objects.filter(pk=self.recipes[1].pk).touch()
+        since = Recipe.objects.get(pk=self.recipes[1].pk).updated_at - timedelta(microseconds=1)
+        _, body = self.export(since=since.isoformat(), snapshot="false")
+        self.assertListEqual([json.loads(line)["id"] for line in body.splitlines()], [str(self.recipes[1].id)])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get("/api/v1/recipes/export/?output=xml").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/recipes/export/?since=yesterday").status_code, 400)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.client.get("/api/v1/recipes/export/").status_code, 403)
+
+    def test_management_command(self):
+        with tempfile.NamedTemporaryFile(suffix=".ndjson") as output:
+            call_command("export_recipes", "--output", output.name, "--chunk-size", "2")
+            lines = open(output.name).read().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[4])["steps"][0]["description"], "mix")
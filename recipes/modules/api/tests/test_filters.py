@@ -0,0 +1,108 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.http import QueryDict
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.filters import IngredientFilter, RecipeFilter, StepFilter
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestFilters(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestFilters, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.cake = Recipe.objects.create(name="cake", difficulty_level="beginner")
+        Ingredient.objects.create(recipe=self.cake, quantity=2, unit_type="cup", name="Farinha",
+                                  category="Grain, nuts and baking products")
+        Ingredient.objects.create(recipe=self.cake, quantity=3, unit_type="gram", name="Ovos",
+                                  category="Eggs, milk and milk products")
+        for index in range(1, 4):
+            Step.objects.create(recipe=self.cake, step=index, description=f"step {index}")
+        self.bread = Recipe.objects.create(name="bread", difficulty_level="advanced")
+        Ingredient.objects.create(recipe=self.bread, quantity=1, unit_type="kilogram", name="farinha",
+                                  category="Grain, nuts and baking products")
+        self.soup = Recipe.objects.create(name="soup", difficulty_level="intermediate")
+        Ingredient.objects.create(recipe=self.soup, quantity=1, unit_type="liter", name="água")
+        Recipe.objects.filter(pk=self.soup.pk).update(created_at=datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc))
+
+    def names(self, **params):
+        res = self.client.get("/api/v1/recipes/", data=params)
+        self.assertEqual(res.status_code, 200, res.content)
+        return sorted(recipe["name"] for recipe in res.json()["results"])
+
+    def test_recipe_filters(self):
+        self.assertListEqual(self.names(difficulty_level=["beginner", "advanced"]), ["bread", "cake"])
+        self.assertListEqual(self.names(ingredient="farinha"), ["bread", "cake"])
+        self.assertListEqual(self.names(ingredient=["FARINHA, ovos"]), ["cake"])
+        self.assertListEqual(self.names(ingredient_category="Eggs, milk and milk products"), ["cake"])
+        self.assertListEqual(self.names(ingredient=["ovos", "farinha"], difficulty_level="advanced"), [])
+        self.assertListEqual(self.names(created_at_before="2021-01-01T00:00:00Z"), ["soup"])
+        self.assertListEqual(self.names(created_at_after="2021-01-01T00:00:00Z", ingredient="agua"), [])
+
+    def test_filters_change_the_etag(self):
+        etag = self.client.get("/api/v1/recipes/")["ETag"]
+        self.assertNotEqual(self.client.get("/api/v1/recipes/", data={"difficulty_level": "beginner"})["ETag"], etag)
+
+    def test_invalid(self):
+        for params in ({"difficulty_level": "impossible"}, {"created_at_after": "yesterday"}):
+            res = self.client.get("/api/v1/recipes/", data=params)
+            self.assertEqual(res.status_code, 400, params)
+
+    def test_child_filters(self):
+        url = f"/api/v1/recipes/{str(self.cake.id)}/"
+        res = self.client.get(f"{url}ingredients/", data={"category": "Eggs, milk and milk products"})
+        self.assertListEqual([item["name"] for item in res.json()["results"]], ["Ovos"])
+        res = self.client.get(f"{url}ingredients/", data={"unit_type": ["cup", "gram"]})
+        self.assertEqual(res.json()["count"], 2)
+        res = self.client.get(f"{url}steps/", data={"step_min": 2, "step_max": 3})
+        self.assertListEqual([item["step"] for item in res.json()["results"]], [2, 3])
+
+
+class TestFilterIndexes(APITestCase):
+    """
+    Every supported filter must be answerable from an index: with sequential
+    scans disabled, the plan may not contain one, and the filtered column has
+    to appear in an index condition.
+    """
+
+    def explain(self, filterset_class, data, queryset):
+        query = QueryDict(mutable=True)
+        for key, value in data.items():
+            query.setlist(key, value if isinstance(value, list) else [value])
+        queryset = filterset_class(query, queryset=queryset).qs
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    def assertIndexScan(self, plan, column):
+        self.assertNotIn("Seq Scan", plan)
+        conditions = [line for line in plan.splitlines() if "Index Cond" in line]
+        self.assertTrue(any(column in line for line in conditions), plan)
+
+    def test_recipe_filters(self):
+        recipes = Recipe.objects.order_by("created_at", "id")
+        for data, column in (
+            ({"difficulty_level": ["beginner", "advanced"]}, "difficulty_level"),
+            ({"created_at_after": "2021-01-01T00:00:00Z"}, "created_at"),
+            ({"updated_at_before": "2021-01-01T00:00:00Z"}, "updated_at"),
+            ({"ingredient": "farinha,ovos"}, "normalized_name"),
+            ({"ingredient_category": ["Fruits", "Vegetables"]}, "category"),
+        ):
+            with self.subTest(data=data):
+                self.assertIndexScan(self.explain(RecipeFilter, data, recipes), column)
+
+    def test_child_filters(self):
+        recipe = Recipe.objects.create(name="cake", difficulty_level="beginner")
+        ingredients = Ingredient.objects.filter(recipe=recipe).order_by("name", "id")
+        for data in ({"category": ["Fruits"]}, {"unit_type": ["cup", "gram"]}):
+            with self.subTest(data=data):
+                self.assertIndexScan(self.explain(IngredientFilter, data, ingredients), "recipe_id")
+        steps = Step.objects.filter(recipe=recipe).order_by("step", "id")
+        self.assertIndexScan(self.explain(StepFilter, {"step_min": 2}, steps), "step")
@@ -0,0 +1,38 @@
+import time
+import uuid
+
+from django.test import TestCase, override_settings
+
+from modules.api.ids import new_id, uuid7
+from modules.api.models import Recipe, Ingredient
+
+
+class TestIds(TestCase):
+
+    def test_uuid7(self):
+        before = time.time_ns() // 1_000_000
+        ids = [uuid7() for _ in range(10_000)]
+        after = time.time_ns() // 1_000_000
+        self.assertTrue(all(pk.version == 7 and pk.variant == "specified in RFC 4122" for pk in ids))
+        # Increasing even within a millisecond, and carrying the creation time.
+        self.assertListEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertLessEqual(before, ids[0].int >> 80)
+        self.assertLessEqual(ids[-1].int >> 80, after + 10)
+
+    def test_default_is_random(self):
+        self.assertEqual(new_id().version, 4)
+        self.assertEqual(Recipe.objects.create(name="cake", difficulty_level="beginner").pk.version, 4)
+
+    @override_settings(PRIMARY_KEY_UUID_VERSION=7)
+    def test_time_ordered(self):
+        old = Recipe.objects.create(name="old", difficulty_level="beginner", id=uuid.uuid4())
+        recipe = Recipe.objects.create(name="cake", difficulty_level="beginner")
+        ingredients = Ingredient.objects.bulk_create([
+            Ingredient(recipe=recipe, quantity=1, unit_type="gram", name=f"ingredient {index}") for index in range(3)
+        ])
+        self.assertEqual(recipe.pk.version, 7)
+        pks = [ingredient.pk for ingredient in ingredients]
+        self.assertListEqual(pks, sorted(pks))
+        # Keys of other versions stay valid next to the new ones.
+        self.assertEqual(Recipe.objects.get(pk=old.pk).name, "old")
@@ -0,0 +1,77 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+def recipe_line(name, **extra):
+    return json.dumps({
+        "name": name,
+        "description": "",
+        "difficulty_level": "beginner",
+        "ingredients": [{"quantity": 1, "unit_type": "cup", "name": "flour"}],
+        "steps": [{"step": 1, "description": "mix"}, {"step": 2, "description": "bake"}],
+        **extra
+    })
+
+
+class TestRecipeImport(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestRecipeImport, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, body, content_type="application/x-ndjson"):
+        return self.client.generic("POST", "/api/v1/recipes/import/", body, content_type=content_type)
+
+    def test_import_with_errors(self):
+        body = "\n".join([
+            recipe_line("recipe 1"),
+            "{not json",
+            "",
+            recipe_line("recipe 2", difficulty_level="impossible"),
+            recipe_line("recipe 3"),
+        ])
+        res = self.post(body)
+        self.assertEqual(res.status_code, 200)
+        report = res.json()
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["failed"], 2)
+        self.assertListEqual([error["line"] for error in report["errors"]], [2, 4])
+        self.assertIn("difficulty_level", report["errors"][1]["errors"])
+        self.assertEqual(Recipe.objects.count(), 2)
+        self.assertEqual(Ingredient.objects.filter(recipe__name="recipe 3").count(), 1)
+        self.assertEqual(Step.objects.filter(recipe__name="recipe 3").count(), 2)
+
+    def test_imported_recipes_are_searchable(self):
+        self.post(recipe_line("Moqueca de peixe"))
+        res = self.client.get("/api/v1/recipes/", data={"q": "moqueca"})
+        self.assertEqual(res.json()["count"], 1)
+
+    def test_rejects_other_media_types(self):
+        res = self.post(recipe_line("recipe 1"), content_type="text/plain")
+        self.assertEqual(res.status_code, 415)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        res = self.post(recipe_line("recipe 1"))
+        self.assertEqual(res.status_code, 403)
+
+    def test_management_command_in_chunks(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson") as source:
+            source.write("\n".join(recipe_line(f"recipe {index}") for index in range(7)))
+            source.flush()
+            out = StringIO()
+            call_command("import_recipes", source.name, "--chunk-size", "3", "-v", "2", stdout=out)
+        self.assertEqual(Recipe.objects.count(), 7)
+        self.assertIn("Imported 7 recipes, 0 lines failed.", out.getvalue())
+        self.assertIn("6 imported", out.getvalue())
@@ -0,0 +1,100 @@
+import uuid
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.cleanup import OrphanCleanup
+from modules.api.models import Recipe, Ingredient, Step, RecipeChange
+
+
+class TestRecipeDeletion(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestRecipeDeletion, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipes = []
+        for index in range(3):
+            recipe = Recipe.objects.create(name=f"recipe {index}", difficulty_level="beginner")
+            Ingredient.objects.create(recipe=recipe, quantity=1, unit_type="cup", name="flour")
+            Step.objects.create(recipe=recipe, step=1, description="mix")
+            self.recipes.append(recipe)
+        self.url = "/api/v1/recipes/batch/"
+
+    def test_detail_delete_removes_children(self):
+        res = self.client.delete(f"/api/v1/recipes/{str(self.recipes[0].id)}/")
+        self.assertEqual(res.status_code, 204)
+        self.assertFalse(Ingredient.objects.filter(recipe__isnull=True).exists())
+        self.assertFalse(Step.objects.filter(recipe__isnull=True).exists())
+        self.assertEqual(Ingredient.objects.count(), 2)
+        self.assertTrue(RecipeChange.objects.get(recipe_id=self.recipes[0].id).deleted)
+
+    def test_bulk_delete(self):
+        missing = str(uuid.uuid4())
+        ids = [str(self.recipes[2].id), missing, str(self.recipes[0].id)]
+        # The deletion itself, its tombstones and the transaction.
+        with self.assertNumQueries(4):
+            res = self.client.delete(self.url, {"ids": ids}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertDictEqual(res.json(), {"deleted": [ids[0], ids[2]], "not_found": [missing]})
+        self.assertListEqual(list(Recipe.objects.values_list("name", flat=True)), ["recipe 1"])
+        self.assertEqual(Ingredient.objects.count(), 1)
+        self.assertEqual(Step.objects.count(), 1)
+        self.assertEqual(RecipeChange.objects.filter(deleted=True).count(), 2)
+        res = self.client.get(f"/api/v1/recipes/{ids[0]}/")
+        self.assertEqual(res.status_code, 404)
+
+    @override_settings(RECIPE_BATCH_MAX_IDS=2)
+    def test_bulk_delete_invalid(self):
+        for ids in ([], ["not-a-uuid"], [str(recipe.id) for recipe in self.recipes], str(self.recipes[0].id)):
+            res = self.client.delete(self.url, {"ids": ids}, format="json")
+            self.assertEqual(res.status_code, 400, ids)
+        self.assertEqual(Recipe.objects.count(), 3)
+
+    def test_bulk_delete_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        res = self.client.delete(self.url, {"ids": [str(self.recipes[0].id)]}, format="json")
+        self.assertEqual(res.status_code, 403)
+
+
+class TestOrphanCleanup(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestOrphanCleanup, self).setUp()
+        recipe = Recipe.objects.create(name="kept", difficulty_level="beginner")
+        Ingredient.objects.create(recipe=recipe, quantity=1, unit_type="cup", name="flour")
+        Step.objects.create(recipe=recipe, step=1, description="mix")
+        # Children orphaned the way the ORM does it, through SET_NULL.
+        Ingredient.objects.bulk_create([
+            Ingredient(quantity=index, unit_type="gram", name=f"orphan {index}") for index in range(5)
+        ])
+        Step.objects.bulk_create([Step(step=index, description="orphan") for index in range(3)])
+
+    def test_chunks(self):
+        chunks = []
+        cleanup = OrphanCleanup(chunk_size=2, pause=0, progress=lambda cleanup, model: chunks.append(
+            (model._meta.model_name, cleanup.deleted[model._meta.model_name])
+        ))
+        # Each model ends with a chunk deleting nothing.
+        with self.assertNumQueries(7):
+            report = cleanup.run()
+        self.assertDictEqual(report, {"deleted": {"ingredient": 5, "step": 3}, "total": 8})
+        self.assertListEqual(chunks, [
+            ("ingredient", 2), ("ingredient", 4), ("ingredient", 5), ("ingredient", 5),
+            ("step", 2), ("step", 3), ("step", 3),
+        ])
+        self.assertListEqual(list(Ingredient.objects.values_list("name", flat=True)), ["flour"])
+        self.assertEqual(Step.objects.count(), 1)
+        self.assertEqual(cleanup.run()["total"], 0)
+
+    def test_command(self):
+        stdout = StringIO()
+        call_command("delete_orphans", chunk_size=100, pause=0, stdout=stdout)
+        self.assertIn("Deleted 8 orphans (5 ingredient, 3 step).", stdout.getvalue())
+        self.assertEqual(Ingredient.objects.count() + Step.objects.count(), 2)
@@ -0,0 +1,112 @@
+import base64
+import json
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Step
+
+
+class TestKeysetPagination(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestKeysetPagination, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipes = [
+            Recipe.objects.create(name=f"recipe {index}", difficulty_level="beginner")
+            for index in range(5)
+        ]
+        # Force a tie on created_at so the id tiebreaker is exercised.
+        Recipe.objects.filter(pk__in=[self.recipes[1].pk, self.recipes[2].pk]).update(
+            created_at=self.recipes[1].created_at
+        )
+        self.expected = [
+            str(recipe.id) for recipe in Recipe.objects.order_by("created_at", "id")
+        ]
+
+    def walk(self, url):
+        ids, pages = [], 0
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            ids.extend(recipe["id"] for recipe in res.json()["results"])
+            url = res.json()["next"]
+            pages += 1
+        return ids, pages
+
+    def test_walk_forward(self):
+        ids, pages = self.walk("/api/v1/recipes/?pagination=cursor&limit=2")
+        self.assertListEqual(ids, self.expected)
+        self.assertEqual(pages, 3)
+
+    def test_walk_backward(self):
+        res = self.client.get("/api/v1/recipes/?pagination=cursor&limit=2")
+        self.assertIsNone(res.json()["previous"])
+        res = self.client.get(res.json()["next"])
+        res = self.client.get(res.json()["next"])
+        self.assertListEqual([recipe["id"] for recipe in res.json()["results"]], self.expected[4:])
+        self.assertIsNone(res.json()["next"])
+
+        res = self.client.get(res.json()["previous"])
+        self.assertListEqual([recipe["id"] for recipe in res.json()["results"]], self.expected[2:4])
+        res = self.client.get(res.json()["previous"])
+        self.assertListEqual([recipe["id"] for recipe in res.json()["results"]], self.expected[:2])
+        self.assertIsNone(res.json()["previous"])
+
+    def test_cursor_param_implies_keyset_mode(self):
+        res = self.client.get("/api/v1/recipes/?pagination=cursor&limit=2")
+        next_url = res.json()["next"].replace("pagination=cursor&", "")
+        res = self.client.get(next_url)
+        self.assertListEqual([recipe["id"] for recipe in res.json()["results"]], self.expected[2:4])
+
+    @override_settings(API_PAGINATION_MODE="cursor")
+    def test_mode_from_settings(self):
+        res = self.client.get("/api/v1/recipes/?limit=2")
+        self.assertNotIn("count", res.json())
+        self.assertIsNotNone(res.json()["next"])
+
+    def test_offset_mode_is_ordered(self):
+        res = self.client.get("/api/v1/recipes/")
+        self.assertIn("count", res.json())
+        self.assertListEqual([recipe["id"] for recipe in res.json()["results"]], self.expected)
+
+    def test_invalid_cursor(self):
+        res = self.client.get("/api/v1/recipes/?cursor=not-a-cursor")
+        self.assertEqual(res.status_code, 404)
+
+    def test_tampered_cursor(self):
+        positions = [
+            ["not-a-date", str(self.recipes[0].id)],
+            [str(self.recipes[0].created_at), "not-a-uuid"],
+            [str(self.recipes[0].created_at), None],
+            [{"created_at": 1}, str(self.recipes[0].id)],
+            [str(self.recipes[0].created_at)],
+        ]
+        for position in positions:
+            with self.subTest(position=position):
+                data = json.dumps({"r": 0, "p": position})
+                cursor = base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+                res = self.client.get(f"/api/v1/recipes/?cursor={cursor}")
+                self.assertEqual(res.status_code, 404)
+
+    def test_invalid_mode(self):
+        res = self.client.get("/api/v1/recipes/?pagination=pages")
+        self.assertEqual(res.status_code, 404)
+
+    def test_nested_steps(self):
+        recipe = self.recipes[0]
+        Step.objects.bulk_create([
+            Step(recipe=recipe, step=index, description=f"step {index}") for index in range(5, 0, -1)
+        ])
+        url = f"/api/v1/recipes/{str(recipe.id)}/steps/?pagination=cursor&limit=2"
+        steps = []
+        while url:
+            res = self.client.get(url)
+            steps.extend(step["step"] for step in res.json()["results"])
+            url = res.json()["next"]
+        self.assertListEqual(steps, [1, 2, 3, 4, 5])
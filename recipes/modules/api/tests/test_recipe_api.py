@@ -45,6 +45,7 @@ class TestRecipeAPI(APITestCase):
             "image_url": self.recipe1.image_url,
             "video_url": self.recipe1.video_url,
             "difficulty_level": self.recipe1.difficulty_level,
+            "servings": self.recipe1.servings,
             "created_at": serialize_dt(self.recipe1.created_at),
             "updated_at": serialize_dt(self.recipe1.updated_at),
             "ingredients": [
@@ -91,6 +92,7 @@ class TestRecipeAPI(APITestCase):
             "image_url": self.recipe2.image_url,
             "video_url": self.recipe2.video_url,
             "difficulty_level": self.recipe2.difficulty_level,
+            "servings": self.recipe2.servings,
             "created_at": serialize_dt(self.recipe2.created_at),
             "updated_at": serialize_dt(self.recipe2.updated_at),
             "ingredients": [
@@ -0,0 +1,86 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.cache import recipe_cache
+from modules.api.models import Recipe, Ingredient, Step
+
+
+@override_settings(RECIPE_CACHE_ALIAS="recipes")
+class TestRecipeDocumentCache(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestRecipeDocumentCache, self).setUp()
+        caches["recipes"].clear()
+        recipe_cache.reset_stats()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="recipe 1", difficulty_level="beginner")
+        self.ingredient = Ingredient.objects.create(
+            recipe=self.recipe, quantity=1, unit_type="gram", name="sugar"
+        )
+        self.step = Step.objects.create(recipe=self.recipe, step=1, description="Step 1")
+        self.url = f"/api/v1/recipes/{str(self.recipe.id)}/"
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        # Only the ETag/Last-Modified aggregate hits the database.
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertDictEqual(first.json(), second.json())
+        self.assertEqual(recipe_cache.stats()["hits"], 1)
+        self.assertEqual(recipe_cache.stats()["misses"], 1)
+
+    def test_ingredient_patch_invalidates_document(self):
+        self.client.get(self.url)
+        self.client.patch(
+            f"{self.url}ingredients/{str(self.ingredient.id)}/", data={"name": "salt"}, format="json"
+        )
+        res = self.client.get(self.url)
+        self.assertEqual(res.json()["ingredients"][0]["name"], "salt")
+
+    def test_step_delete_invalidates_document(self):
+        self.client.get(self.url)
+        self.client.delete(f"{self.url}steps/{str(self.step.step)}/")
+        res = self.client.get(self.url)
+        self.assertListEqual(res.json()["steps"], [])
+
+    def test_ingredient_create_invalidates_document(self):
+        self.client.get(self.url)
+        self.client.post(f"{self.url}ingredients/", data={
+            "recipe": str(self.recipe.id), "quantity": 2, "unit_type": "cup", "name": "milk",
+        }, format="json")
+        res = self.client.get(self.url)
+        self.assertEqual(len(res.json()["ingredients"]), 2)
+
+    def test_recipe_update_invalidates_document(self):
+        self.client.get(self.url)
+        self.client.patch(self.url, data={"name": "New Name"}, format="json")
+        res = self.client.get(self.url)
+        self.assertEqual(res.json()["name"], "New Name")
+
+    def test_deleted_recipe_is_not_served(self):
+        self.client.get(self.url)
+        self.client.delete(self.url)
+        res = self.client.get(self.url)
+        self.assertEqual(res.status_code, 404)
+
+    @override_settings(RECIPE_CACHE_ALIAS="")
+    def test_disabled_cache(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(recipe_cache.stats()["hits"], 0)
+        self.assertFalse(recipe_cache.stats()["enabled"])
+
+    def test_stats_require_admin(self):
+        res = self.client.get("/api/v1/stats/cache/")
+        self.assertEqual(res.status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get("/api/v1/stats/cache/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("recipe_documents", res.json())
@@ -0,0 +1,53 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestRecipeQueries(APITestCase):
+    # count, recipes page, ingredients prefetch, steps prefetch
+    LIST_QUERIES = 4
+
+    def setUp(self) -> None:
+        super(TestRecipeQueries, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def create_recipes(self, amount):
+        for index in range(amount):
+            recipe = Recipe.objects.create(name=f"recipe {index}", difficulty_level="beginner")
+            Ingredient.objects.bulk_create([
+                Ingredient(recipe=recipe, quantity=1, unit_type="gram", name=f"ingredient {i}")
+                for i in range(3)
+            ])
+            Step.objects.bulk_create([
+                Step(recipe=recipe, step=i, description=f"step {i}")
+                for i in range(3, 0, -1)
+            ])
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        self.create_recipes(2)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            res = self.client.get("/api/v1/recipes/")
+        self.assertEqual(len(res.json()["results"]), 2)
+
+        self.create_recipes(18)
+        with self.assertNumQueries(self.LIST_QUERIES):
+            res = self.client.get("/api/v1/recipes/")
+        self.assertEqual(len(res.json()["results"]), 20)
+
+    def test_detail_query_count(self):
+        self.create_recipes(1)
+        recipe = Recipe.objects.get()
+        with self.assertNumQueries(4):
+            res = self.client.get(f"/api/v1/recipes/{str(recipe.id)}/")
+        self.assertEqual(res.status_code, 200)
+
+    def test_steps_are_ordered(self):
+        self.create_recipes(1)
+        recipe = Recipe.objects.get()
+        res = self.client.get(f"/api/v1/recipes/{str(recipe.id)}/")
+        self.assertListEqual([step["step"] for step in res.json()["steps"]], [1, 2, 3])
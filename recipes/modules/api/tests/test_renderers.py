@@ -0,0 +1,81 @@
+import msgpack
+from django.contrib.auth.models import User
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+from modules.api.renderers import ORJSONRenderer
+from modules.api.serializers import RecipeSerializer
+
+
+def recipe_data(name, **extra):
+    return {
+        "name": name,
+        "description": "",
+        "difficulty_level": "beginner",
+        "ingredients": [{"quantity": 1, "unit_type": "cup", "name": "flour"}],
+        "steps": [{"step": 1, "description": "mix"}, {"step": 2, "description": "bake"}],
+        **extra
+    }
+
+
+class TestRenderers(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestRenderers, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="Açaí", description="Na \"tigela\"", difficulty_level="beginner")
+        Ingredient.objects.create(recipe=self.recipe, quantity=0.5, unit_type="cup", name="granola")
+        Step.objects.create(recipe=self.recipe, step=1, description="Bata")
+        self.url = "/api/v1/recipes/"
+
+    def test_orjson_matches_drf_json(self):
+        data = RecipeSerializer(Recipe.objects.with_children().get(pk=self.recipe.pk)).data
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_msgpack_accept_header(self):
+        expected = self.client.get(self.url).json()
+        res = self.client.get(self.url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertDictEqual(msgpack.unpackb(res.content, raw=False), expected)
+
+    def test_msgpack_format_param(self):
+        url = f"{self.url}{str(self.recipe.id)}/"
+        res = self.client.get(url, data={"format": "msgpack"})
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertDictEqual(msgpack.unpackb(res.content, raw=False), self.client.get(url).json())
+
+    def test_msgpack_request_body(self):
+        res = self.client.post(
+            self.url, msgpack.packb(recipe_data("Tapioca")), content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(msgpack.unpackb(res.content, raw=False)["name"], "Tapioca")
+        self.assertEqual(Step.objects.filter(recipe__name="Tapioca").count(), 2)
+        res = self.client.post(self.url, msgpack.packb(recipe_data("Cuscuz")), content_type="application/x-msgpack")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(res.json()["name"], "Cuscuz")
+
+    def test_invalid_json_body(self):
+        res = self.client.generic("POST", self.url, "{not json", content_type="application/json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_msgpack_import(self):
+        body = b"".join([
+            msgpack.packb(recipe_data("recipe 1")),
+            msgpack.packb(recipe_data("recipe 2", difficulty_level="impossible")),
+            msgpack.packb(recipe_data("recipe 3")),
+            msgpack.packb(recipe_data("recipe 4"))[:-3],
+        ])
+        res = self.client.generic("POST", f"{self.url}import/", body, content_type="application/msgpack")
+        self.assertEqual(res.status_code, 200)
+        report = res.json()
+        self.assertEqual(report["created"], 2)
+        self.assertListEqual([error["line"] for error in report["errors"]], [2, 4])
+        self.assertTrue(Recipe.objects.filter(name="recipe 3").exists())
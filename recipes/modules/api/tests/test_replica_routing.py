@@ -0,0 +1,112 @@
+import time
+
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config.routers import PrimaryStickinessMiddleware, ReplicaRouter, parse_replicas, pin_primary, use_primary
+from modules.api.cache import RecipeDocumentCache
+from modules.api.models import Recipe
+
+
+class TestReplicaRouter(SimpleTestCase):
+
+    def setUp(self) -> None:
+        super(TestReplicaRouter, self).setUp()
+        self.router = ReplicaRouter({"replica_1": 2, "replica_2": 1, "replica_3": 0})
+
+    def test_parse_replicas(self):
+        primary = {"NAME": "recipes", "HOST": "primary", "PORT": "5432", "USER": "postgres"}
+        databases, weights = parse_replicas(primary, ["replica-a:6432*3", "replica-b/recipes_copy"])
+        self.assertEqual(weights, {"replica_1": 3, "replica_2": 1})
+        self.assertEqual(databases["replica_1"]["HOST"], "replica-a")
+        self.assertEqual(databases["replica_1"]["PORT"], "6432")
+        self.assertEqual(databases["replica_1"]["NAME"], "recipes")
+        self.assertEqual(databases["replica_2"]["NAME"], "recipes_copy")
+        self.assertEqual(databases["replica_2"]["USER"], "postgres")
+
+    def test_weighted_round_robin(self):
+        reads = [self.router.db_for_read(Recipe) for _ in range(6)]
+        self.assertEqual(reads, ["replica_1", "replica_2", "replica_1"] * 2)
+
+    def test_writes_go_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Recipe), "default")
+
+    def test_pinned_reads_go_to_primary(self):
+        with pin_primary():
+            self.assertEqual(self.router.db_for_read(Recipe), "default")
+        self.assertEqual(self.router.db_for_read(Recipe), "replica_1")
+
+    def test_no_replicas(self):
+        self.assertEqual(ReplicaRouter({}).db_for_read(Recipe), "default")
+
+    @override_settings(RECIPE_CACHE_ALIAS="recipes")
+    def test_cached_documents_are_built_from_primary(self):
+        cache = RecipeDocumentCache()
+        cache.cache.clear()
+        pinned = []
+        cache.get_or_build("a", lambda: pinned.append(use_primary.get()) or {})
+        cache.get_or_build_many(["b"], lambda pks: pinned.append(use_primary.get()) or {})
+        self.assertEqual(pinned, [True, True])
+        self.assertFalse(use_primary.get())
+
+
+@override_settings(DATABASE_PRIMARY_STICKY_SECONDS=5)
+class TestPrimaryStickinessMiddleware(SimpleTestCase):
+
+    def setUp(self) -> None:
+        super(TestPrimaryStickinessMiddleware, self).setUp()
+        self.factory = RequestFactory()
+        self.pinned = []
+
+        def get_response(request):
+            self.pinned.append(use_primary.get())
+            return HttpResponse(status=400 if request.GET.get("fail") else 200)
+
+        self.middleware = PrimaryStickinessMiddleware(get_response)
+        caches["recipes"].clear()
+
+    def request(self, method, path="/api/v1/recipes/", token="Token secret"):
+        return getattr(self.factory, method)(path, HTTP_AUTHORIZATION=token)
+
+    def test_safe_request_reads_replicas(self):
+        response = self.middleware(self.request("get"))
+        self.assertEqual(self.pinned, [False])
+        self.assertEqual(response.cookies, {})
+
+    def test_write_sticks_client_to_primary(self):
+        response = self.middleware(self.request("post"))
+        # Nothing is handed to the client: the pin lives in the cache.
+        self.assertEqual(response.cookies, {})
+        self.middleware(self.request("get"))
+        self.middleware(self.request("get", token="Token other"))
+        self.middleware(self.factory.get("/api/v1/recipes/"))
+        self.assertEqual(self.pinned, [True, True, False, False])
+        self.assertFalse(use_primary.get())
+
+    def test_session_clients(self):
+        self.middleware(self.factory.post("/api/v1/recipes/", HTTP_COOKIE="sessionid=abc"))
+        self.middleware(self.factory.get("/api/v1/recipes/", HTTP_COOKIE="sessionid=abc"))
+        self.middleware(self.factory.get("/api/v1/recipes/", HTTP_COOKIE="sessionid=def"))
+        self.assertEqual(self.pinned, [True, True, False])
+
+    def test_expired_window(self):
+        key = PrimaryStickinessMiddleware.client_key(self.request("get"))
+        caches["recipes"].set(key, time.time() - 1)
+        self.middleware(self.request("get"))
+        self.assertEqual(self.pinned, [False])
+
+    @override_settings(DATABASE_REPLICA_WEIGHTS={"replica_1": 1})
+    def test_replicas_require_a_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            PrimaryStickinessMiddleware(lambda request: HttpResponse())
+        with override_settings(CACHES={"recipes": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": "/tmp/recipes-sticky",
+        }}):
+            PrimaryStickinessMiddleware(lambda request: HttpResponse())
+
+    def test_failed_write_does_not_stick(self):
+        self.middleware(self.request("post", path="/api/v1/recipes/?fail=1"))
+        self.middleware(self.request("get"))
+        self.assertEqual(self.pinned, [True, False])
@@ -0,0 +1,117 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestScaledIngredients(TestCase):
+
+    def setUp(self) -> None:
+        super(TestScaledIngredients, self).setUp()
+        self.recipe = Recipe.objects.create(name="Bolo", difficulty_level="beginner", servings=4)
+        self.unknown = Recipe.objects.create(name="Sem porções", difficulty_level="beginner")
+
+    def scaled(self, ingredients, recipe=None, **scaling):
+        recipe = recipe or self.recipe
+        Ingredient.objects.bulk_create([
+            Ingredient(recipe=recipe, quantity=quantity, unit_type=unit_type, name=f"{index:02d}")
+            for index, (quantity, unit_type) in enumerate(ingredients)
+        ])
+        rows = Ingredient.objects.filter(recipe=recipe).scaled(**scaling).order_by("name")
+        return list(rows.values_list("scaled_quantity", "scaled_unit_type"))
+
+    def test_scale(self):
+        self.assertListEqual(self.scaled([(1, "cup"), (2, "gram")], scale=1.5), [(1.5, "cup"), (3, "gram")])
+
+    def test_servings(self):
+        self.assertListEqual(self.scaled([(1, "cup"), (1 / 3, "gram")], servings=6), [(1.5, "cup"), (0.5, "gram")])
+        # Recipes without servings are returned as stored, unrounded.
+        self.assertListEqual(self.scaled([(1 / 3, "gram")], recipe=self.unknown, servings=6), [(1 / 3, "gram")])
+
+    def test_metric(self):
+        ingredients = [
+            (2, "tablespoon"), (8, "cup"), (0.5, "gram"), (1200, "gram"), (3, "centimeter"), (2, "liter"),
+        ]
+        self.assertListEqual(self.scaled(ingredients, units="metric"), [
+            (29.574, "milliliter"), (1.893, "liter"), (500, "milligram"),
+            (1.2, "kilogram"), (3, "centimeter"), (2, "liter"),
+        ])
+
+    def test_pass_through(self):
+        ingredients = [(None, "to_taste"), (1, "to_taste"), (None, "gram")]
+        self.assertListEqual(self.scaled(ingredients, scale=2, units="metric"), ingredients)
+
+
+class TestScaling(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestScaling, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="Bolo", difficulty_level="beginner", servings=4)
+        self.flour = Ingredient.objects.create(recipe=self.recipe, quantity=2, unit_type="cup", name="flour")
+        Ingredient.objects.create(recipe=self.recipe, quantity=None, unit_type="to_taste", name="salt")
+        Ingredient.objects.create(recipe=self.recipe, quantity=500, unit_type="gram", name="sugar")
+        Step.objects.create(recipe=self.recipe, step=1, description="mix")
+        self.unknown = Recipe.objects.create(name="Sem porções", difficulty_level="beginner")
+        Ingredient.objects.create(recipe=self.unknown, quantity=1, unit_type="cup", name="milk")
+        self.url = f"/api/v1/recipes/{str(self.recipe.id)}/"
+
+    def quantities(self, ingredients):
+        return {item["name"]: (item["quantity"], item["unit_type"]) for item in ingredients}
+
+    def test_detail_servings(self):
+        res = self.client.get(self.url, data={"servings": 6})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["servings"], 6)
+        self.assertDictEqual(self.quantities(res.json()["ingredients"]), {
+            "flour": (3, "cup"), "salt": (None, "to_taste"), "sugar": (750, "gram"),
+        })
+        # The cached document is left untouched.
+        res = self.client.get(self.url)
+        self.assertEqual(res.json()["servings"], 4)
+        self.assertEqual(self.quantities(res.json()["ingredients"])["flour"], (2, "cup"))
+
+    def test_detail_scale_and_units(self):
+        res = self.client.get(self.url, data={"scale": 3, "units": "metric"})
+        self.assertEqual(res.json()["servings"], 4)
+        self.assertDictEqual(self.quantities(res.json()["ingredients"]), {
+            "flour": (1.42, "liter"), "salt": (None, "to_taste"), "sugar": (1.5, "kilogram"),
+        })
+
+    @override_settings(RECIPE_CACHE_ALIAS="")
+    def test_detail_sparse_without_cache(self):
+        res = self.client.get(self.url, data={"fields": "name,ingredients", "servings": 2})
+        self.assertListEqual(list(res.json()), ["ingredients", "name"])
+        self.assertEqual(self.quantities(res.json()["ingredients"])["flour"], (1, "cup"))
+
+    def test_list(self):
+        # Count, page and ingredients.
+        with self.assertNumQueries(3):
+            res = self.client.get("/api/v1/recipes/", data={"servings": 8, "fields": "name,ingredients"})
+        recipes = {recipe["name"]: self.quantities(recipe["ingredients"]) for recipe in res.json()["results"]}
+        self.assertEqual(recipes["Bolo"]["sugar"], (1000, "gram"))
+        # Recipes without servings cannot be scaled to a number of servings.
+        self.assertEqual(recipes["Sem porções"]["milk"], (1, "cup"))
+
+    def test_ingredients(self):
+        res = self.client.get(f"{self.url}ingredients/", data={"servings": 2, "units": "metric"})
+        self.assertDictEqual(self.quantities(res.json()["results"]), {
+            "flour": (236.588, "milliliter"), "salt": (None, "to_taste"), "sugar": (250, "gram"),
+        })
+        res = self.client.get(f"{self.url}ingredients/{str(self.flour.id)}/", data={"scale": 0.5})
+        self.assertEqual(res.json()["quantity"], 1)
+
+    def test_cookable(self):
+        res = self.client.get("/api/v1/recipes/cookable/", data={"ingredients": "flour", "servings": 8})
+        self.assertEqual(self.quantities(res.json()["results"][0]["ingredients"])["flour"], (4, "cup"))
+
+    def test_invalid(self):
+        for params in ({"servings": 0}, {"servings": "two"}, {"scale": "-1"}, {"scale": "nan"},
+                       {"units": "imperial"}, {"servings": 2, "scale": 2}):
+            res = self.client.get(self.url, data=params)
+            self.assertEqual(res.status_code, 400, params)
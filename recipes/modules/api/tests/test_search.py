@@ -0,0 +1,90 @@
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient
+
+
+class TestRecipeSearch(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestRecipeSearch, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.cake = Recipe.objects.create(
+            name="Bolo de cenoura", description="Bolo fofinho com cobertura de chocolate",
+            difficulty_level="beginner",
+        )
+        Ingredient.objects.create(recipe=self.cake, quantity=3, unit_type="gram", name="cenouras")
+        self.pancakes = Recipe.objects.create(
+            name="Banana pancakes", description="Fluffy pancakes", difficulty_level="beginner",
+        )
+        Ingredient.objects.create(recipe=self.pancakes, quantity=2, unit_type="gram", name="chocolate chips")
+        self.soup = Recipe.objects.create(
+            name="Tomato soup", description="Roasted tomatoes", difficulty_level="intermediate",
+        )
+
+    def search(self, query):
+        res = self.client.get("/api/v1/recipes/", data=query)
+        self.assertEqual(res.status_code, 200)
+        return [recipe["id"] for recipe in res.json()["results"]]
+
+    def test_portuguese_stemming(self):
+        self.assertListEqual(self.search({"q": "cenoura", "lang": "pt"}), [str(self.cake.id)])
+
+    def test_english_stemming(self):
+        self.assertListEqual(self.search({"q": "pancake", "lang": "en"}), [str(self.pancakes.id)])
+
+    def test_matches_ingredient_names_with_lower_rank(self):
+        self.assertListEqual(self.search({"q": "chocolate"}), [str(self.cake.id), str(self.pancakes.id)])
+
+    def test_trigram_fallback_for_typos(self):
+        self.assertListEqual(self.search({"q": "tomatto sopu"}), [str(self.soup.id)])
+
+    def test_created_recipe_is_searchable(self):
+        self.client.post("/api/v1/recipes/", data={
+            "name": "Feijoada", "description": "", "difficulty_level": "advanced",
+            "ingredients": [{"quantity": 1, "unit_type": "kilogram", "name": "feijão preto"}],
+            "steps": [],
+        }, format="json")
+        self.assertEqual(len(self.search({"q": "feijão"})), 1)
+
+    def test_ingredient_edit_updates_search(self):
+        ingredient = self.soup.ingredients.create(quantity=1, unit_type="gram", name="basil")
+        self.client.patch(
+            f"/api/v1/recipes/{str(self.soup.id)}/ingredients/{str(ingredient.id)}/",
+            data={"name": "oregano"}, format="json"
+        )
+        self.assertListEqual(self.search({"q": "oregano"}), [str(self.soup.id)])
+        self.assertListEqual(self.search({"q": "basil", "lang": "en"}), [])
+
+    def test_vector_maintained_by_the_database(self):
+        # Writes that bypass the API keep the vector current too.
+        Recipe.objects.filter(pk=self.soup.pk).update(name="Gazpacho")
+        ingredient = Ingredient.objects.create(recipe=self.pancakes, quantity=1, unit_type="gram", name="mirtilos")
+        self.assertListEqual(self.search({"q": "gazpacho"}), [str(self.soup.id)])
+        self.assertListEqual(self.search({"q": "mirtilo", "lang": "pt"}), [str(self.pancakes.id)])
+        Ingredient.objects.filter(pk=ingredient.pk).update(recipe=self.soup)
+        self.assertListEqual(self.search({"q": "mirtilo", "lang": "pt"}), [str(self.soup.id)])
+        Ingredient.objects.filter(pk=ingredient.pk).delete()
+        self.assertFalse(Recipe.objects.filter(search_vector="mirtilo").exists())
+
+    def test_fallback_only_without_matches(self):
+        # The count and page of the ranking.
+        with self.assertNumQueries(2):
+            ids = self.search({"q": "chocolate", "fields": "id"})
+        self.assertListEqual(ids, [str(self.cake.id), str(self.pancakes.id)])
+        # The empty count of the ranking, then the similarity ranking.
+        with self.assertNumQueries(3):
+            self.assertListEqual(self.search({"q": "tomatto", "fields": "id"}), [str(self.soup.id)])
+
+    def test_unsupported_language(self):
+        res = self.client.get("/api/v1/recipes/", data={"q": "bolo", "lang": "de"})
+        self.assertEqual(res.status_code, 400)
+
+    def test_search_ignores_cursor_mode(self):
+        res = self.client.get("/api/v1/recipes/", data={"q": "chocolate", "pagination": "cursor"})
+        self.assertIn("count", res.json())
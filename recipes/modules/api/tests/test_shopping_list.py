@@ -0,0 +1,89 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from config.routers import PrimaryStickinessMiddleware
+from modules.api.models import Recipe, Ingredient
+
+
+class TestShoppingList(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestShoppingList, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        grain = "Grain, nuts and baking products"
+        self.bolo = Recipe.objects.create(name="Bolo", difficulty_level="beginner", servings=4)
+        Ingredient.objects.create(recipe=self.bolo, quantity=2, unit_type="cup", name="Farinha", category=grain)
+        Ingredient.objects.create(recipe=self.bolo, quantity=200, unit_type="gram", name="Açúcar")
+        Ingredient.objects.create(recipe=self.bolo, quantity=250, unit_type="milliliter", name="Leite")
+        Ingredient.objects.create(recipe=self.bolo, quantity=None, unit_type="to_taste", name="sal")
+        self.pao = Recipe.objects.create(name="Pão", difficulty_level="beginner", servings=2)
+        Ingredient.objects.create(recipe=self.pao, quantity=1, unit_type="kilogram", name="farinha", category=grain)
+        Ingredient.objects.create(recipe=self.pao, quantity=1, unit_type="cup", name="leite")
+        Ingredient.objects.create(recipe=self.pao, quantity=0.8, unit_type="kilogram", name="acucar")
+        Ingredient.objects.create(recipe=self.pao, quantity=None, unit_type="to_taste", name="Sal")
+        other = Recipe.objects.create(name="Outra", difficulty_level="beginner")
+        Ingredient.objects.create(recipe=other, quantity=5, unit_type="kilogram", name="farinha", category=grain)
+        self.url = "/api/v1/recipes/shopping-list/"
+
+    def shopping_list(self, recipes):
+        res = self.client.post(self.url, {"recipes": recipes}, format="json")
+        self.assertEqual(res.status_code, 200, res.content)
+        return {
+            (item["normalized_name"], item["unit_type"]): (item["quantity"], item["category"], item["recipes"])
+            for item in res.json()["results"]
+        }
+
+    def test_grouped_and_summed(self):
+        with self.assertNumQueries(2):
+            items = self.shopping_list([
+                {"id": str(self.bolo.id), "servings": 8},
+                {"id": str(self.pao.id)},
+            ])
+        grain = "Grain, nuts and baking products"
+        self.assertDictEqual(items, {
+            # 4 cups of flour are a volume, the kilogram of bread flour a mass.
+            ("farinha", "milliliter"): (946.353, grain, 1),
+            ("farinha", "kilogram"): (1, grain, 1),
+            ("acucar", "kilogram"): (1.2, None, 2),
+            ("leite", "milliliter"): (736.588, None, 2),
+            ("sal", "to_taste"): (None, None, 2),
+        })
+
+    def test_scale_and_repeated_recipes(self):
+        items = self.shopping_list([
+            {"id": str(self.pao.id), "scale": 0.5},
+            {"id": str(self.pao.id), "scale": 1.5},
+        ])
+        self.assertEqual(items[("acucar", "kilogram")], (1.6, None, 1))
+
+    def test_unknown_recipe(self):
+        missing = str(uuid.uuid4())
+        res = self.client.post(self.url, {"recipes": [{"id": str(self.bolo.id)}, {"id": missing}]}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn(missing, res.json()["recipes"][0])
+
+    def test_read_is_not_sticky(self):
+        res = self.client.post(self.url, {"recipes": [{"id": str(self.bolo.id)}]}, format="json",
+                               HTTP_AUTHORIZATION="Token secret")
+        self.assertEqual(res.status_code, 200)
+        self.assertIsNone(caches["recipes"].get(PrimaryStickinessMiddleware.client_key(res.wsgi_request)))
+
+    @override_settings(SHOPPING_LIST_MAX_RECIPES=1)
+    def test_invalid(self):
+        for recipes in ([], [{"id": str(self.bolo.id), "servings": 2, "scale": 2}],
+                        [{"id": str(self.bolo.id), "scale": 0}], [{"id": str(self.bolo.id)}] * 2):
+            res = self.client.post(self.url, {"recipes": recipes}, format="json")
+            self.assertEqual(res.status_code, 400, recipes)
+
+    def test_unauthenticated(self):
+        self.client.force_authenticate(user=None)
+        res = self.client.post(self.url, {"recipes": [{"id": str(self.bolo.id)}]}, format="json")
+        self.assertEqual(res.status_code, 403)
@@ -0,0 +1,74 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step
+
+
+class TestSparseFields(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestSparseFields, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        for i in range(3):
+            recipe = Recipe.objects.create(name=f"recipe {i}", description="long text", difficulty_level="beginner")
+            Ingredient.objects.create(recipe=recipe, quantity=1, unit_type="gram", name="sugar")
+            Step.objects.create(recipe=recipe, step=1, description="Step 1")
+        self.recipe = recipe
+        self.url = "/api/v1/recipes/"
+
+    def test_fields_restrict_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(self.url, data={"fields": "id,name"})
+        self.assertEqual(res.status_code, 200)
+        self.assertListEqual([list(recipe) for recipe in res.json()["results"]], [["id", "name"]] * 3)
+        # Count and page, without any child query.
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("description", queries[-1]["sql"])
+
+    def test_expand(self):
+        res = self.client.get(self.url, data={"expand": "steps"})
+        recipe = res.json()["results"][0]
+        self.assertNotIn("ingredients", recipe)
+        self.assertEqual(recipe["steps"][0]["description"], "Step 1")
+        self.assertEqual(recipe["description"], "long text")
+
+    def test_expand_nothing(self):
+        with self.assertNumQueries(2):
+            res = self.client.get(self.url, data={"expand": ""})
+        self.assertNotIn("steps", res.json()["results"][0])
+
+    def test_fields_select_children(self):
+        res = self.client.get(self.url, data={"fields": "name,ingredients"})
+        self.assertListEqual(list(res.json()["results"][0]), ["ingredients", "name"])
+
+    def test_unknown_field(self):
+        res = self.client.get(self.url, data={"fields": "name,secret"})
+        self.assertEqual(res.status_code, 400)
+        res = self.client.get(self.url, data={"expand": "name"})
+        self.assertEqual(res.status_code, 400)
+
+    def test_cursor_pagination(self):
+        res = self.client.get(self.url, data={"fields": "name", "pagination": "cursor", "limit": 2})
+        self.assertEqual(len(res.json()["results"]), 2)
+        res = self.client.get(res.json()["next"])
+        self.assertListEqual(res.json()["results"], [{"name": "recipe 2"}])
+
+    def test_detail(self):
+        url = f"{self.url}{str(self.recipe.id)}/"
+        full = self.client.get(url).json()
+        res = self.client.get(url, data={"fields": "id,name,steps"})
+        self.assertDictEqual(res.json(), {"id": full["id"], "steps": full["steps"], "name": full["name"]})
+
+    @override_settings(RECIPE_CACHE_ALIAS="")
+    def test_detail_without_cache(self):
+        url = f"{self.url}{str(self.recipe.id)}/"
+        with self.assertNumQueries(2):
+            res = self.client.get(url, data={"fields": "name"})
+        self.assertDictEqual(res.json(), {"name": self.recipe.name})
@@ -0,0 +1,88 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Step, StepQuerySet
+
+
+class TestStepOrdering(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestStepOrdering, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.recipe = Recipe.objects.create(name="recipe 1", difficulty_level="beginner")
+        Step.objects.bulk_create([
+            Step(recipe=self.recipe, step=index, description=f"step {index}") for index in range(1, 6)
+        ])
+        self.url = f"/api/v1/recipes/{str(self.recipe.id)}/steps/"
+
+    def descriptions(self):
+        return list(Step.objects.filter(recipe=self.recipe).order_by("step").values_list("step", "description"))
+
+    def test_insert_at_taken_position(self):
+        res = self.client.post(self.url, data={
+            "recipe": str(self.recipe.id), "step": 2, "description": "new",
+        }, format="json")
+        self.assertEqual(res.status_code, 201)
+        self.assertListEqual(self.descriptions(), [
+            (1, "step 1"), (2, "new"), (3, "step 2"), (4, "step 3"), (5, "step 4"), (6, "step 5"),
+        ])
+
+    def test_move_down_in_one_statement(self):
+        with self.assertNumQueries(1):
+            Step.objects.move(self.recipe.pk, 2, 4)
+        self.assertListEqual(self.descriptions(), [
+            (1, "step 1"), (2, "step 3"), (3, "step 4"), (4, "step 2"), (5, "step 5"),
+        ])
+
+    def test_move_up_through_patch(self):
+        res = self.client.patch(f"{self.url}5/", data={"step": 1}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.json()["step"], 1)
+        self.assertListEqual(self.descriptions(), [
+            (1, "step 5"), (2, "step 1"), (3, "step 2"), (4, "step 3"), (5, "step 4"),
+        ])
+
+    def test_step_numbers_are_unique(self):
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Step.objects.create(recipe=self.recipe, step=3, description="duplicate")
+                with connection.cursor() as cursor:
+                    cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+    def test_batch_conflict_is_a_validation_error(self):
+        res = self.client.patch(self.url, data=[{"step": 3, "description": "duplicate"}], format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(Step.objects.filter(recipe=self.recipe).count(), 5)
+
+    def test_duplicate_step_is_a_validation_error(self):
+        # As when a concurrent write takes the position after the gap opened.
+        with mock.patch.object(StepQuerySet, "open_gap", return_value=0):
+            res = self.client.post(self.url, data={
+                "recipe": str(self.recipe.id), "step": 2, "description": "duplicate",
+            }, format="json")
+            self.assertEqual(res.status_code, 400)
+            self.assertIn("step", res.json())
+            other = Recipe.objects.create(name="recipe 2", difficulty_level="beginner")
+            moved = Step.objects.create(recipe=other, step=1, description="moved")
+            res = self.client.patch(f"/api/v1/recipes/{str(other.id)}/steps/1/", data={
+                "recipe": str(self.recipe.id), "step": 3,
+            }, format="json")
+            self.assertEqual(res.status_code, 400)
+        self.assertEqual(Step.objects.filter(recipe=self.recipe).count(), 5)
+        moved.refresh_from_db()
+        self.assertEqual((moved.recipe_id, moved.step), (other.pk, 1))
+
+    def test_recipe_create_rejects_duplicated_steps(self):
+        res = self.client.post("/api/v1/recipes/", data={
+            "name": "recipe 2", "description": "", "difficulty_level": "beginner", "ingredients": [],
+            "steps": [{"step": 1, "description": "a"}, {"step": 1, "description": "b"}],
+        }, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("steps", res.json())
@@ -0,0 +1,102 @@
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.authentication import CachedTokenAuthentication, token_cache
+
+
+class TestCachedTokenAuthentication(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestCachedTokenAuthentication, self).setUp()
+        token_cache.reset_stats()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.url = "/api/v1/recipes/"
+
+    def test_cached_lookup_saves_a_query(self):
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(f"{self.url}?limit=1").status_code, 200)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f"{self.url}?limit=1").status_code, 200)
+        self.assertEqual(token_cache.stats()["hits"], 1)
+        self.assertEqual(token_cache.stats()["misses"], 1)
+
+    def test_fresh_instances_per_request(self):
+        authentication = CachedTokenAuthentication()
+        first_user, first_token = authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(self.token.key)
+        self.assertIsNot(user, first_user)
+        self.assertEqual(user, self.user)
+        self.assertEqual(
+            (user.username, user.is_active, user.is_staff, user.is_superuser),
+            (self.user.username, self.user.is_active, self.user.is_staff, self.user.is_superuser),
+        )
+        self.assertFalse(user._state.adding)
+        # The row of the token, not a stand-in.
+        self.assertIsNot(token, first_token)
+        self.assertEqual((token.pk, token.created, token.user), (self.token.pk, self.token.created, user))
+        self.assertFalse(token._state.adding)
+
+    def test_credentials_are_not_cached(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+        with self.assertNumQueries(0):
+            user, token = authentication.authenticate_credentials(self.token.key)
+        self.assertSetEqual(user.get_deferred_fields(), {"password", "last_login", "first_name", "last_name",
+                                                         "email", "date_joined"})
+        # Deferred fields still load on demand.
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, self.user.email)
+
+    def test_invalid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token invalid")
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(self.url)
+        self.token.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(TOKEN_CACHE_ALIAS="default")
+    def test_shared_cache(self):
+        caches["default"].clear()
+        key = token_cache.cache_key(self.token.key)
+        self.client.get(self.url)
+        user_values, created = caches["default"].get(key)
+        self.assertEqual((user_values["id"], created), (self.user.pk, self.token.created))
+        self.assertSetEqual(set(user_values), {"id", "username", "is_active", "is_staff", "is_superuser"})
+        # Another process already looked the token up.
+        token_cache.drop([key])
+        caches["default"].set(key, (user_values, created))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f"{self.url}?limit=1").status_code, 200)
+        self.token.delete()
+        self.assertIsNone(caches["default"].get(key))
+
+    @override_settings(TOKEN_CACHE_TTL=0)
+    def test_disabled_cache(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(token_cache.stats()["hits"], 0)
+        self.assertFalse(token_cache.stats()["enabled"])
+
+    def test_stats(self):
+        self.user.is_staff = True
+        self.user.save()
+        res = self.client.get("/api/v1/stats/cache/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("tokens", res.json())
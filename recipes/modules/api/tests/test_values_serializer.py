@@ -0,0 +1,80 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APIClient
+
+from modules.api.models import Recipe, Ingredient, Step, recipe_children_querysets
+from modules.api.serializers import RecipeSerializer, IngredientSerializer, StepSerializer, ValuesSerializer
+
+
+class TestValuesSerializer(APITestCase):
+
+    def setUp(self) -> None:
+        super(TestValuesSerializer, self).setUp()
+        self.user = User.objects.create_user(
+            username="test_user", email="test_user@test.com", password="test_password"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.full = Recipe.objects.create(
+            name="Pão de queijo", description="Crocante \"por fora\"", difficulty_level="intermediate",
+            image_url="https://example.com/pao.png",
+        )
+        Ingredient.objects.create(
+            recipe=self.full, quantity=0.5, unit_type="cup", name="polvilho",
+            category="Grain, nuts and baking products",
+        )
+        Ingredient.objects.create(recipe=self.full, quantity=None, unit_type="to_taste", name="sal")
+        Ingredient.objects.create(recipe=self.full, quantity=2, unit_type="gram", name="queijo")
+        Step.objects.create(recipe=self.full, step=2, description="Asse")
+        Step.objects.create(recipe=self.full, step=1, description="")
+        self.empty = Recipe.objects.create(name="empty", difficulty_level="beginner")
+        # Whole second timestamps render without microseconds.
+        Recipe.objects.filter(pk=self.empty.pk).update(
+            created_at=datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+        )
+
+    def assertSameJSON(self, serializer, queryset, instances):
+        values = ValuesSerializer(serializer, querysets=recipe_children_querysets())
+        expected = JSONRenderer().render(type(serializer)(instances, many=True).data)
+        documents = values.to_representation(queryset.values(*values.columns))
+        self.assertEqual(JSONRenderer().render(documents), expected)
+
+    def test_recipes(self):
+        queryset = Recipe.objects.order_by("created_at", "id")
+        self.assertSameJSON(RecipeSerializer(), queryset, queryset.with_children())
+
+    def test_recipes_in_another_timezone(self):
+        queryset = Recipe.objects.order_by("created_at", "id")
+        with timezone.override("America/Sao_Paulo"):
+            self.assertSameJSON(RecipeSerializer(), queryset, queryset.with_children())
+
+    def test_children(self):
+        ingredients = Ingredient.objects.order_by("name", "id")
+        self.assertSameJSON(IngredientSerializer(), ingredients, ingredients)
+        steps = Step.objects.order_by("step", "id")
+        self.assertSameJSON(StepSerializer(), steps, steps)
+
+    def test_sparse(self):
+        queryset = Recipe.objects.order_by("created_at", "id")
+        values = ValuesSerializer(RecipeSerializer(fields=["name", "steps"]), querysets=recipe_children_querysets())
+        self.assertListEqual(values.columns, ["id", "name"])
+        documents = values.to_representation(queryset.values(*values.columns))
+        self.assertDictEqual(documents[0], {"steps": [], "name": "empty"})
+        self.assertListEqual([step["step"] for step in documents[1]["steps"]], [1, 2])
+
+    def test_views(self):
+        expected = RecipeSerializer(Recipe.objects.with_children().order_by("created_at", "id"), many=True).data
+        with self.assertNumQueries(4):
+            res = self.client.get("/api/v1/recipes/")
+        self.assertEqual(JSONRenderer().render(res.json()["results"]), JSONRenderer().render(expected))
+        res = self.client.get(f"/api/v1/recipes/{str(self.full.id)}/")
+        recipe = Recipe.objects.with_children().get(pk=self.full.pk)
+        self.assertEqual(res.content, JSONRenderer().render(RecipeSerializer(recipe).data))
+        res = self.client.get(f"/api/v1/recipes/{str(self.full.id)}/steps/")
+        self.assertEqual(
+            JSONRenderer().render(res.json()["results"]),
+            JSONRenderer().render(StepSerializer(self.full.steps.order_by("step", "id"), many=True).data),
+        )
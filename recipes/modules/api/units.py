@@ -0,0 +1,42 @@
+import math
+
+# Size of each measurable unit in the base unit of its dimension (milliliter,
+# gram, millimeter). Spoons and cups are US customary measures.
+UNIT_SIZES = {
+    "teaspoon": ("volume", 4.92892159375),
+    "tablespoon": ("volume", 14.78676478125),
+    "cup": ("volume", 236.5882365),
+    "milliliter": ("volume", 1.0),
+    "liter": ("volume", 1000.0),
+    "milligram": ("mass", 0.001),
+    "gram": ("mass", 1.0),
+    "kilogram": ("mass", 1000.0),
+    "millimeter": ("length", 1.0),
+    "centimeter": ("length", 10.0),
+    "meter": ("length", 1000.0),
+}
+
+# Units each unit system converts to, per dimension, largest first.
+UNIT_SYSTEMS = {
+    "metric": {
+        "volume": ("liter", "milliliter"),
+        "mass": ("kilogram", "gram", "milligram"),
+        "length": ("meter", "centimeter", "millimeter"),
+    },
+}
+
+# Quantities whose amount is left to the cook are never scaled or converted.
+UNSCALED_UNITS = frozenset(["to_taste"])
+
+# Decimal places kept on the quantities that are scaled or converted.
+QUANTITY_DIGITS = 3
+
+
+def parse_factor(value):
+    """
+    Parse a positive, finite scale factor, raising ValueError otherwise.
+    """
+    factor = float(value)
+    if not math.isfinite(factor) or factor <= 0:
+        raise ValueError(value)
+    return factor
@@ -7,6 +7,30 @@ urlpatterns = [
         f"recipes/",
         views.RecipeListCreateView.as_view(), name="recipes_v1"
     ),
+    path(
+        f"recipes/cookable/",
+        views.CookableRecipesView.as_view(), name="recipes_cookable_v1"
+    ),
+    path(
+        f"recipes/batch/",
+        views.RecipeBatchView.as_view(), name="recipes_batch_v1"
+    ),
+    path(
+        f"recipes/changes/",
+        views.RecipeChangeFeedView.as_view(), name="recipes_changes_v1"
+    ),
+    path(
+        f"recipes/shopping-list/",
+        views.ShoppingListView.as_view(), name="recipes_shopping_list_v1"
+    ),
+    path(
+        f"recipes/import/",
+        views.RecipeImportView.as_view(), name="recipes_import_v1"
+    ),
+    path(
+        f"recipes/export/",
+        views.RecipeExportView.as_view(), name="recipes_export_v1"
+    ),
     path(
         f"recipes/<uuid:pk>/",
         views.RecipeDetailView.as_view(), name="recipe_detail_v1"
@@ -27,4 +51,12 @@ urlpatterns = [
         f"recipes/<uuid:pk>/ingredients/<uuid:ingredient>/",
         views.RecipeIngredientDetailView.as_view(), name="recipe_ingredient_v1"
     ),
+    path(
+        f"stats/cache/",
+        views.CacheStatsView.as_view(), name="cache_stats_v1"
+    ),
+    path(
+        f"stats/database/",
+        views.DatabaseStatsView.as_view(), name="database_stats_v1"
+    ),
 ]
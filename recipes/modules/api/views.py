@@ -1,34 +1,737 @@
+import base64
+import hashlib
+import uuid
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils.translation import gettext as _
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
+from rest_framework.exceptions import UnsupportedMediaType, ValidationError
 from rest_framework.generics import get_object_or_404
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from config.compression import compressed_cache
+from config.db.pool import pool_stats
+from modules.api.authentication import token_cache
+from modules.api.batch import RecipeChildBatch
+from modules.api.cache import recipe_cache
+from modules.api.changes import recipe_changed, recipe_deleted
+from modules.api.exporters import EXPORT_FORMATS, export_recipes, parse_since
+from modules.api.filters import IngredientFilter, RecipeFilter, StepFilter
+from modules.api.importers import NDJSON_MEDIA_TYPES, RecipeImporter, parse_msgpack, parse_ndjson
+from modules.api.models import (
+    RECIPE_CHILDREN, Recipe, RecipeChange, Ingredient, Step, recipe_children_prefetches, recipe_children_querysets
+)
+from modules.api.renderers import MSGPACK_MEDIA_TYPES
+from modules.api.search import search_recipes, similar_recipes
+from modules.api.serializers import (
+    RecipeSerializer, StepSerializer, IngredientSerializer, CookableRecipeSerializer, ShoppingListSerializer,
+    ValuesSerializer
+)
+from modules.api.shopping import shopping_list
+from modules.api.units import UNIT_SYSTEMS, parse_factor
+
+
+class ConditionalResponseMixin:
+    """
+    Strong ETag and Last-Modified handling: ``conditional_response()`` answers
+    304 when the client's copy matches the given version, and only builds the
+    response otherwise.
+    """
+
+    def get_etag(self, last_modified, token):
+        version = "|".join([
+            self.request.get_full_path(),
+            self.request.accepted_media_type or "",
+            last_modified.isoformat() if last_modified else "",
+            str(token),
+        ])
+        return '"%s"' % hashlib.md5(version.encode("utf-8")).hexdigest()
+
+    def conditional_response(self, last_modified, token, build):
+        """
+        Return 304 if the request's validators match ``(last_modified,
+        token)``, else ``build()``, with the ETag and Last-Modified headers.
+        """
+        etag = self.get_etag(last_modified, token)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = build()
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ConditionalGetMixin(ConditionalResponseMixin, ABC):
+    """
+    Answers GET with the validators of ``get_conditional_state()`` (one
+    aggregate query), returning 304 before anything is serialized when the
+    client's copy is still current.
+    """
+
+    @abstractmethod
+    def get_conditional_state(self):
+        """
+        Return ``(last_modified, token)`` for the requested resource, where
+        ``token`` captures anything ``last_modified`` alone does not, or None
+        to skip conditional handling.
+        """
+
+    def get(self, request, *args, **kwargs):
+        state = self.get_conditional_state()
+        if state is None:
+            return super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+        return self.conditional_response(
+            *state, lambda: super(ConditionalGetMixin, self).get(request, *args, **kwargs)
+        )
+
+
+FieldSelection = namedtuple("FieldSelection", ["fields", "children"])
+
+
+class RecipeFieldsMixin:
+    """
+    Sparse fieldsets for recipe reads. ``?fields=`` lists the fields to return
+    and only their columns are selected; ``?expand=`` lists the nested lists
+    to embed, the others are neither prefetched nor serialized. Without
+    ``?expand=`` the lists named in ``?fields=`` are embedded, and without
+    either parameter the whole document is returned.
+    """
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def parse_names(self, param, allowed):
+        names = [name.strip() for name in self.request.query_params[param].split(",") if name.strip()]
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise ValidationError({param: _("Unknown fields: %(fields)s") % {"fields": ", ".join(unknown)}})
+        return names
+
+    def get_field_selection(self):
+        """
+        Return the ``FieldSelection`` requested, or None for whole documents.
+        """
+        if hasattr(self, "_field_selection"):
+            return self._field_selection
+        self._field_selection = None
+        params = self.request.query_params
+        if self.request.method == "GET" and (self.fields_query_param in params or self.expand_query_param in params):
+            available = list(self.get_serializer_class()().fields)
+            fields = available
+            if self.fields_query_param in params:
+                fields = self.parse_names(self.fields_query_param, available)
+            if self.expand_query_param in params:
+                children = self.parse_names(self.expand_query_param, RECIPE_CHILDREN)
+            else:
+                children = [name for name in RECIPE_CHILDREN if name in fields]
+            self._field_selection = FieldSelection(
+                fields=[
+                    name for name in available
+                    if name in children or (name in fields and name not in RECIPE_CHILDREN)
+                ],
+                children=[name for name in RECIPE_CHILDREN if name in children],
+            )
+        return self._field_selection
+
+    def get_queryset(self):
+        qs = super(RecipeFieldsMixin, self).get_queryset()
+        selection = self.get_field_selection()
+        if selection is None:
+            return qs
+        # Ordering columns are kept for keyset pagination.
+        columns = {"id", *getattr(self, "ordering", ())}
+        columns.update(name for name in selection.fields if name not in RECIPE_CHILDREN)
+        return qs.prefetch_related(None).prefetch_related(
+            *recipe_children_prefetches(selection.children)
+        ).only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        selection = self.get_field_selection()
+        if selection is not None:
+            kwargs["fields"] = selection.fields
+        return super(RecipeFieldsMixin, self).get_serializer(*args, **kwargs)
+
+
+Scaling = namedtuple("Scaling", ["servings", "scale", "units"])
+
+
+class IngredientScalingMixin:
+    """
+    Scaled ingredient quantities on GET. ``?servings=`` scales them from the
+    recipe's servings to the given number (recipes without servings are left
+    as they are), ``?scale=`` multiplies them by the given factor and
+    ``?units=`` converts them to a unit system (see ``modules.api.units``).
+    The database scales and converts them (see ``IngredientQuerySet.scaled``)
+    and ``ValuesSerializer`` reads the results in place of the stored values.
+    """
+    servings_query_param = "servings"
+    scale_query_param = "scale"
+    units_query_param = "units"
+    scaled_ingredient_sources = {"quantity": "scaled_quantity", "unit_type": "scaled_unit_type"}
+
+    def get_scaling(self):
+        """
+        Return the ``Scaling`` requested, or None when quantities are left as
+        they are.
+        """
+        if hasattr(self, "_scaling"):
+            return self._scaling
+        self._scaling = None
+        params = self.request.query_params
+        if self.request.method != "GET":
+            return None
+        servings = scale = units = None
+        if self.servings_query_param in params and self.scale_query_param in params:
+            raise ValidationError({
+                self.scale_query_param: _("Cannot be combined with %(param)s.") % {"param": self.servings_query_param}
+            })
+        if self.servings_query_param in params:
+            try:
+                servings = int(params[self.servings_query_param])
+            except ValueError:
+                servings = 0
+            if not 0 < servings <= 32767:
+                raise ValidationError({self.servings_query_param: _("A valid positive integer is required.")})
+        if self.scale_query_param in params:
+            try:
+                scale = parse_factor(params[self.scale_query_param])
+            except ValueError:
+                raise ValidationError({self.scale_query_param: _("A valid positive number is required.")})
+        if self.units_query_param in params:
+            units = params[self.units_query_param]
+            if units not in UNIT_SYSTEMS:
+                raise ValidationError({
+                    self.units_query_param: _("Unknown unit system, choose one of: %(units)s")
+                    % {"units": ", ".join(UNIT_SYSTEMS)}
+                })
+        if servings is not None or scale is not None or units is not None:
+            self._scaling = Scaling(servings=servings, scale=scale, units=units)
+        return self._scaling
+
+    def scale_ingredient_queryset(self, queryset):
+        scaling = self.get_scaling()
+        if scaling is None:
+            return queryset
+        return queryset.scaled(scale=scaling.scale, servings=scaling.servings, units=scaling.units)
+
+    def scale_recipe_queryset(self, queryset):
+        # Recipes scaled to a number of servings report it as theirs.
+        scaling = self.get_scaling()
+        if scaling is None or scaling.servings is None:
+            return queryset
+        return queryset.with_scaled_servings(scaling.servings)
+
+    def get_ingredient_sources(self):
+        return self.scaled_ingredient_sources if self.get_scaling() is not None else None
+
+    def get_recipe_values_serializer(self, serializer):
+        """
+        ``ValuesSerializer`` of recipe documents, reading the scaled
+        ingredients and servings when scaling is requested. The recipe rows
+        have to come from ``scale_recipe_queryset``.
+        """
+        querysets = recipe_children_querysets()
+        scaling = self.get_scaling()
+        if scaling is None:
+            return ValuesSerializer(serializer, querysets=querysets)
+        querysets["ingredients"] = self.scale_ingredient_queryset(querysets["ingredients"])
+        sources = {"ingredients": self.scaled_ingredient_sources}
+        if scaling.servings is not None:
+            sources["servings"] = "scaled_servings"
+        return ValuesSerializer(serializer, querysets=querysets, sources=sources)
+
 
-from modules.api.models import Recipe, Ingredient, Step
-from modules.api.serializers import RecipeSerializer, StepSerializer, IngredientSerializer
+class ValuesListMixin:
+    """
+    Serves GET lists from ``.values()`` rows through ``ValuesSerializer``,
+    which produces the output of ``get_serializer()`` without building model
+    instances or going through DRF's per field machinery.
+    """
 
+    def get_values_serializer(self):
+        return ValuesSerializer(self.get_serializer(), querysets=recipe_children_querysets())
 
-class RecipeListCreateView(generics.ListCreateAPIView):
+    def get_columns(self, serializer):
+        # Ordering columns are kept for keyset pagination.
+        return [*serializer.columns, *getattr(self, "ordering", ())]
+
+    def get_documents(self, serializer, rows):
+        return serializer.to_representation(rows)
+
+    def get_rows(self, serializer):
+        columns = dict.fromkeys(self.get_columns(serializer))
+        return self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*columns)
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = self.get_rows(serializer)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_documents(serializer, list(page)))
+        return Response(self.get_documents(serializer, list(queryset)))
+
+
+class RecipeChildWriteMixin:
+    """
+    Marks every recipe touched by a write on one of its ingredients or steps
+    as changed, bumping its version and invalidating its cached document.
+    """
+
+    def perform_create(self, serializer):
+        super(RecipeChildWriteMixin, self).perform_create(serializer)
+        recipe_changed(self.kwargs["pk"], serializer.instance.recipe_id)
+
+    def perform_update(self, serializer):
+        previous_recipe_id = serializer.instance.recipe_id
+        super(RecipeChildWriteMixin, self).perform_update(serializer)
+        recipe_changed(previous_recipe_id, serializer.instance.recipe_id)
+
+    def perform_destroy(self, instance):
+        super(RecipeChildWriteMixin, self).perform_destroy(instance)
+        recipe_changed(instance.recipe_id)
+
+
+class RecipeChildBatchMixin:
+    """
+    List level PATCH/PUT/DELETE writing many ingredients or steps of a recipe
+    in one request and one transaction (see ``RecipeChildBatch``). PATCH and
+    PUT answer with the resulting list.
+    """
+
+    def get_recipe(self):
+        return get_object_or_404(Recipe.objects.only("pk"), pk=self.kwargs["pk"])
+
+    def patch(self, request, *args, **kwargs):
+        return self.batch_write(request, replace=False)
+
+    def put(self, request, *args, **kwargs):
+        return self.batch_write(request, replace=True)
+
+    def delete(self, request, *args, **kwargs):
+        recipe = self.get_recipe()
+        with transaction.atomic():
+            RecipeChildBatch.delete(recipe.pk, self.get_serializer_class().Meta.model, request.data)
+            recipe_changed(recipe.pk)
+        return Response(status=204)
+
+    def batch_write(self, request, replace):
+        recipe = self.get_recipe()
+        batch = RecipeChildBatch(recipe.pk, self.get_serializer_class(), request.data, replace=replace)
+        with transaction.atomic():
+            batch.validate()
+            batch.save()
+            recipe_changed(recipe.pk)
+        serializer = self.get_serializer(self.get_queryset(), many=True)
+        return Response(serializer.data)
+
+
+class RecipeChildListMixin(ConditionalGetMixin):
+    """
+    Nested lists are versioned by their parent recipe, whose ``updated_at``
+    every ingredient or step write bumps.
+    """
+
+    def get_conditional_state(self):
+        state = Recipe.objects.filter(pk=self.kwargs["pk"]).aggregate(last_modified=Max("updated_at"))
+        return state["last_modified"], ""
+
+
+class RecipeListCreateView(RecipeFieldsMixin, IngredientScalingMixin, ValuesListMixin, ConditionalResponseMixin,
+                           generics.ListCreateAPIView):
+    """
+    Recipe list, versioned by the page served: its ETag comes from the
+    ``updated_at`` of the recipes on the page (which child writes bump too)
+    and from its count and links, so a 304 costs the page query, without
+    reading any ingredient or step. There is no Last-Modified: deleting a
+    recipe, or an older one sliding into the page, does not make it move.
+    """
     serializer_class = RecipeSerializer
     permission_classes = (IsAuthenticated,)
-    queryset = Recipe.objects.all()
+    ordering = ("created_at", "id")
+    queryset = Recipe.objects.with_children().order_by(*ordering)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = RecipeFilter
+    search_query_param = "q"
+    search_language_query_param = "lang"
+    # Set once the full text search matched nothing, to rank by similarity.
+    search_fallback = False
+
+    @property
+    def search_text(self):
+        return self.request.query_params.get(self.search_query_param, "").strip()
 
+    @property
+    def pagination_mode(self):
+        # Ranked results have no keyset to seek on.
+        return "offset" if self.search_text else None
+
+    def get_queryset(self):
+        qs = super(RecipeListCreateView, self).get_queryset()
+        if self.request.method == "GET" and self.search_text:
+            language = self.request.query_params.get(self.search_language_query_param)
+            if language is not None and language not in settings.SEARCH_LANGUAGES:
+                raise ValidationError({self.search_language_query_param: _("Unsupported language")})
+            if self.search_fallback:
+                qs = similar_recipes(qs, self.search_text)
+            else:
+                qs = search_recipes(qs, self.search_text, language)
+        return self.scale_recipe_queryset(qs)
 
-class RecipeDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def get_columns(self, serializer):
+        return [*super(RecipeListCreateView, self).get_columns(serializer), "updated_at"]
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        page = list(self.paginate_queryset(self.get_rows(serializer)))
+        # Count and links, without any document.
+        envelope = {key: value for key, value in self.get_paginated_response([]).data.items() if key != "results"}
+        if self.search_text and envelope["count"] == 0 and not self.search_fallback:
+            # Only an empty ranking costs the similarity query.
+            self.search_fallback = True
+            return self.list(request, *args, **kwargs)
+        return self.conditional_response(
+            None,
+            [envelope, [(row["id"], row["updated_at"]) for row in page]],
+            lambda: self.get_paginated_response(self.get_documents(serializer, page)),
+        )
+
+    def get_values_serializer(self):
+        return self.get_recipe_values_serializer(self.get_serializer())
+
+
+class RecipeDetailView(RecipeFieldsMixin, IngredientScalingMixin, ConditionalGetMixin,
+                       generics.RetrieveUpdateDestroyAPIView):
     serializer_class = RecipeSerializer
     permission_classes = (IsAuthenticated,)
-    queryset = Recipe.objects.all()
+    queryset = Recipe.objects.with_children()
+
+    def get_conditional_state(self):
+        state = self.get_queryset().filter(pk=self.kwargs["pk"]).aggregate(last_modified=Max("updated_at"))
+        if state["last_modified"] is None:
+            return None
+        return state["last_modified"], ""
+
+    def retrieve(self, request, *args, **kwargs):
+        selection = self.get_field_selection()
+        if self.get_scaling() is not None or (selection is not None and not recipe_cache.enabled):
+            # Scaled documents are built by the database for each request.
+            data = self.build_document(selection.fields if selection is not None else None)
+        else:
+            # Cached documents are always whole, sparse ones are cut from them.
+            data = recipe_cache.get_or_build(self.kwargs["pk"], self.build_document)
+        if selection is not None:
+            data = {name: data[name] for name in selection.fields}
+        return Response(data)
 
+    def build_document(self, fields=None):
+        serializer = self.get_recipe_values_serializer(self.get_serializer_class()(fields=fields))
+        rows = self.scale_recipe_queryset(Recipe.objects.filter(pk=self.kwargs["pk"])).values(*serializer.columns)
+        documents = serializer.to_representation(rows)
+        if not documents:
+            raise Http404
+        return documents[0]
 
-class RecipeIngredientsListView(generics.ListCreateAPIView):
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            recipe_deleted(*Recipe.objects.delete_with_children([instance.pk]))
+
+
+def build_recipe_documents(pks):
+    """
+    Documents of the recipes in ``pks`` by pk, read with one query per table.
+    """
+    serializer = ValuesSerializer(RecipeSerializer(), querysets=recipe_children_querysets())
+    rows = list(Recipe.objects.filter(pk__in=pks).values(*serializer.columns))
+    return {row["id"]: document for row, document in zip(rows, serializer.to_representation(rows))}
+
+
+class RecipeBatchView(APIView):
+    """
+    Recipes by id, given as ``?ids=`` (comma separated or repeated) on GET or
+    as ``{"ids": [...]}`` on POST for lists too long for a URL, at most
+    ``RECIPE_BATCH_MAX_IDS`` of them. Results follow the order of the ids,
+    with null for the ids matching no recipe, which are also listed in
+    ``not_found``. Documents are read from the recipe cache and the missing
+    ones built with one query per table.
+
+    DELETE with ``{"ids": [...]}`` deletes those recipes along with their
+    ingredients and steps in one statement, answering with the ids
+    ``deleted`` and ``not_found``.
+    """
+    permission_classes = (IsAuthenticated,)
+    ids_query_param = "ids"
+
+    def get(self, request, *args, **kwargs):
+        ids = [
+            value
+            for values in request.query_params.getlist(self.ids_query_param)
+            for value in values.split(",")
+            if value.strip()
+        ]
+        return self.batch(ids)
+
+    def post(self, request, *args, **kwargs):
+        response = self.batch(self.get_body_ids())
+        # A read: the client is not pinned to the primary afterwards.
+        response.primary_sticky = False
+        return response
+
+    def delete(self, request, *args, **kwargs):
+        pks = self.parse_ids(self.get_body_ids())
+        with transaction.atomic():
+            deleted = set(Recipe.objects.delete_with_children(pks))
+            recipe_deleted(*deleted)
+        return Response({
+            "deleted": [str(pk) for pk in dict.fromkeys(pks) if pk in deleted],
+            "not_found": [str(pk) for pk in dict.fromkeys(pks) if pk not in deleted],
+        })
+
+    def get_body_ids(self):
+        ids = self.request.data.get(self.ids_query_param) if isinstance(self.request.data, dict) else None
+        if not isinstance(ids, list):
+            raise ValidationError({self.ids_query_param: _("A list of recipe ids is required.")})
+        return ids
+
+    def parse_ids(self, ids):
+        if not ids:
+            raise ValidationError({self.ids_query_param: _("This field is required.")})
+        if len(ids) > settings.RECIPE_BATCH_MAX_IDS:
+            raise ValidationError({
+                self.ids_query_param: _("At most %(count)d ids per request.") % {"count": settings.RECIPE_BATCH_MAX_IDS}
+            })
+        try:
+            return [uuid.UUID(str(pk).strip()) for pk in ids]
+        except ValueError:
+            raise ValidationError({self.ids_query_param: _("Must be valid UUIDs.")})
+
+    def batch(self, ids):
+        pks = self.parse_ids(ids)
+        documents = recipe_cache.get_or_build_many(pks, build_recipe_documents)
+        return Response({
+            "results": [documents.get(pk) for pk in pks],
+            "not_found": [str(pk) for pk in dict.fromkeys(pks) if pk not in documents],
+        })
+
+
+class RecipeChangeFeedView(APIView):
+    """
+    Sync feed: the recipes created, changed (themselves or their ingredients
+    and steps) or deleted since ``?cursor=``, oldest change first and one
+    entry per recipe, with the current document of the recipe or a
+    tombstone. Without a cursor the feed starts from the whole catalogue;
+    ``next_cursor`` resumes after the last entry and ``has_more`` tells
+    whether more entries were already available.
+    """
+    permission_classes = (IsAuthenticated,)
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 100
+    max_limit = 1000
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get(self.limit_query_param, self.default_limit))
+        except ValueError:
+            raise ValidationError({self.limit_query_param: _("A valid integer is required.")})
+        return max(1, min(limit, self.max_limit))
+
+    @staticmethod
+    def encode_cursor(position):
+        transaction_id, recipe_id = position
+        return base64.urlsafe_b64encode(f"{transaction_id}:{recipe_id}".encode("ascii")).decode("ascii")
+
+    def decode_cursor(self):
+        cursor = self.request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            transaction_id, recipe_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii").split(":")
+            return int(transaction_id), uuid.UUID(recipe_id)
+        except (ValueError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: _("Invalid cursor.")})
+
+    def get(self, request, *args, **kwargs):
+        position = self.decode_cursor()
+        limit = self.get_limit()
+        changes = list(RecipeChange.objects.since(position)[:limit + 1])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        documents = recipe_cache.get_or_build_many(
+            [change.recipe_id for change in changes if not change.deleted], build_recipe_documents
+        )
+        results = [
+            {
+                "id": str(change.recipe_id),
+                "changed_at": change.changed_at,
+                # A recipe deleted after its entry was read is a tombstone too.
+                "deleted": change.recipe_id not in documents,
+                "recipe": documents.get(change.recipe_id),
+            }
+            for change in changes
+        ]
+        if changes:
+            position = changes[-1].transaction_id, changes[-1].recipe_id
+        return Response({
+            "results": results,
+            "next_cursor": self.encode_cursor(position) if position is not None else None,
+            "has_more": has_more,
+        })
+
+
+class CookableRecipesView(IngredientScalingMixin, generics.ListAPIView):
+    """
+    Recipes ranked by the fraction of their ingredients covered by the pantry
+    given in ``?ingredients=`` (comma separated or repeated).
+    """
+    serializer_class = CookableRecipeSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = None
+    queryset = Recipe.objects.with_children()
+    pantry_query_param = "ingredients"
+    limit_query_param = "limit"
+    default_limit = 20
+    max_limit = 100
+
+    def get_pantry(self):
+        pantry = [
+            name
+            for value in self.request.query_params.getlist(self.pantry_query_param)
+            for name in value.split(",")
+            if name.strip()
+        ]
+        if not pantry:
+            raise ValidationError({self.pantry_query_param: _("This field is required.")})
+        return pantry
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get(self.limit_query_param, self.default_limit))
+        except ValueError:
+            raise ValidationError({self.limit_query_param: _("A valid integer is required.")})
+        return max(1, min(limit, self.max_limit))
+
+    def get_queryset(self):
+        qs = super(CookableRecipesView, self).get_queryset().prefetch_related(None)
+        return self.scale_recipe_queryset(qs.cookable_with(self.get_pantry()))
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_recipe_values_serializer(self.get_serializer())
+        rows = self.get_queryset().values(*serializer.columns)[:self.get_limit()]
+        return Response({"results": serializer.to_representation(rows)})
+
+
+class ShoppingListView(APIView):
+    """
+    Ingredients needed to cook many recipes, posted as ``{"recipes": [{"id":
+    ..., "servings": 6}, {"id": ..., "scale": 2}, ...]}``, grouped by name,
+    category and dimension with their quantities scaled, converted and summed
+    by the database.
+    """
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        serializer = ShoppingListSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ingredients = shopping_list(serializer.validated_data["recipes"], serializer.validated_data["servings"])
+        response = Response({"results": ingredients})
+        # A read: the client is not pinned to the primary afterwards.
+        response.primary_sticky = False
+        return response
+
+
+class RecipeImportView(APIView):
+    """
+    Bulk import of recipes streamed as NDJSON, one recipe per line, or as
+    concatenated MessagePack maps. The body is read incrementally and inserted
+    in chunks; the response reports how many recipes were created and which
+    lines (or MessagePack values) failed.
+    """
+    permission_classes = (IsAuthenticated,)
+    read_size = 64 * 1024
+
+    def post(self, request, *args, **kwargs):
+        media_type = request.content_type.split(";")[0].strip()
+        stream = request.stream
+        if media_type in NDJSON_MEDIA_TYPES:
+            items = parse_ndjson(iter(stream.readline, b"") if stream is not None else ())
+        elif media_type in MSGPACK_MEDIA_TYPES:
+            items = parse_msgpack(iter(lambda: stream.read(self.read_size), b"") if stream is not None else ())
+        else:
+            raise UnsupportedMediaType(media_type)
+        report = RecipeImporter().run(items)
+        return Response(report)
+
+
+class RecipeExportView(APIView):
+    """
+    Streams the whole catalogue, each recipe with its ingredients and steps,
+    as NDJSON or CSV (``?output=``). ``?since=<datetime>`` limits the export to
+    recipes updated since then and ``?snapshot=false`` skips the REPEATABLE
+    READ transaction.
+    """
+    permission_classes = (IsAuthenticated,)
+    output_query_param = "output"
+    since_query_param = "since"
+    snapshot_query_param = "snapshot"
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is not produced by a renderer; only errors are.
+        return super(RecipeExportView, self).perform_content_negotiation(request, force=True)
+
+    def get(self, request, *args, **kwargs):
+        output = request.query_params.get(self.output_query_param, "ndjson")
+        if output not in EXPORT_FORMATS:
+            raise ValidationError({self.output_query_param: _("Unsupported output format")})
+
+        since = request.query_params.get(self.since_query_param)
+        if since is not None:
+            try:
+                since = parse_since(since)
+            except ValueError:
+                raise ValidationError({self.since_query_param: _("A valid datetime is required.")})
+
+        snapshot = request.query_params.get(self.snapshot_query_param)
+        snapshot = settings.RECIPE_EXPORT_SNAPSHOT if snapshot is None else snapshot.lower() not in ("0", "false")
+
+        response = StreamingHttpResponse(
+            export_recipes(output=output, since=since, snapshot=snapshot),
+            content_type=EXPORT_FORMATS[output],
+        )
+        response["Content-Disposition"] = f'attachment; filename="recipes.{output}"'
+        return response
+
+
+class RecipeIngredientsListView(RecipeChildWriteMixin, RecipeChildBatchMixin, RecipeChildListMixin,
+                                IngredientScalingMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = IngredientSerializer
     permission_classes = (IsAuthenticated,)
-    queryset = Ingredient.objects.all()
+    ordering = ("name", "id")
+    queryset = Ingredient.objects.order_by(*ordering)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = IngredientFilter
 
     def get_queryset(self):
         qs = super(RecipeIngredientsListView, self).get_queryset()
-        return qs.filter(recipe=self.kwargs["pk"])
+        return self.scale_ingredient_queryset(qs.filter(recipe=self.kwargs["pk"]))
 
+    def get_values_serializer(self):
+        return ValuesSerializer(self.get_serializer(), sources=self.get_ingredient_sources())
 
-class RecipeIngredientDetailView(generics.RetrieveUpdateDestroyAPIView):
+
+class RecipeIngredientDetailView(RecipeChildWriteMixin, IngredientScalingMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = IngredientSerializer
     permission_classes = (IsAuthenticated,)
     queryset = Ingredient.objects.all()
@@ -38,18 +741,46 @@ class RecipeIngredientDetailView(generics.RetrieveUpdateDestroyAPIView):
             self.get_queryset(), recipe=self.kwargs.get("pk"), id=self.kwargs.get("ingredient")
         )
 
+    def retrieve(self, request, *args, **kwargs):
+        if self.get_scaling() is None:
+            return Response(self.get_serializer(self.get_object()).data)
+        serializer = ValuesSerializer(self.get_serializer(), sources=self.get_ingredient_sources())
+        rows = self.scale_ingredient_queryset(
+            self.get_queryset().filter(recipe=self.kwargs.get("pk"), id=self.kwargs.get("ingredient"))
+        ).values(*serializer.columns)
+        documents = serializer.to_representation(rows)
+        if not documents:
+            raise Http404
+        return Response(documents[0])
+
 
-class RecipeStepListView(generics.ListCreateAPIView):
+class RecipeStepListView(RecipeChildWriteMixin, RecipeChildBatchMixin, RecipeChildListMixin,
+                         ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = StepSerializer
     permission_classes = (IsAuthenticated,)
-    queryset = Step.objects.all()
+    ordering = ("step", "id")
+    queryset = Step.objects.order_by(*ordering)
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = StepFilter
 
     def get_queryset(self):
         qs = super(RecipeStepListView, self).get_queryset()
         return qs.filter(recipe=self.kwargs["pk"])
 
+    def perform_create(self, serializer):
+        # Creating at a taken position inserts before the step holding it.
+        recipe = serializer.validated_data.get("recipe")
+        try:
+            with transaction.atomic():
+                if recipe is not None:
+                    Step.objects.open_gap(recipe.pk, serializer.validated_data["step"])
+                super(RecipeStepListView, self).perform_create(serializer)
+                Step.objects.check_unique()
+        except IntegrityError:
+            raise ValidationError({"step": [_("The recipe already has a step with this number.")]})
 
-class RecipeStepDetailView(generics.RetrieveUpdateDestroyAPIView):
+
+class RecipeStepDetailView(RecipeChildWriteMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = StepSerializer
     permission_classes = (IsAuthenticated,)
     queryset = Step.objects.all()
@@ -59,3 +790,39 @@ class RecipeStepDetailView(generics.RetrieveUpdateDestroyAPIView):
             self.get_queryset(), recipe=self.kwargs.get("pk"), step=self.kwargs.get("step")
         )
 
+    def perform_update(self, serializer):
+        # Changing the step number moves the step, renumbering the ones in
+        # between; moving it to another recipe inserts it there.
+        instance = serializer.instance
+        recipe = serializer.validated_data.get("recipe", instance.recipe)
+        position = serializer.validated_data.get("step", instance.step)
+        try:
+            with transaction.atomic():
+                if recipe is not None and recipe.pk == instance.recipe_id:
+                    Step.objects.move(instance.recipe_id, instance.step, position)
+                elif recipe is not None:
+                    Step.objects.open_gap(recipe.pk, position)
+                super(RecipeStepDetailView, self).perform_update(serializer)
+                Step.objects.check_unique()
+        except IntegrityError:
+            raise ValidationError({"step": [_("The recipe already has a step with this number.")]})
+
+
+class CacheStatsView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "recipe_documents": recipe_cache.stats(),
+            "tokens": token_cache.stats(),
+            "compressed_bodies": compressed_cache.stats(),
+        })
+
+
+class DatabaseStatsView(APIView):
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response({
+            "pools": pool_stats(),
+        })